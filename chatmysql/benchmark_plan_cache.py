@@ -0,0 +1,126 @@
+import argparse
+import logging
+import os
+import random
+import re
+import tempfile
+import time
+import zlib
+from typing import List
+
+import numpy as np
+from sqlalchemy import text
+from langchain_core.embeddings import Embeddings
+
+from chinook import COUNTRIES, create_chinook
+from plan_cache import PlanCache
+from query_runner import BoundedQueryRunner, create_pooled_engine
+from schema_cache import SchemaCache
+
+# Question paraphrases and the SQL a correct planner writes for them
+TEMPLATES = [
+    (["How many albums are there in the database?", "How many albums are in the database?"],
+     "SELECT COUNT(*) FROM Album", {}),
+    (["How many tracks are in the {genre} genre?", "How many tracks are there in the {genre} genre?"],
+     "SELECT COUNT(*) FROM Track JOIN Genre ON Track.GenreId = Genre.GenreId WHERE Genre.Name = '{genre}'",
+     {"genre": ["Rock", "Jazz", "Metal", "Blues", "Latin", "Pop", "Classical"]}),
+    (["List the top {n} artists by number of albums.", "List the top {n} artists by the number of albums."],
+     "SELECT Artist.Name, COUNT(*) AS Albums FROM Album JOIN Artist ON Album.ArtistId = Artist.ArtistId GROUP BY Artist.ArtistId ORDER BY Albums DESC LIMIT {n}",
+     {"n": ["3", "5", "10"]}),
+    (["Which customers are from {country}?", "Which customers are located in {country}?"],
+     "SELECT FirstName, LastName FROM Customer WHERE Country = '{country}'",
+     {"country": COUNTRIES}),
+    (["What is the total invoice amount for {country}?", "What is the total invoiced amount for {country}?"],
+     "SELECT SUM(Total) FROM Invoice WHERE BillingCountry = '{country}'",
+     {"country": COUNTRIES}),
+    (["How many invoices were issued in {year}?", "How many invoices were created in {year}?"],
+     "SELECT COUNT(*) FROM Invoice WHERE CAST(strftime('%Y', InvoiceDate) AS INTEGER) = {year}",
+     {"year": ["2021", "2022", "2023", "2024", "2025"]}),
+    (["Top {n} tracks in genre {genre_id}", "Show the top {n} tracks in genre {genre_id}"],
+     "SELECT Name FROM Track WHERE GenreId = {genre_id} ORDER BY Milliseconds DESC, TrackId LIMIT {n}",
+     {"n": ["3", "5", "10"], "genre_id": ["3", "5", "10"]}),
+]
+
+GENRE_COUNT = "SELECT COUNT(*) FROM Track JOIN Genre ON Track.GenreId = Genre.GenreId WHERE Genre.Name = '{}'"
+
+# Asked first: when two literals are equal their value alone does not say which SQL location each fills,
+# and lowercase or sentence-initial names are not recognized as literals at all
+AMBIGUOUS = [
+    ("Top 5 tracks in genre 5", "SELECT Name FROM Track WHERE GenreId = 5 ORDER BY Milliseconds DESC, TrackId LIMIT 5"),
+    ("Top 10 tracks in genre 5", "SELECT Name FROM Track WHERE GenreId = 5 ORDER BY Milliseconds DESC, TrackId LIMIT 10"),
+    ("How many tracks are there in the database that belong to the rock genre?", GENRE_COUNT.format("Rock")),
+    ("How many tracks are there in the database that belong to the jazz genre?", GENRE_COUNT.format("Jazz")),
+    ("Rock is the genre of how many of the tracks in the database?", GENRE_COUNT.format("Rock")),
+    ("Metal is the genre of how many of the tracks in the database?", GENRE_COUNT.format("Metal")),
+]
+
+class HashingEmbeddings(Embeddings):
+    """Local bag of words and word bigrams embedding, so the benchmark needs no API key."""
+    def __init__(self, size: int = 1024) -> None:
+        self.size = size
+
+    def embed_query(self, text_: str) -> List[float]:
+        words = re.findall(r"<\w+>|\w+", text_.lower())
+        vector = np.zeros(self.size, dtype=np.float32)
+        for feature in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+            vector[zlib.crc32(feature.encode("utf-8")) % self.size] += 1.0
+        return vector.tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text_) for text_ in texts]
+
+def main():
+    """Measures hit rate, correctness and latency saved by the NL-to-SQL plan cache on a local Chinook database."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--questions", type=int, default=200)
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Simulated seconds per LLM call.")
+    parser.add_argument("--planning-calls", type=int, default=3, help="LLM calls the agent makes before answering.")
+    parser.add_argument("--threshold", type=float, default=0.8)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+    rng = random.Random(0)
+
+    path = create_chinook(os.path.join(tempfile.mkdtemp(prefix="chinook_"), "chinook.sqlite"))
+    engine = create_pooled_engine(f"sqlite:///{path}")
+    runner = BoundedQueryRunner(engine)
+    plan_cache = PlanCache(HashingEmbeddings(), fingerprint=SchemaCache(engine).fingerprint, threshold=args.threshold, dialect=engine.dialect.name)
+
+    # A skewed workload: popular question templates come up far more often
+    weights = [1 / (rank + 1) for rank in range(len(TEMPLATES))]
+    workload = list(AMBIGUOUS)
+    for _ in range(args.questions):
+        paraphrases, sql, slots = rng.choices(TEMPLATES, weights)[0]
+        values = {slot: rng.choice(options) for slot, options in slots.items()}
+        workload.append((rng.choice(paraphrases).format(**values), sql.format(**values)))
+
+    hit_seconds, miss_seconds, wrong = [], [], 0
+    for question, truth in workload:
+        start = time.perf_counter()
+        match = plan_cache.lookup(question)
+        if match:
+            result = runner.run(match.sql)
+            time.sleep(args.llm_latency)  # the answer call
+            seconds = time.perf_counter() - start
+            plan_cache.record_saving(match, seconds)
+            hit_seconds.append(seconds)
+            wrong += result.preview != runner.run(truth).preview
+        else:
+            time.sleep(args.llm_latency * args.planning_calls)  # get_schema, SQL generation and tool-call turns
+            runner.run(truth)
+            time.sleep(args.llm_latency)  # the answer call
+            seconds = time.perf_counter() - start
+            plan_cache.store(question, truth, seconds)
+            miss_seconds.append(seconds)
+
+    print(plan_cache.stats.report())
+    print(f"Hits with a different result than the planner's SQL: {wrong}")
+    print(f"Mean latency: {np.mean(miss_seconds) * 1000:.0f} ms on a miss, {np.mean(hit_seconds) * 1000:.0f} ms on a hit")
+
+    # A schema change drops every cached plan
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE Album ADD COLUMN ReleaseYear INTEGER"))
+    match = plan_cache.lookup("How many albums are there in the database?")
+    print(f"After ALTER TABLE: {'hit' if match else 'miss'}, {plan_cache.stats.invalidations} invalidation(s)")
+
+if __name__ == "__main__":
+    main()
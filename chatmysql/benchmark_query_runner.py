@@ -0,0 +1,78 @@
+import argparse
+import logging
+import os
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import DBAPIError
+
+from chinook import create_chinook
+from query_runner import BoundedQueryRunner, create_pooled_engine, is_timeout
+
+warnings.filterwarnings("ignore", category=DeprecationWarning)
+from langchain_community.utilities import SQLDatabase
+
+def grow_invoice_lines(path: str, rows: int) -> None:
+    """Fills the InvoiceLine table up to `rows` rows with a recursive CTE, which is much faster than inserting from Python."""
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        INSERT INTO InvoiceLine (InvoiceLineId, InvoiceId, TrackId, UnitPrice, Quantity)
+        WITH RECURSIVE n(i) AS (SELECT (SELECT MAX(InvoiceLineId) FROM InvoiceLine) + 1 UNION ALL SELECT i + 1 FROM n WHERE i < ?)
+        SELECT i, i % 412 + 1, i % 3503 + 1, 0.99 + (i % 2), 1 + i % 3 FROM n
+    """, (rows,))
+    conn.commit()
+    conn.close()
+
+def measure(func):
+    """Returns (result, seconds, peak MiB) for a call."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+def main():
+    """Compares SQLDatabase.run with the bounded, streaming query runner on a multi-million-row SQLite table."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--rows", type=int, default=2_000_000, help="Rows in the InvoiceLine table.")
+    parser.add_argument("--max-rows", type=int, default=1000)
+    parser.add_argument("--statement-timeout", type=float, default=1.0)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    path = create_chinook(os.path.join(tempfile.mkdtemp(prefix="chinook_"), "chinook.sqlite"))
+    start = time.perf_counter()
+    grow_invoice_lines(path, args.rows)
+    print(f"Generated {args.rows:,} invoice lines in {time.perf_counter() - start:.1f} s\n")
+
+    # The baseline gets its own engine without a statement timeout, so it can read everything
+    db = SQLDatabase(create_engine(f"sqlite:///{path}"))
+    engine = create_pooled_engine(f"sqlite:///{path}", statement_timeout=args.statement_timeout)
+    runner = BoundedQueryRunner(engine, max_rows=args.max_rows)
+    query = "SELECT * FROM InvoiceLine"
+
+    output, seconds, peak = measure(lambda: db.run(query))
+    print(f"{'SQLDatabase.run':<30} {seconds:>7.2f} s  peak {peak:>8.1f} MiB  output {len(output):>12,} chars")
+
+    result, seconds, peak = measure(lambda: runner.run(query))
+    output = result.report()
+    print(f"{'BoundedQueryRunner.run':<30} {seconds:>7.2f} s  peak {peak:>8.1f} MiB  output {len(output):>12,} chars")
+    print(f"  {output.splitlines()[-1]}")
+
+    # An unbounded aggregate is cut off by the statement timeout
+    slow_query = "SELECT COUNT(*) FROM InvoiceLine a JOIN InvoiceLine b ON a.TrackId = b.TrackId"
+    start = time.perf_counter()
+    try:
+        runner.run(slow_query)
+        print("\nSelf-join finished within the timeout")
+    except DBAPIError as e:
+        print(f"\nSelf-join stopped after {time.perf_counter() - start:.2f} s (statement timeout: {is_timeout(e)})")
+
+if __name__ == "__main__":
+    main()
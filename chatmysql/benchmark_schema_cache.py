@@ -0,0 +1,92 @@
+import argparse
+import logging
+import os
+import tempfile
+import time
+import warnings
+
+from sqlalchemy import create_engine, text
+
+from chinook import create_chinook
+from schema_cache import SchemaCache
+
+warnings.filterwarnings("ignore", category=DeprecationWarning)
+from langchain_community.utilities import SQLDatabase
+
+# Benchmark questions and the tables a correct query needs
+QUESTIONS = [
+    ("How many albums are there in the database?", {"Album"}),
+    ("Which artist has the most albums?", {"Artist", "Album"}),
+    ("List the top 5 genres by number of tracks.", {"Genre", "Track"}),
+    ("What is the total invoice amount per billing country?", {"Invoice"}),
+    ("Which customers spent the most money?", {"Customer", "Invoice"}),
+    ("Which employee supports the most customers?", {"Employee", "Customer"}),
+    ("What are the longest tracks in milliseconds?", {"Track"}),
+    ("How many tracks are in each playlist?", {"Playlist", "PlaylistTrack"}),
+    ("Which media type is used by most tracks?", {"MediaType", "Track"}),
+    ("What is the best selling track by invoice line quantity?", {"Track", "InvoiceLine"}),
+]
+
+def get_token_counter():
+    """Returns (count_tokens, label), falling back to a 4 characters per token estimate when tiktoken has no encoding available offline."""
+    try:
+        import tiktoken
+        encoding = tiktoken.get_encoding("cl100k_base")
+        return (lambda value: len(encoding.encode(value))), "cl100k_base tokens"
+    except Exception:
+        return (lambda value: len(value) // 4), "estimated tokens (4 chars/token)"
+
+def main():
+    """Compares full get_table_info schema dumps with cached, question-relevant schema summaries on a local Chinook database."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--max-tables", type=int, default=5)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+    count_tokens, token_label = get_token_counter()
+
+    path = create_chinook(os.path.join(tempfile.mkdtemp(prefix="chinook_"), "chinook.sqlite"))
+    engine = create_engine(f"sqlite:///{path}")
+    db = SQLDatabase(engine)
+    schema_cache = SchemaCache(engine, max_tables=args.max_tables)
+
+    start = time.perf_counter()
+    schema_cache.refresh()
+    print(f"Initial introspection: {(time.perf_counter() - start) * 1000:.1f} ms ({len(schema_cache.tables)} tables)\n")
+
+    print(f"{'question':<60} {'full':>7} {'cached':>7} {'full ms':>8} {'cached ms':>10}  recall")
+    totals = {"full_tokens": 0, "cached_tokens": 0, "full_seconds": 0.0, "cached_seconds": 0.0}
+    for question, expected in QUESTIONS:
+        start = time.perf_counter()
+        full = db.get_table_info()
+        full_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        compact = schema_cache.describe(question)
+        cached_seconds = time.perf_counter() - start
+
+        found = expected & set(schema_cache.relevant_tables(question))
+        full_tokens, cached_tokens = count_tokens(full), count_tokens(compact)
+        totals["full_tokens"] += full_tokens
+        totals["cached_tokens"] += cached_tokens
+        totals["full_seconds"] += full_seconds
+        totals["cached_seconds"] += cached_seconds
+        print(
+            f"{question[:58]:<60} {full_tokens:>7} {cached_tokens:>7} {full_seconds * 1000:>8.2f} "
+            f"{cached_seconds * 1000:>10.2f}  {len(found)}/{len(expected)}"
+        )
+
+    count = len(QUESTIONS)
+    print(
+        f"\nPer question: {totals['full_tokens'] / count:.0f} -> {totals['cached_tokens'] / count:.0f} {token_label} "
+        f"({1 - totals['cached_tokens'] / totals['full_tokens']:.0%} fewer), "
+        f"{totals['full_seconds'] / count * 1000:.2f} -> {totals['cached_seconds'] / count * 1000:.2f} ms"
+    )
+
+    # A schema change is picked up on the next lookup
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE Track ADD COLUMN Rating INTEGER"))
+    print(f"\nAfter ALTER TABLE: {schema_cache.describe('Which tracks have the best rating?').splitlines()[0]}")
+    print(schema_cache.stats.report())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import os
+import random
+import sqlite3
+
+# The Chinook sample schema, as shipped in Chinook_Sqlite.sql
+CHINOOK_DDL = """
+CREATE TABLE Artist (ArtistId INTEGER PRIMARY KEY, Name NVARCHAR(120));
+CREATE TABLE Album (AlbumId INTEGER PRIMARY KEY, Title NVARCHAR(160) NOT NULL, ArtistId INTEGER NOT NULL REFERENCES Artist (ArtistId));
+CREATE TABLE Genre (GenreId INTEGER PRIMARY KEY, Name NVARCHAR(120));
+CREATE TABLE MediaType (MediaTypeId INTEGER PRIMARY KEY, Name NVARCHAR(120));
+CREATE TABLE Track (
+    TrackId INTEGER PRIMARY KEY, Name NVARCHAR(200) NOT NULL, AlbumId INTEGER REFERENCES Album (AlbumId),
+    MediaTypeId INTEGER NOT NULL REFERENCES MediaType (MediaTypeId), GenreId INTEGER REFERENCES Genre (GenreId),
+    Composer NVARCHAR(220), Milliseconds INTEGER NOT NULL, Bytes INTEGER, UnitPrice NUMERIC(10,2) NOT NULL
+);
+CREATE TABLE Playlist (PlaylistId INTEGER PRIMARY KEY, Name NVARCHAR(120));
+CREATE TABLE PlaylistTrack (
+    PlaylistId INTEGER NOT NULL REFERENCES Playlist (PlaylistId), TrackId INTEGER NOT NULL REFERENCES Track (TrackId),
+    PRIMARY KEY (PlaylistId, TrackId)
+);
+CREATE TABLE Employee (
+    EmployeeId INTEGER PRIMARY KEY, LastName NVARCHAR(20) NOT NULL, FirstName NVARCHAR(20) NOT NULL, Title NVARCHAR(30),
+    ReportsTo INTEGER REFERENCES Employee (EmployeeId), BirthDate DATETIME, HireDate DATETIME, Address NVARCHAR(70),
+    City NVARCHAR(40), State NVARCHAR(40), Country NVARCHAR(40), PostalCode NVARCHAR(10), Phone NVARCHAR(24),
+    Fax NVARCHAR(24), Email NVARCHAR(60)
+);
+CREATE TABLE Customer (
+    CustomerId INTEGER PRIMARY KEY, FirstName NVARCHAR(40) NOT NULL, LastName NVARCHAR(20) NOT NULL, Company NVARCHAR(80),
+    Address NVARCHAR(70), City NVARCHAR(40), State NVARCHAR(40), Country NVARCHAR(40), PostalCode NVARCHAR(10),
+    Phone NVARCHAR(24), Fax NVARCHAR(24), Email NVARCHAR(60) NOT NULL, SupportRepId INTEGER REFERENCES Employee (EmployeeId)
+);
+CREATE TABLE Invoice (
+    InvoiceId INTEGER PRIMARY KEY, CustomerId INTEGER NOT NULL REFERENCES Customer (CustomerId), InvoiceDate DATETIME NOT NULL,
+    BillingAddress NVARCHAR(70), BillingCity NVARCHAR(40), BillingState NVARCHAR(40), BillingCountry NVARCHAR(40),
+    BillingPostalCode NVARCHAR(10), Total NUMERIC(10,2) NOT NULL
+);
+CREATE TABLE InvoiceLine (
+    InvoiceLineId INTEGER PRIMARY KEY, InvoiceId INTEGER NOT NULL REFERENCES Invoice (InvoiceId),
+    TrackId INTEGER NOT NULL REFERENCES Track (TrackId), UnitPrice NUMERIC(10,2) NOT NULL, Quantity INTEGER NOT NULL
+);
+"""
+
+GENRES = ["Rock", "Jazz", "Metal", "Alternative & Punk", "Blues", "Latin", "Reggae", "Pop", "Soundtrack", "Classical"]
+MEDIA_TYPES = ["MPEG audio file", "Protected AAC audio file", "Protected MPEG-4 video file", "Purchased AAC audio file", "AAC audio file"]
+COUNTRIES = ["USA", "Canada", "Brazil", "France", "Germany", "United Kingdom", "Portugal", "India", "Czech Republic", "Chile"]
+WORDS = ["Love", "Night", "Fire", "Blue", "Road", "Heart", "Dream", "Rain", "Gold", "City", "Wild", "Time", "Light", "Ocean"]
+
+def create_chinook(path: str, scale: int = 1, seed: int = 0) -> str:
+    """
+    Creates a SQLite database with the Chinook schema and synthetic rows.
+
+    At scale 1 the row counts match the real Chinook sample (3503 tracks, 2240 invoice lines);
+    larger scales multiply the tracks, invoices and invoice lines.
+
+    :param path: The database file; an existing file is replaced.
+    :param scale: Row count multiplier.
+    :param seed: Seed for the random data.
+    :return: The path of the database.
+    """
+    if os.path.exists(path):
+        os.remove(path)
+    rng = random.Random(seed)
+
+    def title(words: int) -> str:
+        return " ".join(rng.choice(WORDS) for _ in range(words))
+
+    conn = sqlite3.connect(path)
+    conn.executescript(CHINOOK_DDL)
+    num_artists, num_albums, num_tracks = 275, 347, 3503 * scale
+    num_customers, num_invoices, num_lines = 59, 412 * scale, 2240 * scale
+    conn.executemany("INSERT INTO Artist VALUES (?, ?)", ((i, f"Artist {title(2)} {i}") for i in range(1, num_artists + 1)))
+    conn.executemany("INSERT INTO Album VALUES (?, ?, ?)", ((i, title(3), rng.randint(1, num_artists)) for i in range(1, num_albums + 1)))
+    conn.executemany("INSERT INTO Genre VALUES (?, ?)", enumerate(GENRES, start=1))
+    conn.executemany("INSERT INTO MediaType VALUES (?, ?)", enumerate(MEDIA_TYPES, start=1))
+    conn.executemany("INSERT INTO Track VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", (
+        (i, title(3), rng.randint(1, num_albums), rng.randint(1, len(MEDIA_TYPES)), rng.randint(1, len(GENRES)),
+         f"Composer {rng.randint(1, 500)}", rng.randint(60_000, 600_000), rng.randint(1_000_000, 12_000_000), rng.choice([0.99, 1.99]))
+        for i in range(1, num_tracks + 1)
+    ))
+    conn.executemany("INSERT INTO Playlist VALUES (?, ?)", ((i, f"{title(2)} Mix") for i in range(1, 19)))
+    conn.executemany("INSERT OR IGNORE INTO PlaylistTrack VALUES (?, ?)", ((rng.randint(1, 18), rng.randint(1, num_tracks)) for _ in range(8715)))
+    conn.executemany("INSERT INTO Employee VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", (
+        (i, f"Last{i}", f"First{i}", "Sales Support Agent" if i > 2 else "General Manager", None if i == 1 else 1,
+         "1970-01-01", "2002-08-14", f"{i} Main St", "Calgary", "AB", "Canada", "T2P 2T3", "+1 (403) 262-3443", None, f"employee{i}@chinookcorp.com")
+        for i in range(1, 9)
+    ))
+    conn.executemany("INSERT INTO Customer VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", (
+        (i, f"First{i}", f"Last{i}", None, f"{i} High St", f"City {i}", None, rng.choice(COUNTRIES), "00000",
+         "+1 555 0100", None, f"customer{i}@example.com", rng.randint(3, 8))
+        for i in range(1, num_customers + 1)
+    ))
+    conn.executemany("INSERT INTO Invoice VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", (
+        (i, rng.randint(1, num_customers), f"20{rng.randint(21, 25)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+         f"{i} High St", "City", None, rng.choice(COUNTRIES), "00000", round(rng.uniform(0.99, 25.86), 2))
+        for i in range(1, num_invoices + 1)
+    ))
+    conn.executemany("INSERT INTO InvoiceLine VALUES (?, ?, ?, ?, ?)", (
+        (i, rng.randint(1, num_invoices), rng.randint(1, num_tracks), rng.choice([0.99, 1.99]), 1)
+        for i in range(1, num_lines + 1)
+    ))
+    conn.commit()
+    conn.close()
+    return path
@@ -0,0 +1,244 @@
+import logging
+import re
+import threading
+from typing import Any, Callable, List, Optional, Tuple
+
+import numpy as np
+from pydantic import BaseModel
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+# Literals in a question: quoted strings, numbers and capitalized names that do not start a sentence
+_LITERAL = re.compile(
+    r"'(?P<single>[^']*)'|\"(?P<double>[^\"]*)\"|(?P<number>\b\d+(?:\.\d+)?\b)"
+    r"|(?<![.?!]\s)(?<!^)\b(?P<name>[A-Z][\w&-]*(?:\s+[A-Z][\w&-]*)*)"
+)
+
+def normalize_question(question: str) -> Tuple[str, List[Tuple[str, str]]]:
+    """
+    Splits a question into a literal-free template and its literals.
+
+    :param question: The user's question.
+    :return: (template, literals), where the template is lowercased with every literal replaced
+        by its kind, and literals are (kind, value) pairs in order.
+    """
+    question = question.strip()
+    literals = []
+
+    def replace(match: re.Match) -> str:
+        kind = "num" if match.group("number") else "str"
+        value = next(group for group in match.groups() if group is not None)
+        literals.append((kind, value))
+        return f"<{kind}>"
+
+    template = _LITERAL.sub(replace, question)
+    template = re.sub(r"\s+", " ", template.lower()).strip(" ?.!")
+    return template, literals
+
+# String and number literals in SQL; quoted strings are matched first so numbers inside them are skipped
+_SQL_LITERAL = re.compile(r"'(?:[^'\\]|''|\\.)*'|\"(?:[^\"\\]|\"\"|\\.)*\"|(?<![\w.])\d+(?:\.\d+)?(?![\w.])")
+
+def _sql_literal(kind: str, value: str, backslash_escapes: bool = True) -> str:
+    if kind == "num":
+        return value
+    # MySQL treats a backslash in a string literal as an escape, so it must be doubled too
+    if backslash_escapes:
+        value = value.replace("\\", "\\\\")
+    return "'" + value.replace("'", "''") + "'"
+
+class CachedPlan(BaseModel):
+    question: str
+    template: str
+    literals: List[Tuple[str, str]]
+    sql_template: str
+    bound: List[bool]
+    plan_seconds: float
+    exact: bool = False
+
+class PlanMatch(BaseModel):
+    sql: str
+    question: str
+    similarity: float
+    plan_seconds: float
+
+class PlanCacheStats(BaseModel):
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+    seconds_saved: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def report(self) -> str:
+        return (
+            f"Plan cache hits: {self.hits}, misses: {self.misses} ({self.hit_rate:.0%} hit rate), "
+            f"{self.invalidations} invalidations, {self.seconds_saved:.1f} s saved"
+        )
+
+class PlanCache:
+    """
+    Semantic cache from natural-language questions to validated SQL.
+
+    Questions are normalized by replacing their literals (quoted strings, numbers and
+    capitalized names) with placeholders and the template is embedded. When a new question's
+    template is close enough to a cached one and has literals of the same kinds, the cached
+    SQL is reused with the new literals bound in its place, skipping the planning LLM calls.
+    Literals that did not occur in the cached SQL exactly once, or that repeat in the
+    question, must match exactly. A plan whose SQL has other literals, such as a
+    lowercase or sentence-initial name the normalizer missed, is only reused for the
+    same question template. The cache is cleared whenever the schema fingerprint changes.
+    """
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        fingerprint: Optional[Callable[[], Any]] = None,
+        threshold: float = 0.92,
+        max_entries: int = 1000,
+        dialect: Optional[str] = None,
+    ) -> None:
+        """
+        :param embeddings: The embedding model for question templates.
+        :param fingerprint: Returns a value that changes with the schema, e.g. `SchemaCache.fingerprint`.
+        :param threshold: Minimum cosine similarity between question templates for a hit.
+        :param max_entries: Plans kept; the least recently used plan is evicted first.
+        :param dialect: The SQL dialect name, e.g. `engine.dialect.name`. Backslashes in bound strings
+            are escaped unless it is one that reads them literally, such as sqlite or postgresql.
+        """
+        self.embeddings = embeddings
+        self.fingerprint = fingerprint
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.backslash_escapes = dialect not in ("sqlite", "postgresql")
+        self.stats = PlanCacheStats()
+        self._lock = threading.Lock()
+        self._plans: List[CachedPlan] = []
+        self._vectors = np.zeros((0, 0), dtype=np.float32)
+        self._last_used: List[int] = []
+        self._clock = 0
+        self._fingerprint = None
+
+    def _embed(self, template: str) -> np.ndarray:
+        vector = np.asarray(self.embeddings.embed_query(template), dtype=np.float32)
+        return vector / max(np.linalg.norm(vector), 1e-12)
+
+    def _check_schema(self) -> None:
+        if self.fingerprint is None:
+            return
+        fingerprint = self.fingerprint()
+        if fingerprint != self._fingerprint:
+            if self._plans:
+                logger.info("Schema changed, dropping %d cached plans", len(self._plans))
+                self.stats.invalidations += 1
+            self.clear()
+            self._fingerprint = fingerprint
+
+    def clear(self) -> None:
+        with self._lock:
+            self._plans, self._last_used = [], []
+            self._vectors = np.zeros((0, 0), dtype=np.float32)
+
+    def _bind(self, plan: CachedPlan, literals: List[Tuple[str, str]]) -> Optional[str]:
+        """Binds the new literals into the plan's SQL, or returns None if they do not fit it."""
+        if [kind for kind, _ in literals] != [kind for kind, _ in plan.literals]:
+            return None
+        values = []
+        for (kind, value), (_, cached_value), bound in zip(literals, plan.literals, plan.bound):
+            if not bound and value != cached_value:
+                return None
+            values.append(_sql_literal(kind, value, self.backslash_escapes))
+        return plan.sql_template.format(*values)
+
+    def lookup(self, question: str) -> Optional[PlanMatch]:
+        """
+        Finds a cached plan for the question.
+
+        :param question: The user's question.
+        :return: The re-bound SQL with the cached question it came from, or None on a miss.
+        """
+        self._check_schema()
+        template, literals = normalize_question(question)
+        match = None
+        if self._plans:
+            similarities = self._vectors @ self._embed(template)
+            for index in np.argsort(-similarities):
+                if similarities[index] < self.threshold:
+                    break
+                plan = self._plans[index]
+                if plan.exact and plan.template != template:
+                    continue
+                sql = self._bind(plan, literals)
+                if sql is not None:
+                    self._clock += 1
+                    self._last_used[index] = self._clock
+                    match = PlanMatch(sql=sql, question=plan.question, similarity=float(similarities[index]), plan_seconds=plan.plan_seconds)
+                    break
+        if match:
+            self.stats.hits += 1
+            logger.info("Plan cache hit for '%s' (%.3f similar to '%s')", question, match.similarity, match.question)
+        else:
+            self.stats.misses += 1
+        return match
+
+    def reject(self, match: PlanMatch) -> None:
+        """Counts a hit whose SQL failed to run as a miss."""
+        self.stats.hits -= 1
+        self.stats.misses += 1
+
+    def record_saving(self, match: PlanMatch, seconds: float) -> None:
+        """Records the time saved by a hit that took `seconds` instead of the original planning time."""
+        self.stats.seconds_saved += max(0.0, match.plan_seconds - seconds)
+
+    def store(self, question: str, sql: str, plan_seconds: float) -> None:
+        """
+        Caches validated SQL for a question.
+
+        :param question: The user's question.
+        :param sql: SQL that ran successfully for it.
+        :param plan_seconds: How long planning and running it took, used to estimate time saved by later hits.
+        """
+        self._check_schema()
+        template, literals = normalize_question(question)
+        # A literal becomes a placeholder only if its value occurs once in the question and once in
+        # the SQL; otherwise which occurrence it stands for is ambiguous and it must match exactly
+        spans = {}
+        for index, (kind, value) in enumerate(literals):
+            if sum(other == value for _, other in literals) > 1:
+                continue
+            if kind == "num":
+                pattern = rf"(?<![\w.']){re.escape(value)}(?![\w.'])"
+            else:
+                pattern = re.escape(_sql_literal(kind, value, self.backslash_escapes))
+            found = [match.span() for match in re.finditer(pattern, sql)]
+            if len(found) == 1:
+                spans[index] = found[0]
+        # Escape braces so the SQL can be used as a format string, with each bound literal as a placeholder
+        sql_template, end, unbound = "", 0, False
+        for index, (start, stop) in sorted(spans.items(), key=lambda item: item[1]):
+            if start < end:
+                del spans[index]
+                continue
+            unbound = unbound or bool(_SQL_LITERAL.search(sql[end:start]))
+            sql_template += sql[end:start].replace("{", "{{").replace("}", "}}") + f"{{{index}}}"
+            end = stop
+        unbound = unbound or bool(_SQL_LITERAL.search(sql[end:]))
+        sql_template += sql[end:].replace("{", "{{").replace("}", "}}")
+        bound = [index in spans for index in range(len(literals))]
+
+        plan = CachedPlan(
+            question=question, template=template, literals=literals, sql_template=sql_template, bound=bound,
+            exact=unbound, plan_seconds=plan_seconds,
+        )
+        vector = self._embed(template)
+        with self._lock:
+            if len(self._plans) >= self.max_entries:
+                evict = int(np.argmin(self._last_used))
+                del self._plans[evict], self._last_used[evict]
+                self._vectors = np.delete(self._vectors, evict, axis=0)
+            self._clock += 1
+            self._plans.append(plan)
+            self._last_used.append(self._clock)
+            self._vectors = vector[None, :] if self._vectors.size == 0 else np.vstack([self._vectors, vector])
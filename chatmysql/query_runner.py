@@ -0,0 +1,229 @@
+import logging
+import re
+import sqlite3
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+
+logger = logging.getLogger(__name__)
+
+# String literals, quoted identifiers and comments, which may contain anything that looks like SQL
+_QUOTED = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|`[^`]*`|--[^\n]*|/\*.*?\*/", re.DOTALL)
+# Locking clauses, which MySQL only accepts after LIMIT
+_LOCKING = re.compile(r"(?is)(?<=\s)(?:for\s+(?:update|share)\b.*|lock\s+in\s+share\s+mode)\s*$")
+
+def _blank(match: re.Match) -> str:
+    # Same-length padding keeps positions in the blanked query aligned with the original
+    return " " * len(match.group())
+
+def inject_limit(query: str, limit: int) -> str:
+    """
+    Bounds a SELECT query to `limit` rows.
+
+    A query without a top-level LIMIT gets `LIMIT limit` appended, before a trailing FOR UPDATE,
+    FOR SHARE or LOCK IN SHARE MODE clause; a larger top-level LIMIT is lowered to `limit`.
+    Other statements are returned unchanged.
+    """
+    query = query.strip().rstrip(";").strip()
+    stripped = _QUOTED.sub(_blank, query)
+    if not re.match(r"(?is)\s*(select|with)\b", stripped):
+        return query
+    # Blank out parenthesized subqueries so only the outer query's clauses remain
+    previous = None
+    while previous != stripped:
+        previous, stripped = stripped, re.sub(r"\([^()]*\)", _blank, stripped)
+    existing = re.search(r"(?i)\blimit\s+(\d+)(?:\s*,\s*(\d+))?", stripped)
+    if existing:
+        # LIMIT count, or MySQL's LIMIT offset, count
+        group = 2 if existing.group(2) else 1
+        if int(existing.group(group)) <= limit:
+            return query
+        return f"{query[:existing.start(group)]}{limit}{query[existing.end(group):]}"
+    locking = _LOCKING.search(stripped)
+    if locking:
+        return f"{query[:locking.start()]}LIMIT {limit} {query[locking.start():]}"
+    # A trailing line comment would swallow the LIMIT
+    quoted = list(_QUOTED.finditer(query))
+    separator = "\n" if quoted and quoted[-1].end() == len(query) and quoted[-1].group().startswith("--") else " "
+    return f"{query}{separator}LIMIT {limit}"
+
+def create_pooled_engine(uri: str, pool_size: int = 5, statement_timeout: float = 10.0, **kwargs) -> Engine:
+    """
+    Creates an engine with a connection pool and a per-statement timeout.
+
+    MySQL enforces the timeout server side with MAX_EXECUTION_TIME (SELECT statements); on
+    SQLite a progress handler interrupts statements that run past it.
+
+    :param uri: The database URI.
+    :param pool_size: Connections kept open in the pool.
+    :param statement_timeout: Seconds a statement may run.
+    :param kwargs: Passed to `create_engine`.
+    """
+    engine = create_engine(uri, pool_size=pool_size, pool_pre_ping=True, pool_recycle=3600, **kwargs)
+
+    if engine.dialect.name in ("mysql", "mariadb"):
+        @event.listens_for(engine, "connect")
+        def set_mysql_timeout(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute(f"SET SESSION MAX_EXECUTION_TIME = {int(statement_timeout * 1000)}")
+            cursor.close()
+
+    elif engine.dialect.name == "sqlite":
+        @event.listens_for(engine, "connect")
+        def set_sqlite_timeout(dbapi_connection, connection_record):
+            deadline = connection_record.info.setdefault("deadline", [None])
+            # Returning True from the handler aborts the running statement
+            dbapi_connection.set_progress_handler(lambda: deadline[0] is not None and time.monotonic() > deadline[0], 10_000)
+
+        # The deadline covers executing the statement and fetching its rows, until the connection is returned
+        @event.listens_for(engine, "before_cursor_execute")
+        def start_sqlite_timer(conn, cursor, statement, parameters, context, executemany):
+            conn.info["deadline"][0] = time.monotonic() + statement_timeout
+
+        @event.listens_for(engine, "checkin")
+        def clear_sqlite_timer(dbapi_connection, connection_record):
+            connection_record.info["deadline"][0] = None
+
+    return engine
+
+def is_timeout(error: DBAPIError) -> bool:
+    """Tells whether a database error was raised by the statement timeout."""
+    original = error.orig
+    if isinstance(original, sqlite3.OperationalError):
+        return "interrupted" in str(original)
+    # MySQL: ER_QUERY_TIMEOUT, "maximum statement execution time exceeded"; PyMySQL has the code in args only
+    code = getattr(original, "errno", None) or next(iter(getattr(original, "args", ())), None)
+    return code == 3024
+
+class QueryResult(BaseModel):
+    columns: List[str] = []
+    column_types: Dict[str, str] = {}
+    preview: List[List[Any]] = []
+    rows_read: int = 0
+    bytes_read: int = 0
+    truncated: Optional[str] = None
+    rows_affected: Optional[int] = None
+    seconds: float = 0.0
+
+    def report(self) -> str:
+        """Formats the preview and statistics as compact text for the LLM."""
+        if self.rows_affected is not None:
+            return f"Statement executed, {self.rows_affected} rows affected."
+        lines = [" | ".join(self.columns)]
+        lines += [" | ".join(str(value) for value in row) for row in self.preview]
+        if self.rows_read > len(self.preview):
+            lines.append(f"... {self.rows_read - len(self.preview)} more rows not shown")
+        types = ", ".join(f"{column}: {column_type}" for column, column_type in self.column_types.items())
+        summary = f"{self.rows_read} rows read ({types})"
+        if self.truncated:
+            summary += f"; result truncated at the {self.truncated}, add filters or aggregates to see the rest"
+        return "\n".join(lines + [summary])
+
+class BoundedQueryRunner:
+    """
+    Runs queries with bounded memory and output.
+
+    Rows are streamed through a server-side cursor and counted as they arrive, and reading
+    stops at `max_rows` rows or `max_bytes` bytes of row data (UTF-8), so a `SELECT *` over
+    a large table never materializes the whole result. Streaming needs a driver with
+    server-side cursors, such as PyMySQL (`mysql+pymysql`) or mysqlclient; SQLAlchemy's
+    mysqlconnector dialect buffers every result on the client regardless. SELECTs get a LIMIT
+    of `max_rows` + 1 injected, or their own lowered to it, so the database can stop early too.
+    On MySQL a query stopped early is killed and its connection dropped, because closing the
+    cursor would read the rest of the result. Only a short preview is returned, with statistics.
+    """
+    def __init__(
+        self,
+        engine: Engine,
+        max_rows: int = 1000,
+        max_bytes: int = 1_000_000,
+        preview_rows: int = 20,
+        fetch_size: int = 500,
+    ) -> None:
+        """
+        :param engine: The engine to run queries on, e.g. from `create_pooled_engine`.
+        :param max_rows: Rows read at most per query.
+        :param max_bytes: Bytes of row data read at most per query, as UTF-8 text.
+        :param preview_rows: Rows included in the result preview.
+        :param fetch_size: Rows fetched from the cursor at a time.
+        """
+        self.engine = engine
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.preview_rows = preview_rows
+        self.fetch_size = fetch_size
+        if not engine.dialect.supports_server_side_cursors:
+            logger.warning("The %s driver has no server-side cursors, results are buffered on the client", engine.dialect.driver)
+
+    @staticmethod
+    def _size(value: Any) -> int:
+        if isinstance(value, (bytes, bytearray)):
+            return len(value)
+        return len(str(value).encode("utf-8"))
+
+    def _abort(self, conn: Connection) -> None:
+        """
+        Stops a MySQL query whose result was read only in part.
+
+        Closing a streaming cursor reads every remaining row off the wire first, so the query
+        is killed from a second connection and its own connection is dropped instead.
+        """
+        thread_id = getattr(conn.connection.dbapi_connection, "thread_id", None)
+        if thread_id is not None:
+            try:
+                with self.engine.connect() as killer:
+                    killer.exec_driver_sql(f"KILL QUERY {int(thread_id())}")
+            except DBAPIError as e:
+                logger.warning("Could not kill the truncated query: %s", e.orig)
+        conn.invalidate()
+
+    def run(self, query: str) -> QueryResult:
+        """
+        Runs the query and returns a bounded result.
+
+        :param query: The SQL query.
+        :return: The preview and statistics; `truncated` names the limit that was hit, if any.
+        """
+        start = time.perf_counter()
+        # Ask for one row more than allowed, to tell a complete result from a truncated one
+        query = inject_limit(query, self.max_rows + 1)
+        result = QueryResult()
+        with self.engine.connect() as conn:
+            cursor = conn.execution_options(stream_results=True, max_row_buffer=self.fetch_size).exec_driver_sql(query)
+            if not cursor.returns_rows:
+                conn.commit()
+                return QueryResult(rows_affected=cursor.rowcount, seconds=time.perf_counter() - start)
+            result.columns = list(cursor.keys())
+            types = [Counter() for _ in result.columns]
+            for partition in cursor.partitions(self.fetch_size):
+                for row in partition:
+                    if result.rows_read == self.max_rows:
+                        result.truncated = f"{self.max_rows} row limit"
+                        break
+                    size = sum(self._size(value) for value in row)
+                    if result.bytes_read + size > self.max_bytes:
+                        result.truncated = f"{self.max_bytes} byte limit"
+                        break
+                    result.bytes_read += size
+                    result.rows_read += 1
+                    for counter, value in zip(types, row):
+                        if value is not None:
+                            counter[type(value).__name__] += 1
+                    if len(result.preview) < self.preview_rows:
+                        result.preview.append(list(row))
+                if result.truncated:
+                    break
+            if result.truncated and self.engine.dialect.name in ("mysql", "mariadb"):
+                self._abort(conn)
+            else:
+                # SQLite finalizes the statement without stepping through the remaining rows
+                cursor.close()
+        result.column_types = {column: "/".join(counter) or "unknown" for column, counter in zip(result.columns, types)}
+        result.seconds = time.perf_counter() - start
+        logger.info("Read %d rows (%d bytes) in %.3fs%s", result.rows_read, result.bytes_read, result.seconds, f", truncated at the {result.truncated}" if result.truncated else "")
+        return result
@@ -0,0 +1,220 @@
+import logging
+import math
+import re
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from pydantic import BaseModel
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+# Words that say nothing about which tables a question needs
+STOPWORDS = {
+    "a", "all", "an", "and", "are", "by", "database", "do", "does", "each", "for", "from", "has", "have", "how",
+    "in", "is", "list", "many", "me", "most", "of", "on", "per", "show", "table", "tables", "the", "their", "there",
+    "to", "top", "what", "which", "who", "with",
+}
+
+def identifier_tokens(text_: str) -> List[str]:
+    """Splits text and camelCase/snake_case identifiers into lowercase, crudely singularized words."""
+    words = re.findall(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+", text_)
+    tokens = []
+    for word in (word.lower() for word in words):
+        if word.endswith("ies") and len(word) > 4:
+            word = word[:-3] + "y"
+        elif word.endswith("s") and not word.endswith("ss") and len(word) > 3:
+            word = word[:-1]
+        if word not in STOPWORDS:
+            tokens.append(word)
+    return tokens
+
+class TableSchema(BaseModel):
+    name: str
+    columns: List[Tuple[str, str]]
+    primary_key: List[str]
+    foreign_keys: Dict[str, str]
+    sample_row: Optional[List[str]] = None
+
+    def summary(self) -> str:
+        """A one-line description of the table: columns with types, keys and an example row."""
+        columns = []
+        for column, column_type in self.columns:
+            column_info = f"{column} {column_type}"
+            if column in self.primary_key:
+                column_info += " PK"
+            if column in self.foreign_keys:
+                column_info += f" FK->{self.foreign_keys[column]}"
+            columns.append(column_info)
+        line = f"{self.name}({', '.join(columns)})"
+        if self.sample_row:
+            line += f" e.g. ({', '.join(self.sample_row)})"
+        return line
+
+class SchemaCacheStats(BaseModel):
+    introspections: int = 0
+    introspection_seconds: float = 0.0
+    lookups: int = 0
+    invalidations: int = 0
+
+    def report(self) -> str:
+        return (
+            f"Schema cache: {self.lookups} lookups, {self.introspections} introspections "
+            f"({self.introspection_seconds:.2f} s), {self.invalidations} invalidations"
+        )
+
+class SchemaCache:
+    """
+    Introspects a database schema once and answers schema questions from memory.
+
+    Every lookup first reads a cheap schema fingerprint (PRAGMA schema_version on SQLite,
+    a checksum over information_schema.COLUMNS on MySQL) and re-introspects only when it
+    changed. Lookups return compact one-line summaries of the tables most relevant to a
+    question, ranked by identifier overlap and, if embeddings are given, by embedding
+    similarity between the question and each table's name and columns.
+    """
+    def __init__(
+        self,
+        engine: Engine,
+        embeddings: Optional[Embeddings] = None,
+        max_tables: int = 5,
+        embedding_weight: float = 0.5,
+        sample_rows: bool = True,
+        max_value_length: int = 40,
+    ) -> None:
+        """
+        :param engine: The SQLAlchemy engine of the database.
+        :param embeddings: Optional embedding model for semantic table ranking.
+        :param max_tables: The maximum number of tables returned for a question.
+        :param embedding_weight: Weight of embedding similarity relative to the lexical score.
+        :param sample_rows: Include one example row per table in the summaries.
+        :param max_value_length: Example values are truncated to this many characters.
+        """
+        self.engine = engine
+        self.embeddings = embeddings
+        self.max_tables = max_tables
+        self.embedding_weight = embedding_weight
+        self.sample_rows = sample_rows
+        self.max_value_length = max_value_length
+        self.stats = SchemaCacheStats()
+        self._lock = threading.Lock()
+        self._fingerprint = None
+        self._tables: Dict[str, TableSchema] = {}
+        self._table_tokens: Dict[str, Tuple[Set[str], Set[str]]] = {}
+        self._idf: Dict[str, float] = {}
+        self._table_vectors: Optional[np.ndarray] = None
+
+    def fingerprint(self):
+        """Returns a value that changes whenever a table or column is created, altered or dropped."""
+        with self.engine.connect() as conn:
+            if self.engine.dialect.name == "sqlite":
+                return conn.execute(text("PRAGMA schema_version")).scalar()
+            if self.engine.dialect.name in ("mysql", "mariadb"):
+                return tuple(conn.execute(text(
+                    "SELECT COUNT(*), SUM(CRC32(CONCAT_WS(':', TABLE_NAME, COLUMN_NAME, COLUMN_TYPE, ORDINAL_POSITION))) "
+                    "FROM information_schema.COLUMNS WHERE TABLE_SCHEMA = DATABASE()"
+                )).one())
+        # Other dialects: fall back to table and column names, which still avoids re-reading sample rows
+        inspector = inspect(self.engine)
+        return tuple((table, tuple(column["name"] for column in inspector.get_columns(table))) for table in inspector.get_table_names())
+
+    def _sample_row(self, conn, table: str) -> Optional[List[str]]:
+        quote = self.engine.dialect.identifier_preparer.quote
+        row = conn.execute(text(f"SELECT * FROM {quote(table)} LIMIT 1")).first()
+        return [str(value)[:self.max_value_length] for value in row] if row else None
+
+    def _introspect(self) -> None:
+        start = time.perf_counter()
+        inspector = inspect(self.engine)
+        tables = {}
+        with self.engine.connect() as conn:
+            for table in inspector.get_table_names():
+                if table.startswith("sqlite_"):
+                    continue
+                foreign_keys = {}
+                for foreign_key in inspector.get_foreign_keys(table):
+                    for column, referred in zip(foreign_key["constrained_columns"], foreign_key["referred_columns"]):
+                        foreign_keys[column] = f"{foreign_key['referred_table']}.{referred}"
+                tables[table] = TableSchema(
+                    name=table,
+                    columns=[(column["name"], str(column["type"])) for column in inspector.get_columns(table)],
+                    primary_key=inspector.get_pk_constraint(table).get("constrained_columns") or [],
+                    foreign_keys=foreign_keys,
+                    sample_row=self._sample_row(conn, table) if self.sample_rows else None,
+                )
+
+        # Table-name words count double; words shared by many tables (id, name) count less
+        self._table_tokens = {
+            name: (set(identifier_tokens(name)), {token for column, _ in schema.columns for token in identifier_tokens(column)})
+            for name, schema in tables.items()
+        }
+        document_frequency = Counter(token for name_tokens, column_tokens in self._table_tokens.values() for token in name_tokens | column_tokens)
+        self._idf = {token: math.log(1 + len(tables) / count) for token, count in document_frequency.items()}
+
+        self._table_vectors = None
+        if self.embeddings and tables:
+            documents = [f"Table {name} with columns {', '.join(column for column, _ in schema.columns)}" for name, schema in tables.items()]
+            vectors = np.asarray(self.embeddings.embed_documents(documents), dtype=np.float32)
+            self._table_vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+        self._tables = tables
+        self.stats.introspections += 1
+        self.stats.introspection_seconds += time.perf_counter() - start
+        logger.info("Introspected %d tables in %.3fs", len(tables), time.perf_counter() - start)
+
+    def refresh(self) -> bool:
+        """Re-introspects the schema if its fingerprint changed; returns True if it did."""
+        fingerprint = self.fingerprint()
+        with self._lock:
+            if fingerprint == self._fingerprint:
+                return False
+            if self._fingerprint is not None:
+                self.stats.invalidations += 1
+                logger.info("Schema changed, re-introspecting")
+            self._introspect()
+            self._fingerprint = fingerprint
+            return True
+
+    @property
+    def tables(self) -> Dict[str, TableSchema]:
+        self.refresh()
+        return self._tables
+
+    def rank_tables(self, question: str) -> List[Tuple[str, float]]:
+        """
+        Scores every table against the question.
+
+        :param question: The user's question.
+        :return: (table, score) pairs, best first.
+        """
+        self.refresh()
+        self.stats.lookups += 1
+        names = list(self._tables)
+        if not names:
+            return []
+        question_tokens = set(identifier_tokens(question))
+        lexical = np.array([
+            sum(self._idf.get(token, 0.0) * (2.0 if token in name_tokens else 1.0 if token in column_tokens else 0.0) for token in question_tokens)
+            for name_tokens, column_tokens in (self._table_tokens[name] for name in names)
+        ])
+        scores = lexical / lexical.max() if lexical.max() > 0 else lexical
+        if self._table_vectors is not None:
+            query = np.asarray(self.embeddings.embed_query(question), dtype=np.float32)
+            scores = scores + self.embedding_weight * (self._table_vectors @ (query / max(np.linalg.norm(query), 1e-12)))
+        order = np.argsort(-scores, kind="stable")
+        return [(names[i], float(scores[i])) for i in order]
+
+    def relevant_tables(self, question: str) -> List[str]:
+        """Returns up to `max_tables` tables relevant to the question, or all tables if nothing matches."""
+        ranked = self.rank_tables(question)
+        matched = [name for name, score in ranked if score > 0]
+        return matched[:self.max_tables] if matched else [name for name, _ in ranked]
+
+    def describe(self, question: str) -> str:
+        """Returns compact summaries of the tables relevant to the question, one table per line."""
+        return "\n".join(self._tables[name].summary() for name in self.relevant_tables(question))
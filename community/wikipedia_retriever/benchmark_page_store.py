@@ -0,0 +1,105 @@
+import argparse
+import logging
+import os
+import random
+import tempfile
+import time
+from typing import List
+
+import numpy as np
+
+from benchmark_searcher import StubWikipedia
+from page_store import StoredPage, WikipediaPageStore
+from searcher import WikipediaSearcher
+
+WORDS = [
+    "ancient", "river", "harbor", "theory", "empire", "quantum", "garden", "railway", "treaty", "island",
+    "cathedral", "algorithm", "festival", "mountain", "dynasty", "protein", "orchestra", "volcano", "language", "bridge",
+    "comet", "monastery", "parliament", "desert", "glacier", "circuit", "novel", "painter", "reactor", "canal",
+]
+
+def make_corpus(count: int, seed: int = 0) -> List[StoredPage]:
+    """Pages with distinct three word titles and about 4000 characters of content, the retriever's default cut-off."""
+    rng = random.Random(seed)
+    titles = set()
+    while len(titles) < count:
+        titles.add(" ".join(word.capitalize() for word in rng.sample(WORDS, 3)))
+    now = time.time()
+    pages = []
+    for title in sorted(titles):
+        words = title.lower().split() + rng.sample(WORDS, 10)
+        content = " ".join(rng.choice(words) for _ in range(600))[:4000]
+        pages.append(StoredPage(title=title, content=content, fetched_at=now))
+    return pages
+
+def measure(label: str, searcher: WikipediaSearcher, queries: List[str], client: StubWikipedia) -> None:
+    times = []
+    start = time.perf_counter()
+    for query in queries:
+        times.append(searcher.get_summaries(query).response_time)
+    seconds = time.perf_counter() - start
+    print(
+        f"{label:<30} {seconds:7.2f} s  {client.calls:5d} API calls  "
+        f"per query p50 {np.percentile(times, 50) * 1000:7.2f} ms, p95 {np.percentile(times, 95) * 1000:7.2f} ms"
+    )
+
+def main():
+    """Compares local-hit latency of the on-disk WikipediaPageStore with remote fetches on a stand-in corpus and a stubbed Wikipedia."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--pages", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--search-delay", type=float, default=0.02)
+    parser.add_argument("--page-delay", type=float, default=0.03)
+    parser.add_argument("--top-k", type=int, default=1)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+    rng = random.Random(1)
+    corpus = make_corpus(args.pages)
+    titles = [page.title for page in corpus]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "wikipedia_pages.sqlite")
+        store = WikipediaPageStore(path)
+        start = time.perf_counter()
+        store.add_pages(corpus)
+        print(f"Indexed {len(store)} pages in {time.perf_counter() - start:.2f} s, {os.path.getsize(path) / 2**20:.1f} MiB on disk")
+
+        def make_searcher(store=None):
+            searcher = WikipediaSearcher(top_k=args.top_k, store=store)
+            client = StubWikipedia(args.search_delay, args.page_delay, titles)
+            searcher.retriever.wiki_client = client
+            return searcher, client
+
+        # Titles as users type them; the words of a title in another order, which name the page too;
+        # and two words of a title, which are broader than any one page and must go to Wikipedia
+        exact = [rng.choice([title, title.lower(), f" {title.upper()} "]) for title in rng.sample(titles, args.queries)]
+        reordered = [" ".join(rng.sample(title.lower().split(), 3)) for title in rng.sample(titles, args.queries)]
+        partial = [" ".join(rng.sample(title.split(), 2)) for title in rng.sample(titles, args.queries)]
+
+        searcher, client = make_searcher()
+        measure("remote, no store", searcher, exact, client)
+
+        # A fresh searcher each time, so answers come from disk rather than the in-memory cache
+        searcher, client = make_searcher(store)
+        measure("store, exact titles", searcher, exact, client)
+        searcher, client = make_searcher(store)
+        measure("store, full-text title match", searcher, reordered, client)
+        searcher, client = make_searcher(store)
+        measure("store, broad query (miss)", searcher, partial, client)
+
+        # Queries searched remotely once are remembered, as after a restart
+        searcher, client = make_searcher(store)
+        unseen = [f"Topic {index}" for index in range(args.queries)]
+        measure("store, first search (miss)", searcher, unseen, client)
+        searcher, client = make_searcher(store)
+        measure("store, remembered queries", searcher, unseen, client)
+        print(f"  {searcher.stats.report()}")
+
+        stale = WikipediaPageStore(path, max_age=0)
+        searcher, client = make_searcher(stale)
+        measure("store, stale entries", searcher, exact, client)
+        stale.close()
+        store.close()
+
+if __name__ == "__main__":
+    main()
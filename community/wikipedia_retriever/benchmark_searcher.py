@@ -0,0 +1,103 @@
+import argparse
+import asyncio
+import logging
+import random
+import threading
+import time
+from types import SimpleNamespace
+from typing import List
+
+import numpy as np
+
+from searcher import WikipediaSearcher
+
+class StubWikipedia:
+    """Stands in for the wikipedia package: deterministic titles and pages, each call after a delay."""
+    exceptions = SimpleNamespace(PageError=KeyError, DisambiguationError=ValueError)
+
+    def __init__(self, search_delay: float, page_delay: float, entities: List[str]) -> None:
+        self.search_delay = search_delay
+        self.page_delay = page_delay
+        self.entities = entities
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def search(self, query: str, results: int = 3) -> List[str]:
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.search_delay)
+        rng = random.Random(" ".join(query.lower().split()))
+        # The entity's own page plus related pages, which other queries find too
+        return [query.strip().title()] + rng.sample(self.entities, results - 1)
+
+    def page(self, title: str, auto_suggest: bool = False) -> SimpleNamespace:
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.page_delay)
+        content = f"{title} is a subject covered by this encyclopedia. " * 40
+        return SimpleNamespace(content=content, summary=content[:200], url=f"https://en.wikipedia.org/wiki/{title.replace(' ', '_')}")
+
+def make_queries(count: int, entities: List[str], seed: int = 0) -> List[str]:
+    """A skewed entity workload, with the case and spacing variations real jobs have."""
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(len(entities))]
+    queries = []
+    for entity in rng.choices(entities, weights, k=count):
+        queries.append(rng.choice([entity, entity.lower(), f" {entity} ", entity.upper()]))
+    return queries
+
+def report(label: str, seconds: float, responses, client: StubWikipedia) -> None:
+    times = [response.response_time for response in responses]
+    print(
+        f"{label:<26} {seconds:7.2f} s  {len(responses) / seconds:7.1f} queries/s  {client.calls:5d} API calls  "
+        f"per query p50 {np.percentile(times, 50) * 1000:6.1f} ms, p95 {np.percentile(times, 95) * 1000:6.1f} ms"
+    )
+
+def main():
+    """Compares one-at-a-time WikipediaRetriever lookups with the cached, batched WikipediaSearcher on a stubbed Wikipedia."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--entities", type=int, default=150)
+    parser.add_argument("--search-delay", type=float, default=0.02)
+    parser.add_argument("--page-delay", type=float, default=0.03)
+    parser.add_argument("--max-workers", type=int, default=8)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+    entities = [f"Entity {index}" for index in range(args.entities)]
+    queries = make_queries(args.queries, entities)
+
+    def make_searcher():
+        searcher = WikipediaSearcher(max_workers=args.max_workers)
+        client = StubWikipedia(args.search_delay, args.page_delay, entities)
+        searcher.retriever.wiki_client = client
+        return searcher, client
+
+    # The previous implementation: retriever.invoke per query, timed with time.time()
+    searcher, client = make_searcher()
+    start = time.perf_counter()
+    responses = []
+    for query in queries:
+        query_start = time.perf_counter()
+        searcher.retriever.invoke(query)
+        responses.append(SimpleNamespace(response_time=time.perf_counter() - query_start))
+    report("retriever.invoke, serial", time.perf_counter() - start, responses, client)
+
+    searcher, client = make_searcher()
+    start = time.perf_counter()
+    responses = [searcher.get_summaries(query) for query in queries]
+    report("get_summaries, serial", time.perf_counter() - start, responses, client)
+
+    searcher, client = make_searcher()
+    start = time.perf_counter()
+    responses = searcher.get_summaries_batch(queries)
+    report("get_summaries_batch", time.perf_counter() - start, responses, client)
+    print(f"  {searcher.stats.report()}")
+
+    searcher, client = make_searcher()
+    start = time.perf_counter()
+    responses = asyncio.run(searcher.aget_summaries_batch(queries))
+    report("aget_summaries_batch", time.perf_counter() - start, responses, client)
+    print(f"  {searcher.stats.report()}")
+
+if __name__ == "__main__":
+    main()
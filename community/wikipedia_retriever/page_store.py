@@ -0,0 +1,171 @@
+import json
+import re
+import sqlite3
+import threading
+import time
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY,
+    title_key TEXT UNIQUE NOT NULL,
+    title TEXT NOT NULL,
+    content TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS pages_fts USING fts5(
+    title, content, content='pages', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS pages_insert AFTER INSERT ON pages BEGIN
+    INSERT INTO pages_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS pages_delete AFTER DELETE ON pages BEGIN
+    INSERT INTO pages_fts(pages_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+END;
+CREATE TRIGGER IF NOT EXISTS pages_update AFTER UPDATE ON pages BEGIN
+    INSERT INTO pages_fts(pages_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+    INSERT INTO pages_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+END;
+CREATE TABLE IF NOT EXISTS queries (
+    query_key TEXT PRIMARY KEY,
+    titles TEXT NOT NULL,
+    searched_at REAL NOT NULL
+);
+"""
+
+class StoredPage(BaseModel):
+    title: str
+    content: str
+    fetched_at: float
+
+def _title_key(title: str) -> str:
+    return " ".join(title.replace("_", " ").casefold().split())
+
+def _query_key(query: str) -> str:
+    return " ".join(query.lower().split())
+
+def _terms(text: str) -> List[str]:
+    return re.findall(r"\w+", text.casefold())
+
+def _names_title(terms: List[str], title: str) -> bool:
+    """
+    Whether the query terms name this page: every word of the title outside a trailing
+    parenthetical qualifier is in the query, so is a word of the qualifier if there is one,
+    and every query term is in the title. "python language" names "Python (programming
+    language)" but "python" does not; "paris" does not name "Paris Saint-Germain F.C.".
+    """
+    base = set(_terms(re.sub(r"\s*\([^)]*\)\s*$", "", title)))
+    qualifier = set(_terms(title)) - base
+    query = set(terms)
+    return base <= query <= base | qualifier and (not qualifier or bool(query & qualifier))
+
+class WikipediaPageStore:
+    """
+    On-disk full-text index of fetched Wikipedia pages, in SQLite FTS5.
+
+    Pages are stored by normalized title and indexed by title and content. A query is
+    answered locally when it was searched remotely before, from the titles that search
+    found; when a stored page has the query as its title; or when at least `limit` stored
+    pages are named by the query, found by full-text search on titles and ranked by BM25.
+    A query names a page when it has every word of the title outside a parenthetical
+    qualifier and nothing else, so "paris" is not answered with "Paris Saint-Germain F.C.".
+    Even so the last rule can pick a different page than Wikipedia's search would, so it
+    can be turned off with `match_titles`. Entries older than `max_age` are ignored, so stale
+    pages are fetched again. Safe to share between threads.
+    """
+    def __init__(self, path: str, max_age: float = 7 * 24 * 60 * 60, match_titles: bool = True) -> None:
+        """
+        :param path: The SQLite database file.
+        :param max_age: Seconds a stored page or query result is used before it is fetched again.
+        :param match_titles: Whether queries never searched before may be answered by full-text title matches.
+        """
+        self.path = path
+        self.max_age = max_age
+        self.match_titles = match_titles
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def _cutoff(self) -> float:
+        return time.time() - self.max_age
+
+    def add_pages(self, pages: List[StoredPage]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO pages (title_key, title, content, fetched_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT(title_key) DO UPDATE SET title = excluded.title, content = excluded.content, fetched_at = excluded.fetched_at
+                """,
+                [(_title_key(page.title), page.title, page.content, page.fetched_at) for page in pages],
+            )
+
+    def add_query(self, query: str, titles: List[str]) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO queries (query_key, titles, searched_at) VALUES (?, ?, ?)",
+                (_query_key(query), json.dumps(titles), time.time()),
+            )
+
+    def get_page(self, title: str) -> Optional[StoredPage]:
+        """Returns the stored page with this title if it is fresh."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT title, content, fetched_at FROM pages WHERE title_key = ? AND fetched_at >= ?",
+                (_title_key(title), self._cutoff()),
+            ).fetchone()
+        return StoredPage(title=row[0], content=row[1], fetched_at=row[2]) if row else None
+
+    def search(self, query: str, limit: int) -> Optional[List[StoredPage]]:
+        """
+        Answers a query from the store.
+
+        :param query: The search term.
+        :param limit: Pages returned at most.
+        :return: The matching pages, or None when the query cannot be answered locally.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT titles FROM queries WHERE query_key = ? AND searched_at >= ?", (_query_key(query), self._cutoff())
+            ).fetchone()
+        if row:
+            pages = [self.get_page(title) for title in json.loads(row[0])[:limit]]
+            if all(pages):
+                return pages
+
+        # Wikipedia's search puts the page titled as the query first
+        page = self.get_page(query)
+        if page is not None and limit == 1:
+            return [page]
+        if not self.match_titles:
+            return None
+        terms = _terms(query)
+        if not terms:
+            return None
+        # Quoted terms keep FTS5 operators and punctuation in the query from being interpreted
+        match = "title : (" + " AND ".join(f'"{term}"' for term in terms) + ")"
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT pages.title, pages.content, pages.fetched_at FROM pages_fts
+                JOIN pages ON pages.id = pages_fts.rowid
+                WHERE pages_fts MATCH ? AND pages.fetched_at >= ?
+                ORDER BY bm25(pages_fts, 10.0, 1.0) LIMIT ?
+                """,
+                (match, self._cutoff(), limit * 20),
+            ).fetchall()
+        rows = [row for row in rows if _names_title(terms, row[0])][:limit]
+        # Fewer pages than asked for leaves pages the remote search would find
+        if len(rows) < limit:
+            return None
+        return [StoredPage(title=title, content=content, fetched_at=fetched_at) for title, content, fetched_at in rows]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -1,9 +1,21 @@
+import asyncio
+import logging
+import threading
 import time
-from typing import List, Any
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 from pydantic import BaseModel
 from langchain_community.retrievers import WikipediaRetriever
 
+from page_store import StoredPage, WikipediaPageStore
+
+logger = logging.getLogger(__name__)
+
+# Wikipedia's search rejects longer queries, see langchain_community.utilities.wikipedia
+WIKIPEDIA_MAX_QUERY_LENGTH = 300
+
 class WikipediaSearchResult(BaseModel):
     title: str
     content: str
@@ -12,31 +24,220 @@ class WikipediaSearchResponse(BaseModel):
     query: str
     results: List[WikipediaSearchResult]
     response_time: float
+    cached: bool = False
+
+class WikipediaSearcherStats(BaseModel):
+    queries: int = 0
+    query_hits: int = 0
+    page_hits: int = 0
+    page_fetches: int = 0
+    coalesced: int = 0
+    local_hits: int = 0
+    errors: int = 0
+
+    def report(self) -> str:
+        ratio = self.query_hits / self.queries if self.queries else 0.0
+        return (
+            f"Wikipedia: {self.queries} queries, {self.query_hits} answered from cache ({ratio:.0%}), {self.local_hits} from the local store, "
+            f"{self.page_fetches} pages fetched, {self.page_hits} page cache hits, {self.coalesced} coalesced, {self.errors} errors"
+        )
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+def normalize_title(title: str) -> str:
+    return " ".join(title.replace("_", " ").casefold().split())
 
 class WikipediaSearcher:
     """
     A class to retrieve Wikipedia summaries using WikipediaRetriever.
+
+    Results are cached for `ttl` seconds: the titles a query found by normalized query, and
+    each page's content by normalized title, so queries that find the same pages share them.
+    Identical queries, and fetches of the same page, that are in flight at the same time
+    are made once. Batches run on a bounded thread pool, shared by the async methods.
+
+    With a `store`, fetched pages and the titles each query found are also kept on disk,
+    and queries and pages missing from memory are looked up there before Wikipedia.
     """
-    def __init__(self, top_k: int = 3) -> None:
+    def __init__(
+        self,
+        top_k: int = 3,
+        ttl: float = 6 * 60 * 60,
+        max_workers: int = 8,
+        maxsize: int = 10_000,
+        store: Optional[WikipediaPageStore] = None,
+    ) -> None:
         """
         Initializes the WikipediaSearcher with a specified number of results.
-        
+
         :param top_k: The number of results to retrieve.
+        :param ttl: Seconds a query's titles and a page's content are served from the cache.
+        :param max_workers: Queries run concurrently by the batch and async methods.
+        :param maxsize: Pages and queries kept in the cache each; the least recently used are evicted first.
+        :param store: An optional on-disk page store, answering queries locally first and kept up to date with fetched pages.
         """
         self.retriever = WikipediaRetriever(top_k_results=top_k)
-    
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.store = store
+        self.stats = WikipediaSearcherStats()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="wikipedia")
+        self._lock = threading.Lock()
+        self._inflight: Dict[Tuple[str, str], Future] = {}
+        self._queries: "OrderedDict[str, Tuple[List[str], float]]" = OrderedDict()
+        self._pages: "OrderedDict[str, Tuple[Optional[WikipediaSearchResult], float]]" = OrderedDict()
+
+    def _get(self, entries: OrderedDict, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = entries.get(key)
+            if entry is None or time.monotonic() - entry[1] > self.ttl:
+                return None
+            entries.move_to_end(key)
+            return entry
+
+    def _put(self, entries: OrderedDict, key: str, value: Any) -> None:
+        with self._lock:
+            entries[key] = (value, time.monotonic())
+            entries.move_to_end(key)
+            while len(entries) > self.maxsize:
+                entries.popitem(last=False)
+
+    def _once(self, key: Tuple[str, str], func: Callable[[], Any]) -> Any:
+        """Runs `func`, or waits for the call already running under the same key and shares its result."""
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+            else:
+                self.stats.coalesced += 1
+        if not owner:
+            return future.result()
+        try:
+            result = func()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    def _fetch_page(self, title: str) -> Optional[WikipediaSearchResult]:
+        """Fetches a page like WikipediaRetriever does; None for missing and disambiguation pages."""
+        client = self.retriever.wiki_client
+        try:
+            page = client.page(title=title, auto_suggest=False)
+        except (client.exceptions.PageError, client.exceptions.DisambiguationError):
+            return None
+        with self._lock:
+            self.stats.page_fetches += 1
+        return WikipediaSearchResult(title=title, content=page.content[:self.retriever.doc_content_chars_max])
+
+    def _page(self, title: str) -> Optional[WikipediaSearchResult]:
+        key = normalize_title(title)
+        entry = self._get(self._pages, key)
+        if entry is not None:
+            with self._lock:
+                self.stats.page_hits += 1
+            return entry[0]
+
+        def fetch() -> Optional[WikipediaSearchResult]:
+            stored = self.store.get_page(title) if self.store is not None else None
+            if stored is not None:
+                with self._lock:
+                    self.stats.local_hits += 1
+                page = WikipediaSearchResult(title=stored.title, content=stored.content)
+            else:
+                page = self._fetch_page(title)
+                if page is not None and self.store is not None:
+                    self.store.add_pages([StoredPage(title=page.title, content=page.content, fetched_at=time.time())])
+            self._put(self._pages, key, page)
+            return page
+        return self._once(("page", key), fetch)
+
+    def _search(self, query: str) -> Tuple[List[WikipediaSearchResult], bool]:
+        key = normalize_query(query)
+        entry = self._get(self._queries, key)
+        if entry is not None:
+            # A hit needs every page of the query still cached too
+            pages = [self._get(self._pages, normalize_title(title)) for title in entry[0]]
+            if all(page is not None for page in pages):
+                with self._lock:
+                    self.stats.query_hits += 1
+                return [page[0] for page in pages if page[0] is not None], True
+
+        def local() -> Optional[List[WikipediaSearchResult]]:
+            stored = self.store.search(query, self.retriever.top_k_results)
+            if stored is None:
+                return None
+            pages = [WikipediaSearchResult(title=page.title, content=page.content) for page in stored]
+            self._put(self._queries, key, [page.title for page in pages])
+            for page in pages:
+                self._put(self._pages, normalize_title(page.title), page)
+            with self._lock:
+                self.stats.local_hits += 1
+            return pages
+
+        def search() -> Tuple[List[WikipediaSearchResult], bool]:
+            if self.store is not None:
+                pages = local()
+                if pages is not None:
+                    return pages, True
+            titles = self.retriever.wiki_client.search(query[:WIKIPEDIA_MAX_QUERY_LENGTH], results=self.retriever.top_k_results)
+            titles = titles[:self.retriever.top_k_results]
+            self._put(self._queries, key, titles)
+            if self.store is not None:
+                self.store.add_query(query, titles)
+            return [page for page in (self._page(title) for title in titles) if page is not None], False
+        return self._once(("query", key), search)
+
     def get_summaries(self, query: str) -> WikipediaSearchResponse:
         """
         Retrieves a summary of Wikipedia articles based on the query.
-        
+
         :param query: The search term for Wikipedia.
         :return: A WikipediaSearchResponse object containing Wikipedia summaries.
         """
-        start_time = time.time()
-        results = self.retriever.invoke(query)
-        search_results = [WikipediaSearchResult(title=doc.metadata.get("title", "Unknown"), content=doc.page_content) for doc in results]
-        response_time = time.time() - start_time
-        return WikipediaSearchResponse(query=query, results=search_results, response_time=response_time)
+        start_time = time.perf_counter()
+        with self._lock:
+            self.stats.queries += 1
+        try:
+            search_results, cached = self._search(query)
+        except Exception:
+            with self._lock:
+                self.stats.errors += 1
+            raise
+        response_time = time.perf_counter() - start_time
+        logger.info(f"'{query}': {len(search_results)} results in {response_time:.3f}s{' from cache' if cached else ''}")
+        return WikipediaSearchResponse(query=query, results=search_results, response_time=response_time, cached=cached)
+
+    def get_summaries_batch(self, queries: Sequence[str]) -> List[WikipediaSearchResponse]:
+        """
+        Retrieves summaries for many queries concurrently, on at most `max_workers` threads.
+
+        :param queries: The search terms; repeats are searched once.
+        :return: One WikipediaSearchResponse per query, in order.
+        """
+        return list(self._executor.map(self.get_summaries, queries))
+
+    async def aget_summaries(self, query: str) -> WikipediaSearchResponse:
+        """Async version of `get_summaries`, run on the searcher's thread pool."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self.get_summaries, query)
+
+    async def aget_summaries_batch(self, queries: Sequence[str]) -> List[WikipediaSearchResponse]:
+        """Async version of `get_summaries_batch`."""
+        return list(await asyncio.gather(*(self.aget_summaries(query) for query in queries)))
+
+    def cache_clear(self) -> None:
+        with self._lock:
+            self._queries.clear()
+            self._pages.clear()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
 
 if __name__ == "__main__":
     query = input("What do you want to search for on Wikipedia? ")
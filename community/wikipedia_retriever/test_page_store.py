@@ -0,0 +1,47 @@
+import time
+
+import pytest
+
+from page_store import StoredPage, WikipediaPageStore, _names_title, _terms
+
+@pytest.mark.parametrize("query, title, names", [
+    ("python", "Python", True),
+    ("Programming Python language", "Python (programming language)", True),
+    ("python language", "Python (programming language)", True),
+    ("python", "Python (programming language)", False),
+    ("paris", "Paris Saint-Germain F.C.", False),
+    ("paris saint-germain f.c.", "Paris Saint-Germain F.C.", True),
+    ("paris france", "Paris", False),
+    ("river thames", "River Thames", True),
+    ("thames river", "River Thames", True),
+])
+def test_names_title(query, title, names):
+    assert _names_title(_terms(query), title) is names
+
+@pytest.fixture
+def store(tmp_path):
+    store = WikipediaPageStore(str(tmp_path / "pages.sqlite"))
+    now = time.time()
+    store.add_pages([
+        StoredPage(title=title, content=f"{title} content", fetched_at=now)
+        for title in ["Paris", "Paris Saint-Germain F.C.", "Python (programming language)", "River Thames"]
+    ])
+    yield store
+    store.close()
+
+def test_search_answers_only_queries_that_name_a_page(store):
+    assert [page.title for page in store.search("thames river", 1)] == ["River Thames"]
+    assert [page.title for page in store.search("python language", 1)] == ["Python (programming language)"]
+    assert store.search("saint germain", 1) is None
+    assert store.search("python", 1) is None
+
+def test_search_without_title_matching_needs_the_exact_title(tmp_path):
+    store = WikipediaPageStore(str(tmp_path / "pages.sqlite"), match_titles=False)
+    store.add_pages([StoredPage(title="River Thames", content="", fetched_at=time.time())])
+    assert [page.title for page in store.search(" river THAMES ", 1)] == ["River Thames"]
+    assert store.search("thames river", 1) is None
+    store.close()
+
+def test_remembered_query_is_answered_with_its_titles(store):
+    store.add_query("French capital", ["Paris"])
+    assert [page.title for page in store.search("french  CAPITAL", 1)] == ["Paris"]
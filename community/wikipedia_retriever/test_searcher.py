@@ -0,0 +1,76 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from searcher import WikipediaSearcher
+
+class BlockingWikipedia:
+    """Stands in for the wikipedia package; searches wait until `release` is set, or fail with `error`."""
+    exceptions = SimpleNamespace(PageError=KeyError, DisambiguationError=ValueError)
+
+    def __init__(self, error: Exception = None) -> None:
+        self.error = error
+        self.release = threading.Event()
+        self.searches = 0
+        self.pages = 0
+
+    def search(self, query, results=3):
+        self.searches += 1
+        assert self.release.wait(5)
+        if self.error:
+            raise self.error
+        return [query.strip().title()]
+
+    def page(self, title, auto_suggest=False):
+        self.pages += 1
+        return SimpleNamespace(content=f"{title} content")
+
+def make_searcher(client):
+    searcher = WikipediaSearcher(top_k=1, max_workers=8)
+    searcher.retriever.wiki_client = client
+    return searcher
+
+def wait_for(condition):
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+def test_concurrent_identical_queries_search_once():
+    client = BlockingWikipedia()
+    searcher = make_searcher(client)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(searcher.get_summaries, query) for query in ["Paris", "paris", " PARIS ", "Paris"]]
+        # Every caller but the first is waiting on the in-flight search before it is allowed to finish
+        wait_for(lambda: searcher.stats.coalesced == 3)
+        client.release.set()
+        responses = [future.result() for future in futures]
+
+    assert client.searches == 1 and client.pages == 1
+    assert [response.results[0].title for response in responses] == ["Paris"] * 4
+    assert searcher._inflight == {}
+    searcher.close()
+
+def test_failed_search_is_shared_and_not_left_in_flight():
+    client = BlockingWikipedia(error=RuntimeError("rate limited"))
+    searcher = make_searcher(client)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        futures = [pool.submit(searcher.get_summaries, "Paris") for _ in range(2)]
+        wait_for(lambda: searcher.stats.coalesced == 1)
+        client.release.set()
+        for future in futures:
+            with pytest.raises(RuntimeError, match="rate limited"):
+                future.result()
+
+    assert client.searches == 1
+    assert searcher._inflight == {}
+    assert searcher.stats.errors == 2
+
+    # Errors are not cached, so the next call searches again
+    client.error = None
+    assert searcher.get_summaries("Paris").results[0].title == "Paris"
+    assert client.searches == 2
+    searcher.close()
@@ -1,8 +1,21 @@
+import os
+import sys
+
 from langchain_openai import OpenAIEmbeddings
-import numpy as np
 
-# Initialize OpenAI embeddings model
-embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
+from vector_index import VectorIndex
+
+# Shared embeddings helpers live one directory up
+EMBEDDINGS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(EMBEDDINGS_DIR)
+
+from embedding_cache import CachedEmbeddings
+
+# Initialize OpenAI embeddings model behind the on-disk cache shared with the other demos
+embeddings = CachedEmbeddings(
+    OpenAIEmbeddings(model="text-embedding-3-small"),
+    cache_dir=os.path.join(EMBEDDINGS_DIR, ".embedding_cache"),
+)
 
 # Sample documents
 documents = [
@@ -13,27 +26,19 @@ documents = [
     "Stock market trends are influenced by economic policies."
 ]
 
-# Generate embeddings for documents
-document_embeddings = [embeddings.embed_query(doc) for doc in documents]
-
-# Function to calculate cosine similarity
-def cosine_similarity(vec1, vec2):
-    return np.dot(vec1, vec2) / (np.linalg.norm(vec1) * np.linalg.norm(vec2))
+# Generate embeddings for documents in batched requests and index them
+index = VectorIndex(embeddings, batch_size=256)
+index.add_texts(documents)
 
 # User input for search query
 query = input("Enter your search query: ")
 
-# Embed the user query
-query_embedding = embeddings.embed_query(query)
-
-# Compute similarities with all documents
-similarities = [cosine_similarity(query_embedding, doc_emb) for doc_emb in document_embeddings]
-
 # Find the most similar document
-best_match_index = np.argmax(similarities)
-best_match_text = documents[best_match_index]
-best_match_score = similarities[best_match_index]
+best_match_text, best_match_score = index.search(query, k=1)[0]
 
 # Display results
 print("\nBest matching document:")
 print(f'"{best_match_text}" (Score: {best_match_score:.4f})')
+
+# Display cache savings
+print(f"\n{embeddings.stats.report()}")
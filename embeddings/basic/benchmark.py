@@ -0,0 +1,62 @@
+import argparse
+import time
+
+import numpy as np
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from vector_index import VectorIndex
+
+# Per-pair scoring as previously done in app.py
+def cosine_similarity(vec1, vec2):
+    return np.dot(vec1, vec2) / (np.linalg.norm(vec1) * np.linalg.norm(vec2))
+
+def per_pair_search(query_embedding, document_embeddings):
+    similarities = [cosine_similarity(query_embedding, doc_emb) for doc_emb in document_embeddings]
+    return int(np.argmax(similarities))
+
+def main():
+    """Compares the per-pair cosine loop with VectorIndex top-k search at increasing corpus sizes."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--dim", type=int, default=128, help="Embedding dimension of the fake embedder.")
+    parser.add_argument("--queries", type=int, default=32, help="Queries answered by the index per size.")
+    parser.add_argument("--loop-queries", type=int, default=3, help="Queries answered by the per-pair loop per size.")
+    parser.add_argument("--batch-size", type=int, default=1024)
+    parser.add_argument("--k", type=int, default=5)
+    args = parser.parse_args()
+
+    # Deterministic local embedder: the same text always maps to the same vector
+    embeddings = DeterministicFakeEmbedding(size=args.dim)
+    queries = [f"query {i}" for i in range(args.queries)]
+
+    print(f"{'vectors':>10} {'build s':>9} {'loop ms/q':>10} {'index ms/q':>11} {'batch ms/q':>11} {'speedup':>8}")
+    for size in args.sizes:
+        index = VectorIndex(embeddings, batch_size=args.batch_size)
+        start = time.perf_counter()
+        index.add_texts(f"passage {i}" for i in range(size))
+        build_time = time.perf_counter() - start
+
+        query_vectors = np.asarray(embeddings.embed_documents(queries), dtype=np.float32)
+        # Rows of the raw matrix stand in for the list of per-document embeddings
+        document_embeddings = list(index.matrix)
+
+        loop_queries = query_vectors[:args.loop_queries]
+        start = time.perf_counter()
+        loop_best = [per_pair_search(q, document_embeddings) for q in loop_queries]
+        loop_ms = (time.perf_counter() - start) * 1000 / len(loop_queries)
+
+        start = time.perf_counter()
+        for q in loop_queries:
+            index.search_vectors(q, args.k)
+        single_ms = (time.perf_counter() - start) * 1000 / len(loop_queries)
+
+        start = time.perf_counter()
+        indices, _ = index.search_vectors(query_vectors, args.k)
+        batch_ms = (time.perf_counter() - start) * 1000 / len(query_vectors)
+
+        if loop_best != list(indices[:len(loop_queries), 0]):
+            print(f"warning: top-1 mismatch at {size} vectors")
+        print(f"{size:>10} {build_time:>9.2f} {loop_ms:>10.2f} {single_ms:>11.3f} {batch_ms:>11.3f} {loop_ms / batch_ms:>7.0f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+from typing import Iterable, List, Sequence, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+
+class VectorIndex:
+    """
+    An in-memory cosine similarity index over a LangChain embeddings model.
+
+    Document vectors are L2-normalized once at insert time and stored in a single
+    contiguous float32 matrix, so scoring a batch of queries is one matrix multiply.
+    """
+    def __init__(self, embeddings: Embeddings, batch_size: int = 256) -> None:
+        """
+        Initializes an empty index.
+
+        :param embeddings: The embeddings model used for documents and queries.
+        :param batch_size: The number of texts sent per `embed_documents` call.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+        self.embeddings = embeddings
+        self.batch_size = batch_size
+        self.texts: List[str] = []
+        self.matrix = np.empty((0, 0), dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    @staticmethod
+    def normalize(vectors: np.ndarray) -> np.ndarray:
+        """Returns a float32 copy of the vectors scaled to unit length (zero vectors stay zero)."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return np.ascontiguousarray(vectors / norms)
+
+    def add_texts(self, texts: Iterable[str]) -> None:
+        """
+        Embeds the texts in batches and appends them to the index.
+
+        :param texts: The documents to index.
+        """
+        texts = list(texts)
+        if not texts:
+            return
+        batches = []
+        for start in range(0, len(texts), self.batch_size):
+            batch = texts[start:start + self.batch_size]
+            batches.append(np.asarray(self.embeddings.embed_documents(batch), dtype=np.float32))
+        self.add_vectors(texts, np.concatenate(batches))
+
+    def add_vectors(self, texts: Sequence[str], vectors: np.ndarray) -> None:
+        """
+        Appends precomputed vectors to the index.
+
+        :param texts: The documents the vectors belong to.
+        :param vectors: A (len(texts), dim) array; it is normalized before storing.
+        """
+        vectors = self.normalize(vectors)
+        if vectors.ndim != 2 or len(vectors) != len(texts):
+            raise ValueError("vectors must be a 2-D array with one row per text.")
+        if self.matrix.size and vectors.shape[1] != self.matrix.shape[1]:
+            raise ValueError(f"Expected vectors of dimension {self.matrix.shape[1]}, got {vectors.shape[1]}.")
+        self.matrix = vectors if not self.matrix.size else np.concatenate([self.matrix, vectors])
+        self.texts.extend(texts)
+
+    def search_vectors(self, query_vectors: np.ndarray, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Finds the top-k documents for each query vector.
+
+        :param query_vectors: A (num_queries, dim) array of query embeddings.
+        :param k: The number of results per query.
+        :return: (indices, scores) arrays of shape (num_queries, k), best match first.
+        """
+        if not len(self.texts):
+            raise ValueError("The index is empty.")
+        k = min(k, len(self.texts))
+        scores = self.normalize(np.atleast_2d(query_vectors)) @ self.matrix.T
+        if k < scores.shape[1]:
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top = np.tile(np.arange(scores.shape[1]), (scores.shape[0], 1))
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+    def search_many(self, queries: Sequence[str], k: int = 1) -> List[List[Tuple[str, float]]]:
+        """
+        Returns the top-k (text, score) pairs for each query.
+
+        :param queries: The search queries.
+        :param k: The number of results per query.
+        """
+        # Embed all queries in one request rather than one round trip each
+        query_vectors = np.asarray(self.embeddings.embed_documents(list(queries)), dtype=np.float32)
+        indices, scores = self.search_vectors(query_vectors, k)
+        return [
+            [(self.texts[i], float(score)) for i, score in zip(row_indices, row_scores)]
+            for row_indices, row_scores in zip(indices, scores)
+        ]
+
+    def search(self, query: str, k: int = 1) -> List[Tuple[str, float]]:
+        """
+        Returns the top-k (text, score) pairs for a single query.
+
+        :param query: The search query.
+        :param k: The number of results.
+        """
+        query_vector = np.asarray(self.embeddings.embed_query(query), dtype=np.float32)
+        indices, scores = self.search_vectors(query_vector, k)
+        return [(self.texts[i], float(score)) for i, score in zip(indices[0], scores[0])]
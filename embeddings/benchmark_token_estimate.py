@@ -0,0 +1,54 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from costs import estimate_cost, estimate_cost_bulk, iter_texts
+
+WORDS = (
+    "artificial intelligence quantum computing climate change stock market olympics telescope "
+    "galaxies motivation productivity diet longevity dynasties invasions regulation depression"
+).split()
+
+def write_corpus(path: str, num_docs: int, words_per_doc: int) -> None:
+    """Writes a synthetic corpus with one document per line."""
+    rng = random.Random(0)
+    with open(path, "w", encoding="utf-8") as f:
+        for _ in range(num_docs):
+            f.write(" ".join(rng.choices(WORDS, k=words_per_doc)) + "\n")
+
+def main():
+    """Compares the single-core estimate_cost generator with estimate_cost_bulk at increasing worker counts."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--docs", type=int, default=200_000)
+    parser.add_argument("--words", type=int, default=60, help="Words per synthetic document.")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, nargs="+", default=None, help="Worker counts to try (default: 1, 2, 4, ... up to the CPU count).")
+    args = parser.parse_args()
+
+    cpu_count = os.cpu_count() or 1
+    workers = args.workers or sorted({2 ** i for i in range(cpu_count.bit_length()) if 2 ** i <= cpu_count} | {cpu_count})
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        corpus = os.path.join(tmp_dir, "corpus.txt")
+        write_corpus(corpus, args.docs, args.words)
+        print(f"{args.docs} documents, {cpu_count} CPUs")
+
+        start = time.perf_counter()
+        baseline_tokens, _ = estimate_cost(iter_texts(corpus))
+        baseline_time = time.perf_counter() - start
+        print(f"{'estimate_cost':>16} {baseline_time:>8.2f} s {args.docs / baseline_time:>12,.0f} docs/s")
+
+        for count in workers:
+            start = time.perf_counter()
+            result = estimate_cost_bulk(corpus, workers=count, batch_size=args.batch_size)
+            elapsed = time.perf_counter() - start
+            assert result.total_tokens == baseline_tokens, "token totals differ from estimate_cost"
+            print(
+                f"{f'bulk x{count}':>16} {elapsed:>8.2f} s {args.docs / elapsed:>12,.0f} docs/s "
+                f"{baseline_time / elapsed:>6.1f}x  (${result.cost:.4f}, {result.token_counts.nbytes / 1e6:.1f} MB of counts)"
+            )
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,26 @@
+import os
+import sys
+
 from langchain_openai import OpenAIEmbeddings
 from langchain_chroma import Chroma
 from langchain_core.documents import Document
-import tiktoken
-
-# OpenAI pricing for text-embedding-3-small
-COST_PER_1K_TOKENS = 0.00002  # $0.00002 per 1,000 tokens
 
-# Initialize OpenAI embeddings
-embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
+# Shared embeddings helpers live one directory up
+EMBEDDINGS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(EMBEDDINGS_DIR)
 
-# OpenAI tokenizer
-tokenizer = tiktoken.encoding_for_model("text-embedding-3-small")
+from costs import estimate_cost
+from embedding_cache import CachedEmbeddings
+from chroma_sync import sync_documents
 
-# Function to count tokens in text
-def count_tokens(text):
-    return len(tokenizer.encode(text))
+# Directory where the Chroma collection is persisted between runs
+PERSIST_DIRECTORY = os.getenv("CHROMA_PERSIST_DIRECTORY", os.path.join(os.path.dirname(os.path.abspath(__file__)), "chroma_db"))
 
-# Function to estimate cost based on token count
-def estimate_cost(texts):
-    total_tokens = sum(count_tokens(text) for text in texts)
-    cost = (total_tokens / 1000) * COST_PER_1K_TOKENS
-    return total_tokens, cost
+# Initialize OpenAI embeddings behind the on-disk cache shared with the other demos
+embeddings = CachedEmbeddings(
+    OpenAIEmbeddings(model="text-embedding-3-small"),
+    cache_dir=os.path.join(EMBEDDINGS_DIR, ".embedding_cache"),
+)
 
 # Diverse dataset: Each document has a title and body
 documents = [
@@ -37,15 +37,16 @@ documents = [
 ]
 
 # Format data as LangChain Documents
-document_objs = [Document(page_content=f"{doc['title']}\n{doc['body']}") for doc in documents]
+document_objs = [Document(page_content=f"{doc['title']}\n{doc['body']}", metadata={"title": doc["title"]}) for doc in documents]
 
-# Calculate cost of storing documents
-doc_texts = [f"{doc['title']} {doc['body']}" for doc in documents]
-doc_tokens, doc_cost = estimate_cost(doc_texts)
-print(f"\n📄 Estimated cost to store documents: ${doc_cost:.6f} ({doc_tokens} tokens)")
+# Open the persistent collection and embed only new or changed documents (cost incurred here)
+vectorstore = Chroma(collection_name="documents", embedding_function=embeddings, persist_directory=PERSIST_DIRECTORY)
+sync_report = sync_documents(vectorstore, document_objs)
+print(f"\n🔄 Sync report:\n{sync_report.report()}")
 
-# Store embeddings in Chroma (cost incurred here)
-vectorstore = Chroma.from_documents(document_objs, embeddings)
+# Calculate cost of storing the documents that were embedded
+doc_tokens, doc_cost = estimate_cost(sync_report.embedded_texts)
+print(f"\n📄 Estimated cost to store documents: ${doc_cost:.6f} ({doc_tokens} tokens)")
 
 # User input search query
 query = input("\n🔍 Enter your search query: ")
@@ -68,3 +69,5 @@ print("\n💲 **Cost Summary** 💲")
 print(f"📄 Documents Cost: ${doc_cost:.6f} ({doc_tokens} tokens)")
 print(f"🔍 Query Cost: ${query_cost:.6f} ({query_tokens} tokens)")
 print(f"💰 **Total Estimated Cost:** ${total_cost:.6f}")
+print(f"♻️ {embeddings.stats.report()}")
+print(f"💸 **Total Actual Cost:** ${max(total_cost - embeddings.stats.cost_saved, 0.0):.6f}")
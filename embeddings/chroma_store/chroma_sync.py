@@ -0,0 +1,132 @@
+import hashlib
+import time
+from typing import Callable, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+from langchain_chroma import Chroma
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+class SyncReport(BaseModel):
+    added: int = 0
+    updated: int = 0
+    deleted: int = 0
+    skipped: int = 0
+    timings: Dict[str, float] = Field(default_factory=dict)
+    embedded_texts: List[str] = Field(default_factory=list, repr=False)
+
+    def report(self) -> str:
+        phases = ", ".join(f"{phase} {seconds * 1000:.1f} ms" for phase, seconds in self.timings.items())
+        return (
+            f"Added: {self.added}, updated: {self.updated}, deleted: {self.deleted}, skipped: {self.skipped}\n"
+            f"Timings: {phases}"
+        )
+
+class _TimedEmbeddings(Embeddings):
+    """Delegates to an embedding model and adds up the time spent embedding documents."""
+    def __init__(self, embeddings: Embeddings) -> None:
+        self.embeddings = embeddings
+        self.seconds = 0.0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        start = time.perf_counter()
+        try:
+            return self.embeddings.embed_documents(texts)
+        finally:
+            self.seconds += time.perf_counter() - start
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embeddings.embed_query(text)
+
+def document_id(doc: Document) -> str:
+    """
+    Returns a stable id for a document: its own id, or a hash of its source and title.
+
+    The source is the `source` metadata loaders set, and the title the `title` metadata or the first line.
+    """
+    if doc.id:
+        return doc.id
+    title = doc.metadata.get("title") or doc.page_content.split("\n", 1)[0]
+    source = str(doc.metadata.get("source", ""))
+    return hashlib.sha256(f"{source}\0{title}".encode("utf-8")).hexdigest()
+
+def fingerprint(doc: Document) -> str:
+    """Returns a hash of the document content (title and body)."""
+    return hashlib.sha256(doc.page_content.encode("utf-8")).hexdigest()
+
+def sync_documents(
+    vectorstore: Chroma,
+    documents: List[Document],
+    batch_size: int = 1000,
+    key: Optional[Callable[[Document], str]] = None,
+) -> SyncReport:
+    """
+    Brings a persistent Chroma collection in line with `documents`.
+
+    Only new or changed documents are embedded and upserted; documents that are no
+    longer in the source list are deleted, and unchanged ones are left untouched.
+
+    :param vectorstore: A Chroma store, usually created with a `persist_directory`.
+    :param documents: The full, current list of source documents.
+    :param batch_size: The number of documents embedded and written per batch.
+    :param key: Returns a document's stable id; `document_id` if omitted.
+    :return: A SyncReport with per-outcome counts and per-phase timings.
+    :raises ValueError: If two documents have the same id, since one would silently replace the other.
+    """
+    report = SyncReport()
+
+    start = time.perf_counter()
+    source = {}
+    for doc in documents:
+        doc_id = (key or document_id)(doc)
+        if doc_id in source:
+            title = doc.metadata.get("title") or doc.page_content.split("\n", 1)[0]
+            raise ValueError(f"Two documents have the id {doc_id} ('{title}'); give them distinct ids, sources or a `key`.")
+        source[doc_id] = Document(
+            id=doc_id,
+            page_content=doc.page_content,
+            metadata={**doc.metadata, "fingerprint": fingerprint(doc)},
+        )
+    report.timings["fingerprint"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    stored = vectorstore.get(include=["metadatas"])
+    stored_fingerprints = {
+        doc_id: (metadata or {}).get("fingerprint") for doc_id, metadata in zip(stored["ids"], stored["metadatas"])
+    }
+    changed = []
+    for doc_id, doc in source.items():
+        previous = stored_fingerprints.get(doc_id)
+        if previous == doc.metadata["fingerprint"]:
+            report.skipped += 1
+            continue
+        if doc_id not in stored_fingerprints:
+            report.added += 1
+        else:
+            report.updated += 1
+        changed.append(doc)
+    removed = [doc_id for doc_id in stored_fingerprints if doc_id not in source]
+    report.timings["diff"] = time.perf_counter() - start
+
+    # add_documents embeds the batch and upserts it by id, so changed documents are replaced. Chroma has no
+    # public way to write precomputed vectors, so its embedding function is wrapped meanwhile to time embedding apart
+    timer = _TimedEmbeddings(vectorstore.embeddings)
+    vectorstore._embedding_function = timer
+    start = time.perf_counter()
+    try:
+        for offset in range(0, len(changed), batch_size):
+            batch = changed[offset:offset + batch_size]
+            vectorstore.add_documents(batch, ids=[doc.id for doc in batch])
+            report.embedded_texts.extend(doc.page_content for doc in batch)
+    finally:
+        vectorstore._embedding_function = timer.embeddings
+    report.timings["embed"] = timer.seconds
+    report.timings["write"] = time.perf_counter() - start - timer.seconds
+
+    start = time.perf_counter()
+    if removed:
+        vectorstore.delete(ids=removed)
+    report.deleted = len(removed)
+    report.timings["delete"] = time.perf_counter() - start
+
+    return report
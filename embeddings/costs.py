@@ -0,0 +1,92 @@
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from typing import Iterable, Iterator, NamedTuple, Optional, Union
+
+import numpy as np
+import tiktoken
+
+# OpenAI pricing for text-embedding-3-small
+COST_PER_1K_TOKENS = 0.00002  # $0.00002 per 1,000 tokens
+
+# OpenAI tokenizer, loaded on first use
+@lru_cache(maxsize=None)
+def get_tokenizer(model: str = "text-embedding-3-small"):
+    return tiktoken.encoding_for_model(model)
+
+# Function to count tokens in text
+def count_tokens(text):
+    return len(get_tokenizer().encode(text))
+
+# Function to estimate cost based on token count
+def estimate_cost(texts):
+    total_tokens = sum(count_tokens(text) for text in texts)
+    cost = (total_tokens / 1000) * COST_PER_1K_TOKENS
+    return total_tokens, cost
+
+class BulkEstimate(NamedTuple):
+    token_counts: np.ndarray
+    total_tokens: int
+    cost: float
+
+def iter_texts(source: Union[str, os.PathLike, Iterable[str]]) -> Iterator[str]:
+    """
+    Streams documents from a file path or an iterable of strings.
+
+    Plain text files hold one document per line; `.jsonl` files hold one JSON object
+    per line with the document in its "text" field.
+    """
+    if not isinstance(source, (str, os.PathLike)):
+        yield from source
+        return
+    jsonl = os.fspath(source).endswith(".jsonl")
+    with open(source, encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            yield json.loads(line)["text"] if jsonl else line
+
+def _count_batch(texts: list, model: str) -> np.ndarray:
+    encoded = get_tokenizer(model).encode_ordinary_batch(texts, num_threads=1)
+    return np.fromiter((len(tokens) for tokens in encoded), dtype=np.uint32, count=len(texts))
+
+def estimate_cost_bulk(
+    source: Union[str, os.PathLike, Iterable[str]],
+    workers: Optional[int] = None,
+    batch_size: int = 1000,
+    model: str = "text-embedding-3-small",
+) -> BulkEstimate:
+    """
+    Counts tokens for a large corpus across a pool of worker processes.
+
+    Input is read lazily in batches and at most two batches per worker are in flight,
+    so memory stays bounded no matter how large the corpus is.
+
+    :param source: A file path (see `iter_texts`) or any iterable of texts.
+    :param workers: The number of worker processes; defaults to the CPU count, 1 runs inline.
+    :param batch_size: The number of texts encoded per task.
+    :param model: The model whose tokenizer is used.
+    :return: A BulkEstimate with per-document uint32 token counts, the total and the cost.
+    """
+    workers = workers or os.cpu_count() or 1
+    texts = iter_texts(source)
+    batches = iter(lambda: list(islice(texts, batch_size)), [])
+    counts = []
+
+    if workers == 1:
+        counts = [_count_batch(batch, model) for batch in batches]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=get_tokenizer, initargs=(model,)) as pool:
+            pending = deque()
+            for batch in batches:
+                pending.append(pool.submit(_count_batch, batch, model))
+                if len(pending) >= workers * 2:
+                    counts.append(pending.popleft().result())
+            counts.extend(future.result() for future in pending)
+
+    token_counts = np.concatenate(counts) if counts else np.empty(0, dtype=np.uint32)
+    total_tokens = int(token_counts.sum(dtype=np.uint64))
+    cost = (total_tokens / 1000) * COST_PER_1K_TOKENS
+    return BulkEstimate(token_counts, total_tokens, cost)
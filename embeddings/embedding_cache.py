@@ -0,0 +1,233 @@
+import atexit
+import hashlib
+import json
+import os
+import weakref
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+from pydantic import BaseModel
+from langchain_core.embeddings import Embeddings
+
+from costs import estimate_cost
+
+# Caches still open, saved at interpreter exit; weak, so a dropped cache releases its memory map
+_OPEN_CACHES: "weakref.WeakSet[CachedEmbeddings]" = weakref.WeakSet()
+
+@atexit.register
+def _close_open_caches() -> None:
+    for cache in list(_OPEN_CACHES):
+        cache.close()
+
+class CacheStats(BaseModel):
+    hits: int = 0
+    misses: int = 0
+    tokens_saved: int = 0
+    cost_saved: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def report(self) -> str:
+        return (
+            f"Cache hits: {self.hits}, misses: {self.misses} ({self.hit_rate:.0%} hit rate), "
+            f"saved {self.tokens_saved} tokens (${self.cost_saved:.6f})"
+        )
+
+class CachedEmbeddings(Embeddings):
+    """
+    Wraps a LangChain Embeddings object with a persistent, content-addressed vector cache.
+
+    Entries are keyed by a hash of (model, text). Vectors live in a memory-mapped
+    float32 file with one row per slot; an LRU-ordered index maps keys to rows and is
+    persisted next to it as JSON. The index is rewritten every `save_every` new entries
+    and on `close()`, not on every call, so cache hits stay cheap. Caches still open at
+    interpreter exit are closed then; use the cache as a context manager, or call
+    `close()`, to save one that is dropped earlier. When the cache is full the
+    `save_every` least recently used entries are evicted together and the index saved
+    before their rows are reused, so the index on disk never points at a row holding
+    another text's vector.
+    """
+    INDEX_FILE = "index.json"
+    VECTORS_FILE = "vectors.f32"
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        cache_dir: str,
+        model: Optional[str] = None,
+        max_entries: int = 100_000,
+        save_every: int = 100,
+    ) -> None:
+        """
+        Opens (or creates) the cache in `cache_dir`.
+
+        :param embeddings: The underlying embeddings model that is called on cache misses.
+        :param cache_dir: Directory holding the vector file and its index.
+        :param model: Model name used in cache keys; defaults to `embeddings.model`.
+        :param max_entries: The maximum number of vectors kept on disk. The vector file is created at
+            `max_entries * dim * 4` bytes, e.g. 614 MB for 100,000 vectors of 1536 dimensions.
+        :param save_every: New entries after which the index is saved; at most this many are lost on a crash.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1.")
+        self.embeddings = embeddings
+        self.cache_dir = cache_dir
+        self.model = model or getattr(embeddings, "model", None) or type(embeddings).__name__
+        self.max_entries = max_entries
+        self.save_every = max(1, save_every)
+        self.stats = CacheStats()
+        self.entries: "OrderedDict[str, int]" = OrderedDict()
+        self.dim: Optional[int] = None
+        self.vectors: Optional[np.memmap] = None
+        # Rows referenced by neither the index in memory nor the one on disk, reused first
+        self._free: List[int] = []
+        self._unsaved = 0
+        self._dirty = False
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load()
+        _OPEN_CACHES.add(self)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.cache_dir, name)
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model}\0{text}".encode("utf-8")).hexdigest()
+
+    def _load(self) -> None:
+        """Loads the index and maps the vector file, shrinking it if `max_entries` was lowered."""
+        if not os.path.exists(self._path(self.INDEX_FILE)):
+            return
+        with open(self._path(self.INDEX_FILE), encoding="utf-8") as f:
+            index = json.load(f)
+        if index["model"] != self.model:
+            raise ValueError(f"Cache in {self.cache_dir} holds '{index['model']}' vectors, not '{self.model}'.")
+        self.dim = index["dim"]
+        stored = np.memmap(self._path(self.VECTORS_FILE), dtype=np.float32, mode="r+", shape=(index["capacity"], self.dim))
+        entries = OrderedDict((key, slot) for key, slot in index["entries"])
+        if index["capacity"] == self.max_entries:
+            self.vectors, self.entries = stored, entries
+            self._free = sorted(set(range(self.max_entries)) - set(entries.values()), reverse=True)
+            return
+        # Capacity changed: keep the most recently used rows and rewrite the file compactly
+        kept = list(entries.items())[-self.max_entries:]
+        rows = np.array(stored[[slot for _, slot in kept]]) if kept else np.empty((0, self.dim), dtype=np.float32)
+        del stored
+        self._create_vectors()
+        self.vectors[:len(rows)] = rows
+        self.entries = OrderedDict((key, slot) for slot, (key, _) in enumerate(kept))
+        self._free = list(range(self.max_entries - 1, len(kept) - 1, -1))
+        self.save()
+
+    def _create_vectors(self) -> None:
+        self.vectors = np.memmap(self._path(self.VECTORS_FILE), dtype=np.float32, mode="w+", shape=(self.max_entries, self.dim))
+        self._free = list(range(self.max_entries - 1, -1, -1))
+
+    def save(self) -> None:
+        """Flushes the vector file and atomically rewrites the index."""
+        if self.vectors is None:
+            return
+        self._unsaved, self._dirty = 0, False
+        self.vectors.flush()
+        index = {"model": self.model, "dim": self.dim, "capacity": self.max_entries, "entries": list(self.entries.items())}
+        tmp_path = self._path(self.INDEX_FILE + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, self._path(self.INDEX_FILE))
+
+    def close(self) -> None:
+        """Saves the index if it changed since the last save."""
+        if self._dirty:
+            self.save()
+
+    def __enter__(self) -> "CachedEmbeddings":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _store(self, key: str, vector: List[float]) -> None:
+        if self.vectors is None:
+            self.dim = len(vector)
+            self._create_vectors()
+        if not self._free:
+            # The saved index may still point at the evicted rows, so save it before they are overwritten
+            for _ in range(min(self.save_every, len(self.entries))):
+                self._free.append(self.entries.popitem(last=False)[1])
+            self.save()
+        slot = self._free.pop()
+        self.vectors[slot] = vector
+        self.entries[key] = slot
+        self._unsaved += 1
+        self._dirty = True
+
+    def _save_if_due(self) -> None:
+        """Saves the index once enough new entries have accumulated."""
+        if self._unsaved >= self.save_every:
+            self.save()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Returns embeddings for the texts, sending only cache misses to the provider in one batched call.
+
+        :param texts: The texts to embed.
+        :return: One vector per text; cached vectors are returned at float32 precision.
+        """
+        keys = [self._key(text) for text in texts]
+        vectors: List[Optional[List[float]]] = [None] * len(texts)
+        missing: Dict[str, str] = {}
+        for i, (key, text) in enumerate(zip(keys, texts)):
+            slot = self.entries.get(key)
+            if slot is not None:
+                self.entries.move_to_end(key)
+                self._dirty = True
+                vectors[i] = self.vectors[slot].tolist()
+            elif key not in missing:
+                missing[key] = text
+
+        fetched: Dict[str, List[float]] = {}
+        if missing:
+            fetched = dict(zip(missing, self.embeddings.embed_documents(list(missing.values()))))
+            for key, vector in fetched.items():
+                self._store(key, vector)
+
+        served = []
+        for i, (key, text) in enumerate(zip(keys, texts)):
+            if vectors[i] is None:
+                vectors[i] = fetched[key]
+                # Repeats of a missing text within the batch are served from the same provider call
+                if missing.pop(key, None) is not None:
+                    continue
+            served.append(text)
+
+        self._record(served, len(fetched))
+        self._save_if_due()
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        """Returns the embedding for a query, served from the cache when possible."""
+        key = self._key(text)
+        slot = self.entries.get(key)
+        if slot is not None:
+            self.entries.move_to_end(key)
+            self._dirty = True
+            vector = self.vectors[slot].tolist()
+            self._record([text], 0)
+        else:
+            vector = self.embeddings.embed_query(text)
+            self._store(key, vector)
+            self._record([], 1)
+            self._save_if_due()
+        return vector
+
+    def _record(self, served: List[str], misses: int) -> None:
+        """Updates hit/miss counters and the tokens and dollars saved by the texts served without a provider call."""
+        self.stats.hits += len(served)
+        self.stats.misses += misses
+        if served:
+            tokens, cost = estimate_cost(served)
+            self.stats.tokens_saved += tokens
+            self.stats.cost_saved += cost
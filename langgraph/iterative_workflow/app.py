@@ -1,19 +1,29 @@
 import os
 import sys
+import uuid
+import sqlite3
 import logging
-from typing import TypedDict, List, Dict, Annotated, Any
+from typing import TypedDict, List, Dict, Annotated, Any, Optional
 
 from pydantic import BaseModel, Field
 
 from langchain_openai import ChatOpenAI
-from langchain.prompts import ChatPromptTemplate
-from langchain.schema import HumanMessage, AIMessage
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.messages import HumanMessage, AIMessage, BaseMessage
 from langchain_core.runnables.config import RunnableConfig
 
 from langgraph.graph import StateGraph, START, END
 from langgraph.graph.message import add_messages
+from langgraph.checkpoint.sqlite import SqliteSaver
 
-from tavily import TavilyClient
+# The shared HTTP transport lives with the other tool modules
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "tools"))
+
+from http_transport import transport
+from stage_timings import StageTimings
+
+TAVILY_SEARCH_URL = os.getenv("TAVILY_SEARCH_URL", "https://api.tavily.com/search")
+CHECKPOINT_DB = os.getenv("CHECKPOINT_DB", "checkpoints.sqlite")
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
@@ -51,20 +61,63 @@ class ReviewerOutput(BaseModel):
     message: str = Field(description="Review feedback message.")
     approved: bool = Field(description="Indicates if the summary is approved.")
 
+# Each review round adds the summary, the summarizer's status message and the review
+MESSAGES_PER_ROUND = 3
+
 class Agent:
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        llm: Any = None,
+        history_window: Optional[int] = 2,
+        max_feedback_digest: int = 5,
+        max_source_chars: int = 300,
+        checkpoint_path: Optional[str] = CHECKPOINT_DB,
+        durability: str = "sync",
+    ):
+        """
+        :param api_key: The Tavily API key.
+        :param llm: The chat model; defaults to gpt-4o-mini.
+        :param history_window: Review rounds passed to the model verbatim; None passes the whole history.
+        :param max_feedback_digest: Earlier review comments kept, condensed, once they leave the window.
+        :param max_source_chars: Characters of each article kept in the source digest sent with every revision.
+        :param checkpoint_path: SQLite file the graph state is saved to after every step; None disables checkpointing.
+        :param durability: "sync" writes each checkpoint before the next step starts, "async" writes it
+            while the next step runs and "exit" only when the run stops.
+        """
         self.api_key = api_key
-        self.llm = ChatOpenAI(model="gpt-4o-mini")
+        self.llm = llm or ChatOpenAI(model="gpt-4o-mini")
+        self.history_window = history_window
+        self.max_feedback_digest = max_feedback_digest
+        self.max_source_chars = max_source_chars
+        self.durability = durability
         self.summariser_chain = None
         self.reviewer_chain = None
         self.max_iterations = 25
+        self.timings = StageTimings()
+        self.checkpointer = None
+        if checkpoint_path:
+            # The saver serializes access to the connection itself, so it can be shared across threads
+            self.checkpointer = SqliteSaver(sqlite3.connect(checkpoint_path, check_same_thread=False))
+        # The chains and the graph are built once and shared by every run, in any thread or task
         self.setup_chains()
+        self.graph = self.build_graph(self.checkpointer)
         
     def tavily_keyword_search(self, search_term: str) -> TavilySearchResponse:
-        """Search Tavily for articles based on a keyword search term."""
-        client = TavilyClient(api_key=self.api_key)
-        response = client.search(search_term)
-        return TavilySearchResponse(**response)
+        """Search Tavily for articles based on a keyword search term, over the pooled transport."""
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+        with self.timings.time("search"):
+            response = transport.post(TAVILY_SEARCH_URL, json={"query": search_term}, headers=headers)
+            response.raise_for_status()
+        return TavilySearchResponse(**response.json())
+
+    async def atavily_keyword_search(self, search_term: str) -> TavilySearchResponse:
+        """Async version of `tavily_keyword_search`."""
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+        with self.timings.time("search"):
+            response = await transport.apost(TAVILY_SEARCH_URL, json={"query": search_term}, headers=headers)
+            response.raise_for_status()
+        return TavilySearchResponse(**response.json())
     
     def setup_chains(self):
         """Setup the summarizer and reviewer chains."""
@@ -72,7 +125,7 @@ class Agent:
             ("system", 
             "You are an expert summarizer. Summarize the provided articles clearly, accurately, and concisely. "
             "Include key points and direct links to the original sources. Ensure the summary is well-structured and readable.\n\n"
-            "Articles to summarize: {articles}"
+            "{task}"
             ),
             ("placeholder", "{messages}"),
         ])
@@ -88,38 +141,78 @@ class Agent:
         self.summariser_chain = summarizer_template | self.llm.with_structured_output(SummariserOutput)
         self.reviewer_chain = reviewer_template | self.llm.with_structured_output(ReviewerOutput)
 
+    def context(self, messages: List[BaseMessage]) -> List[BaseMessage]:
+        """
+        Returns the messages sent to the model: the last `history_window` rounds verbatim,
+        preceded by a condensed digest of the review feedback from earlier rounds.
+        """
+        if self.history_window is None or len(messages) <= self.history_window * MESSAGES_PER_ROUND:
+            return messages
+        window = messages[-self.history_window * MESSAGES_PER_ROUND:]
+        older = messages[:-self.history_window * MESSAGES_PER_ROUND]
+        feedback = [message.content for message in older if message.name == "reviewer"][-self.max_feedback_digest:]
+        digest = "\n".join(f"- {comment[:200]}" for comment in feedback)
+        return [AIMessage(content=f"Feedback from earlier review rounds (condensed):\n{digest}", name="reviewer")] + window
+
+    def source_digest(self, search_results: List[dict]) -> str:
+        """Returns the title, link and opening `max_source_chars` characters of each article."""
+        return "\n".join(
+            f"- {result['title']} ({result['url']}): {result['content'][:self.max_source_chars]}" for result in search_results
+        )
+
+    def summarizer_input(self, state: State) -> Dict:
+        # The articles are sent in full in the first round only; later rounds revise the latest summary
+        # against a bounded digest of them, so factual feedback can still be checked against the sources
+        if state["iteration"] == 0:
+            task = f"Articles to summarize: {state['search_results']}"
+        else:
+            task = (
+                "Revise your latest summary using the reviewer's feedback, keeping the links to the sources. "
+                f"Check facts against the articles, shortened here:\n{self.source_digest(state['search_results'])}"
+            )
+        return {
+            "messages": self.context(state["messages"]),
+            "task": task
+        }
+
     def summarizer(self, state: State) -> Dict:
-        """ Summarizes the search results. """
-        summarizer_output = self.summariser_chain.invoke({
-            "messages": state["messages"],
-            "articles": state["search_results"]
-        })
-        
-        new_messages = [
-            AIMessage(content=summarizer_output.summary),
-            AIMessage(content=summarizer_output.message)
-        ]
-        
-        state["messages"].extend(new_messages)
-        state["summaries"] = [summarizer_output.summary]
-        state["iteration"] += 1
-        
-        return state
+        """ Summarizes the search results, then revises the summary from the review feedback. """
+        with self.timings.time("summarizer"):
+            summarizer_output = self.summariser_chain.invoke(self.summarizer_input(state))
+        return self.summarizer_update(state, summarizer_output)
+
+    async def asummarizer(self, state: State) -> Dict:
+        with self.timings.time("summarizer"):
+            summarizer_output = await self.summariser_chain.ainvoke(self.summarizer_input(state))
+        return self.summarizer_update(state, summarizer_output)
+
+    def summarizer_update(self, state: State, summarizer_output: SummariserOutput) -> Dict:
+        # Return only the updates; the add_messages reducer appends the new messages
+        return {
+            "messages": [
+                AIMessage(content=summarizer_output.summary, name="summarizer"),
+                AIMessage(content=summarizer_output.message, name="summarizer")
+            ],
+            "summaries": [summarizer_output.summary],
+            "iteration": state["iteration"] + 1
+        }
     
     def reviewer(self, state: State) -> Dict:
         """ Reviews the summary and provides feedback. """       
-        reviewer_output = self.reviewer_chain.invoke({
-            "messages": state["messages"]
-        })
-        
-        new_messages = [
-            AIMessage(content=reviewer_output.message)
-        ]
-        
-        state["messages"].extend(new_messages)
-        state["approved"] = reviewer_output.approved
-        
-        return state
+        with self.timings.time("reviewer"):
+            reviewer_output = self.reviewer_chain.invoke({"messages": self.context(state["messages"])})
+        return self.reviewer_update(reviewer_output)
+
+    async def areviewer(self, state: State) -> Dict:
+        with self.timings.time("reviewer"):
+            reviewer_output = await self.reviewer_chain.ainvoke({"messages": self.context(state["messages"])})
+        return self.reviewer_update(reviewer_output)
+
+    def reviewer_update(self, reviewer_output: ReviewerOutput) -> Dict:
+        return {
+            "messages": [AIMessage(content=reviewer_output.message, name="reviewer")],
+            "approved": reviewer_output.approved
+        }
         
     def conditional_edge(self, state: State):
         if state["approved"]:
@@ -130,23 +223,22 @@ class Agent:
             return "final_step"
     
     def final_step(self, state: State) -> Dict:
-        state["messages"].append(AIMessage(content="**Workflow Completed**"))
-        return state
+        return {"messages": [AIMessage(content="**Workflow Completed**")]}
     
     def calculate_token_usage(self, prompt: str) -> int:
         return self.llm.get_num_tokens(prompt)
         
-    def run(self):
-        search_topic = input("Enter search criteria: ")
-        search_topic = f"Give me the latest news on the following subject: {search_topic}"
-        search_results = self.tavily_keyword_search(search_topic)
-        
-        config = RunnableConfig(recursion_limit=self.max_iterations)
-        
+    def build_graph(self, checkpointer: Any = None, use_async: bool = False):
+        """
+        Builds and compiles the summarize/review workflow.
+
+        :param checkpointer: Saves the state after every step; async graphs need an async saver.
+        :param use_async: Build the graph from the async nodes, to be run with ainvoke.
+        """
         # Define LangGraph Workflow
         workflow = StateGraph(State)
-        workflow.add_node("summarizer", self.summarizer)
-        workflow.add_node("reviewer", self.reviewer)
+        workflow.add_node("summarizer", self.asummarizer if use_async else self.summarizer)
+        workflow.add_node("reviewer", self.areviewer if use_async else self.reviewer)
         workflow.add_node("final_step", self.final_step)
 
         # Define Workflow Edges
@@ -157,17 +249,70 @@ class Agent:
         workflow.add_conditional_edges('reviewer', self.conditional_edge)
         workflow.add_edge("final_step", END)
 
-        graph = workflow.compile()
+        return workflow.compile(checkpointer=checkpointer)
+
+    def config(self, thread_id: Optional[str] = None) -> RunnableConfig:
+        # Every round takes two graph steps (summarizer and reviewer), plus the final step
+        config = RunnableConfig(recursion_limit=2 * self.max_iterations + 2)
+        if thread_id:
+            config["configurable"] = {"thread_id": thread_id}
+        return config
+
+    def can_resume(self, thread_id: str) -> bool:
+        """Tells whether the thread has a checkpoint with steps still to run."""
+        if not self.checkpointer:
+            return False
+        return bool(self.graph.get_state(self.config(thread_id)).next)
+
+    def summarize(self, search_results: List[dict], thread_id: Optional[str] = None) -> Dict:
+        """
+        Runs the workflow on the search results and returns the final state.
+
+        :param search_results: The articles to summarize.
+        :param thread_id: Identifies the run in the checkpoint database; a new one is created if omitted.
+        """
+        if self.checkpointer and not thread_id:
+            thread_id = str(uuid.uuid4())
+        if thread_id:
+            logging.info(f"Starting thread {thread_id}")
 
         initial_state = {
             "messages": [],
-            "search_results": search_results.get_data(),
+            "search_results": search_results,
             "summaries": [],
             "approved": False,
             "iteration": 0
         }
 
-        output = graph.invoke(initial_state, config)
+        durability = self.durability if self.checkpointer else None
+        return self.graph.invoke(initial_state, self.config(thread_id), durability=durability)
+
+    def resume(self, thread_id: str) -> Dict:
+        """
+        Continues an interrupted run from its last checkpoint and returns the final state.
+
+        Steps that completed before the interruption are not run again; their outputs,
+        including those of nodes that finished in a step that failed, are replayed from
+        the checkpoint.
+        """
+        if not self.can_resume(thread_id):
+            raise ValueError(f"Thread {thread_id} has nothing to resume")
+        snapshot = self.graph.get_state(self.config(thread_id))
+        logging.info(f"Resuming thread {thread_id} at iteration {snapshot.values['iteration']} before {', '.join(snapshot.next)}")
+        return self.graph.invoke(None, self.config(thread_id), durability=self.durability)
+
+    def run(self):
+        thread_id = input("Enter a thread ID to resume (leave empty to start a new search): ").strip()
+        if thread_id:
+            output = self.resume(thread_id)
+        else:
+            search_topic = input("Enter search criteria: ")
+            search_topic = f"Give me the latest news on the following subject: {search_topic}"
+            search_results = self.tavily_keyword_search(search_topic)
+
+            thread_id = str(uuid.uuid4())
+            print(f"Thread ID: {thread_id} (enter it to resume this run if it is interrupted)")
+            output = self.summarize(search_results.get_data(), thread_id)
         print(output["summaries"][-1])
         
         prompt = " ".join([msg.content for msg in output["messages"]])
@@ -0,0 +1,84 @@
+import argparse
+import logging
+import os
+import tempfile
+import time
+import uuid
+
+from app import Agent
+from benchmark_iterations import FakeStructuredLLM, make_articles
+
+class CrashingLLM(FakeStructuredLLM):
+    """Raises on the given call, as if the process had died or the API timed out partway through the run."""
+    def __init__(self, crash_at_call: int, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.crash_at_call = crash_at_call
+
+    def _respond(self, schema, prompt_value):
+        if len(self.calls) + 1 == self.crash_at_call:
+            raise TimeoutError("Simulated crash")
+        return super()._respond(schema, prompt_value)
+
+def timed_run(agent: Agent, articles, thread_id=None):
+    start = time.perf_counter()
+    output = agent.summarize(articles, thread_id)
+    return output, time.perf_counter() - start
+
+def main():
+    """Measures checkpoint write overhead per step and the cost of resuming a crashed run against starting over."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--crash-round", type=int, default=15, help="Round whose reviewer call fails.")
+    parser.add_argument("--runs", type=int, default=5, help="Runs averaged for the write overhead.")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Simulated seconds per LLM call in the resume test.")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.ERROR)
+    articles = make_articles(5, 400)
+    directory = tempfile.mkdtemp(prefix="checkpoints_")
+    steps = 2 * args.rounds + 1
+
+    # Write overhead: a zero-latency LLM, so the graph and the saver are all that is measured
+    print(f"Checkpoint write overhead, {args.rounds} rounds ({steps} steps), mean of {args.runs} runs")
+    baseline = None
+    for label, path, durability in [
+        ("no checkpointer", None, "sync"),
+        ("SQLite, sync", os.path.join(directory, "sync.sqlite"), "sync"),
+        ("SQLite, async", os.path.join(directory, "async.sqlite"), "async"),
+        ("SQLite, on exit", os.path.join(directory, "exit.sqlite"), "exit"),
+    ]:
+        seconds = 0.0
+        for _ in range(args.runs):
+            agent = Agent(api_key="", llm=FakeStructuredLLM(args.rounds, 0, 0), checkpoint_path=path, durability=durability)
+            seconds += timed_run(agent, articles)[1] / args.runs
+        baseline = baseline if baseline is not None else seconds
+        size = f"{os.path.getsize(path) / 2 ** 20:6.1f} MiB" if path else ""
+        print(f"  {label:<16} {seconds * 1000:8.1f} ms/run  {(seconds - baseline) / steps * 1000:6.2f} ms/step overhead  {size}")
+
+    # Resume: the reviewer call of crash_round fails, then a new process picks the thread up
+    path = os.path.join(directory, "resume.sqlite")
+    thread_id = str(uuid.uuid4())
+    crash_at_call = 2 * args.crash_round
+    llm = CrashingLLM(crash_at_call, args.rounds, args.llm_latency, 0)
+    start = time.perf_counter()
+    try:
+        Agent(api_key="", llm=llm, checkpoint_path=path).summarize(articles, thread_id)
+    except TimeoutError:
+        pass
+    crashed_seconds = time.perf_counter() - start
+    print(f"\nCrashed on LLM call {crash_at_call} after {crashed_seconds:.1f} s")
+
+    start = time.perf_counter()
+    agent = Agent(api_key="", llm=FakeStructuredLLM(args.rounds - llm.reviews, args.llm_latency, 0), checkpoint_path=path)
+    resumable = agent.can_resume(thread_id)
+    load_seconds = time.perf_counter() - start
+    output = agent.resume(thread_id)
+    resume_seconds = time.perf_counter() - start
+    assert resumable and output["iteration"] == args.rounds, output["iteration"]
+    print(f"  resume:     {len(agent.llm.calls):3d} LLM calls, {resume_seconds:5.1f} s ({load_seconds * 1000:.1f} ms to open and load the checkpoint)")
+
+    fresh = FakeStructuredLLM(args.rounds, args.llm_latency, 0)
+    output, restart_seconds = timed_run(Agent(api_key="", llm=fresh, checkpoint_path=None), articles)
+    print(f"  start over: {len(fresh.calls):3d} LLM calls, {restart_seconds:5.1f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import argparse
+import asyncio
+import logging
+import random
+import time
+from typing import Dict, List
+
+from langchain_core.messages import AIMessage
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableLambda
+
+from app import Agent, ReviewerOutput, State, SummariserOutput
+
+WORDS = "market city report council energy policy growth local season data team plan public health travel update".split()
+
+class FakeStructuredLLM:
+    """
+    Stands in for ChatOpenAI(...).with_structured_output: counts prompt tokens (4 characters
+    per token), sleeps in proportion to them (without blocking the event loop when called
+    through ainvoke) and approves the summary after `approve_after` reviews.
+    """
+    def __init__(self, approve_after: int, base_latency: float, latency_per_1k_tokens: float, seed: int = 0) -> None:
+        self.approve_after = approve_after
+        self.base_latency = base_latency
+        self.latency_per_1k_tokens = latency_per_1k_tokens
+        self.rng = random.Random(seed)
+        self.reviews = 0
+        self.calls: List[int] = []
+
+    def get_num_tokens(self, text: str) -> int:
+        return len(text) // 4
+
+    def _text(self, words: int) -> str:
+        return " ".join(self.rng.choice(WORDS) for _ in range(words))
+
+    def _latency(self, prompt_value) -> float:
+        tokens = sum(self.get_num_tokens(str(message.content)) for message in prompt_value.to_messages())
+        self.calls.append(tokens)
+        return self.base_latency + self.latency_per_1k_tokens * tokens / 1000
+
+    def _output(self, schema):
+        if schema is SummariserOutput:
+            return SummariserOutput(message="Summary updated.", summary=self._text(150))
+        self.reviews += 1
+        return ReviewerOutput(message=self._text(60), approved=self.reviews >= self.approve_after)
+
+    def _respond(self, schema, prompt_value):
+        time.sleep(self._latency(prompt_value))
+        return self._output(schema)
+
+    async def _arespond(self, schema, prompt_value):
+        await asyncio.sleep(self._latency(prompt_value))
+        return self._output(schema)
+
+    def with_structured_output(self, schema):
+        async def arespond(prompt_value):
+            return await self._arespond(schema, prompt_value)
+        return RunnableLambda(lambda prompt_value: self._respond(schema, prompt_value), afunc=arespond)
+
+class LegacyAgent(Agent):
+    """The workflow before delta updates: nodes return the whole state and the articles are sent every round."""
+    def setup_chains(self):
+        summarizer_template = ChatPromptTemplate.from_messages([
+            ("system", "You are an expert summarizer. Summarize the provided articles.\n\nArticles to summarize: {articles}"),
+            ("placeholder", "{messages}"),
+        ])
+        reviewer_template = ChatPromptTemplate.from_messages([
+            ("system", "You are an expert reviewer. Assess the summary. If the summary is satisfactory, approve it."),
+            ("placeholder", "{messages}"),
+        ])
+        self.summariser_chain = summarizer_template | self.llm.with_structured_output(SummariserOutput)
+        self.reviewer_chain = reviewer_template | self.llm.with_structured_output(ReviewerOutput)
+
+    def summarizer(self, state: State) -> Dict:
+        output = self.summariser_chain.invoke({"messages": state["messages"], "articles": state["search_results"]})
+        state["messages"].extend([AIMessage(content=output.summary), AIMessage(content=output.message)])
+        state["summaries"] = [output.summary]
+        state["iteration"] += 1
+        return state
+
+    def reviewer(self, state: State) -> Dict:
+        output = self.reviewer_chain.invoke({"messages": state["messages"]})
+        state["messages"].extend([AIMessage(content=output.message)])
+        state["approved"] = output.approved
+        return state
+
+def make_articles(count: int, words: int, seed: int = 0) -> List[dict]:
+    rng = random.Random(seed)
+    return [
+        {"title": f"Article {i}", "url": f"https://example.com/news/{i}", "content": " ".join(rng.choice(WORDS) for _ in range(words))}
+        for i in range(count)
+    ]
+
+def main():
+    """Measures prompt tokens and wall time of the summarize/review loop for 1-25 rounds with a fake LLM."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--rounds", type=int, nargs="+", default=[1, 5, 10, 15, 20, 25])
+    parser.add_argument("--articles", type=int, default=5)
+    parser.add_argument("--article-words", type=int, default=400)
+    parser.add_argument("--base-latency", type=float, default=0.01, help="Simulated seconds per LLM call.")
+    parser.add_argument("--latency-per-1k-tokens", type=float, default=0.02, help="Simulated seconds per 1000 prompt tokens.")
+    parser.add_argument("--history-window", type=int, default=2)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+    logging.getLogger().setLevel(logging.ERROR)
+    articles = make_articles(args.articles, args.article_words)
+
+    print(f"{'workflow':<22} {'rounds':>6} {'prompt tokens':>14} {'last round':>11} {'messages':>9} {'wall':>8} {'per round':>10}")
+    variants = [
+        ("legacy (full state)", lambda llm: LegacyAgent(api_key="", llm=llm, checkpoint_path=None)),
+        ("delta, full history", lambda llm: Agent(api_key="", llm=llm, history_window=None, checkpoint_path=None)),
+        (f"delta, window {args.history_window}", lambda llm: Agent(api_key="", llm=llm, history_window=args.history_window, checkpoint_path=None)),
+    ]
+    for name, make_agent in variants:
+        for rounds in args.rounds:
+            llm = FakeStructuredLLM(rounds, args.base_latency, args.latency_per_1k_tokens)
+            start = time.perf_counter()
+            output = make_agent(llm).summarize(articles)
+            elapsed = time.perf_counter() - start
+            assert output["iteration"] == rounds, output["iteration"]
+            last_round = sum(llm.calls[-2:])
+            print(
+                f"{name:<22} {rounds:>6} {sum(llm.calls):>14,} {last_round:>11,} {len(output['messages']):>9} "
+                f"{elapsed:>6.2f} s {elapsed / rounds * 1000:>7.0f} ms"
+            )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app import Agent
+from benchmark_iterations import FakeStructuredLLM, make_articles
+from service import SummaryService
+
+def run_threads(handle, requests: int, concurrency: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(lambda _: handle(), range(requests)))
+    return time.perf_counter() - start
+
+async def run_service(service: SummaryService, articles, requests: int) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*(service.summarize(articles) for _ in range(requests)))
+    return time.perf_counter() - start
+
+def main():
+    """Measures requests/sec of the summarize/review workflow at increasing concurrency with a fake LLM."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 128])
+    parser.add_argument("--requests-per-worker", type=int, default=5)
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Simulated seconds per LLM call.")
+    parser.add_argument("--checkpoint", action="store_true", help="Checkpoint the shared agent and the service to SQLite.")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.ERROR)
+    articles = make_articles(5, 400)
+    # Approving on the first review makes every request one round: two LLM calls and three graph steps
+    llm = FakeStructuredLLM(1, args.llm_latency, 0)
+    checkpoint_path = os.path.join(tempfile.mkdtemp(prefix="service_"), "checkpoints.sqlite") if args.checkpoint else None
+
+    start = time.perf_counter()
+    for _ in range(20):
+        Agent(api_key="", llm=llm, checkpoint_path=None)
+    print(f"Building the chains and compiling the graph: {(time.perf_counter() - start) / 20 * 1000:.1f} ms per agent\n")
+
+    shared = Agent(api_key="", llm=llm, checkpoint_path=checkpoint_path)
+    print(f"{'concurrency':>11} {'requests':>9} {'agent per request':>18} {'shared agent':>13} {'async service':>14}  (requests/sec)")
+    for concurrency in args.concurrency:
+        requests = max(20, concurrency * args.requests_per_worker)
+        per_request = run_threads(lambda: Agent(api_key="", llm=llm, checkpoint_path=None).summarize(articles), requests, concurrency)
+        threaded = run_threads(lambda: shared.summarize(articles), requests, concurrency)
+
+        async def serve():
+            async with SummaryService(Agent(api_key="", llm=llm, checkpoint_path=None), checkpoint_path, max_concurrency=concurrency) as service:
+                seconds = await run_service(service, articles, requests)
+                return seconds, service
+        service_seconds, service = asyncio.run(serve())
+        print(f"{concurrency:>11} {requests:>9} {requests / per_request:>18.1f} {requests / threaded:>13.1f} {requests / service_seconds:>14.1f}")
+
+    print("\nAsync service stages at the highest concurrency:")
+    print(service.report())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import asyncio
+import logging
+import uuid
+from typing import Dict, List, Optional
+
+import aiosqlite
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+from app import CHECKPOINT_DB, Agent
+
+class SummaryService:
+    """
+    Long-lived, async front end for the summarize/review workflow.
+
+    The agent's chains and a checkpointed copy of its graph are built once, in `start`,
+    and shared by every request, so a request only pays for its own LLM calls. Any number
+    of requests can be awaited concurrently; at most `max_concurrency` run at a time and
+    the rest wait their turn. Latency per stage (search, summarizer, reviewer and the
+    whole request) is collected in `agent.timings`.
+
+        async with SummaryService(Agent(api_key, checkpoint_path=None)) as service:
+            output = await service.summarize_topic("electric cars")
+    """
+    def __init__(self, agent: Agent, checkpoint_path: Optional[str] = CHECKPOINT_DB, max_concurrency: int = 100) -> None:
+        """
+        :param agent: The agent whose chains and nodes serve the requests.
+        :param checkpoint_path: SQLite file runs are checkpointed to; None disables checkpointing.
+        :param max_concurrency: Requests run at the same time at most.
+        """
+        self.agent = agent
+        self.checkpoint_path = checkpoint_path
+        self.max_concurrency = max_concurrency
+        self.graph = None
+        self._connection = None
+        self._semaphore = None
+
+    async def start(self) -> "SummaryService":
+        """Opens the checkpoint database and compiles the graph; call once before serving requests."""
+        checkpointer = None
+        if self.checkpoint_path:
+            self._connection = await aiosqlite.connect(self.checkpoint_path)
+            checkpointer = AsyncSqliteSaver(self._connection)
+        self.graph = self.agent.build_graph(checkpointer, use_async=True)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self
+
+    async def close(self) -> None:
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+        self.graph = None
+
+    async def __aenter__(self) -> "SummaryService":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def summarize(self, search_results: List[dict], thread_id: Optional[str] = None) -> Dict:
+        """
+        Runs the workflow on the search results and returns the final state.
+
+        :param search_results: The articles to summarize.
+        :param thread_id: Identifies the run in the checkpoint database; a new one is created if omitted.
+        """
+        if self.graph is None:
+            raise RuntimeError("SummaryService is not started")
+        initial_state = {
+            "messages": [],
+            "search_results": search_results,
+            "summaries": [],
+            "approved": False,
+            "iteration": 0
+        }
+        durability = None
+        if self.checkpoint_path:
+            thread_id = thread_id or str(uuid.uuid4())
+            durability = self.agent.durability
+        async with self._semaphore:
+            with self.agent.timings.time("request"):
+                return await self.graph.ainvoke(initial_state, self.agent.config(thread_id), durability=durability)
+
+    async def resume(self, thread_id: str) -> Dict:
+        """Continues an interrupted run from its last checkpoint and returns the final state."""
+        if self.graph is None or not self.checkpoint_path:
+            raise RuntimeError("Resuming needs a started SummaryService with checkpointing")
+        config = self.agent.config(thread_id)
+        snapshot = await self.graph.aget_state(config)
+        if not snapshot.next:
+            raise ValueError(f"Thread {thread_id} has nothing to resume")
+        logging.info(f"Resuming thread {thread_id} at iteration {snapshot.values['iteration']} before {', '.join(snapshot.next)}")
+        async with self._semaphore:
+            with self.agent.timings.time("request"):
+                return await self.graph.ainvoke(None, config, durability=self.agent.durability)
+
+    async def summarize_topic(self, topic: str, thread_id: Optional[str] = None) -> Dict:
+        """Searches Tavily for the latest news on a topic and summarizes the results."""
+        search_results = await self.agent.atavily_keyword_search(f"Give me the latest news on the following subject: {topic}")
+        return await self.summarize(search_results.get_data(), thread_id)
+
+    def report(self) -> str:
+        return self.agent.timings.report()
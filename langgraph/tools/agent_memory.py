@@ -0,0 +1,119 @@
+from typing import Callable, List, Optional, Tuple
+
+from pydantic import BaseModel
+from langchain_core.messages import AIMessage, AnyMessage, HumanMessage, SystemMessage, ToolMessage
+
+def approximate_tokens(text: str) -> int:
+    """About 4 characters per token for English text, without loading a tokenizer."""
+    return (len(text) + 3) // 4
+
+class TurnUsage(BaseModel):
+    turn: int
+    prompt_tokens: int
+    history_tokens: int
+    tool_outputs_condensed: int = 0
+    rounds_dropped: int = 0
+    input_tokens: Optional[int] = None
+    output_tokens: Optional[int] = None
+
+class AgentMemory:
+    """
+    Builds the bounded prompt for each reasoning turn of a tool-calling agent.
+
+    The prompt is the system message and the user query, once, followed by the tool rounds
+    so far, where a round is an AI message with tool calls plus the ToolMessages answering
+    them. Tool outputs are kept up to `max_tool_tokens` each. Only while the prompt is over
+    `max_tokens` are the outputs of earlier rounds condensed to their first
+    `condensed_tool_tokens`, oldest round first, since the model may still need them to
+    answer. If that is not enough, the oldest rounds are dropped whole, so every
+    ToolMessage left still answers a tool call in the prompt. The latest round is never
+    condensed or dropped.
+    """
+    def __init__(
+        self,
+        max_tokens: int = 6000,
+        max_tool_tokens: int = 1500,
+        condensed_tool_tokens: int = 100,
+        count_tokens: Callable[[str], int] = approximate_tokens,
+    ) -> None:
+        """
+        :param max_tokens: Token budget for the whole prompt.
+        :param max_tool_tokens: Tokens kept of each tool output.
+        :param condensed_tool_tokens: Tokens kept of each tool output in earlier rounds when the prompt is over budget.
+        :param count_tokens: Counts the tokens of a text, e.g. a chat model's `get_num_tokens`.
+        """
+        self.max_tokens = max_tokens
+        self.max_tool_tokens = max_tool_tokens
+        self.condensed_tool_tokens = condensed_tool_tokens
+        self.count_tokens = count_tokens
+
+    def _tokens(self, messages: List[AnyMessage]) -> int:
+        return sum(self.count_tokens(str(message.content)) + self.count_tokens(str(getattr(message, "tool_calls", ""))) for message in messages)
+
+    def _truncate(self, message: ToolMessage, max_tokens: int) -> Tuple[ToolMessage, bool]:
+        content = str(message.content)
+        tokens = self.count_tokens(content)
+        if tokens <= max_tokens:
+            return message, False
+        # Cut proportionally; the token counter only needs to be roughly right here
+        kept = content[:max(1, len(content) * max_tokens // tokens)]
+        condensed = f"{kept}\n[... {tokens - max_tokens} more tokens of this result omitted]"
+        return message.model_copy(update={"content": condensed}), True
+
+    def _rounds(self, messages: List[AnyMessage]) -> List[List[AnyMessage]]:
+        rounds = []
+        for message in messages:
+            if isinstance(message, ToolMessage) and rounds:
+                rounds[-1].append(message)
+            elif not isinstance(message, (HumanMessage, SystemMessage)):
+                rounds.append([message])
+        return rounds
+
+    def build(self, system_message: SystemMessage, query: str, messages: List[AnyMessage], turn: int = 0) -> Tuple[List[AnyMessage], TurnUsage]:
+        """
+        Returns the prompt for the next model call, with its token accounting.
+
+        :param system_message: The agent's instructions.
+        :param query: The user query; repeats of it in `messages` are dropped.
+        :param messages: The conversation state: AI messages and ToolMessages.
+        :param turn: The reasoning turn, for the accounting.
+        """
+        head = [system_message, HumanMessage(content=query)]
+        rounds = self._rounds(messages)
+        usage = TurnUsage(turn=turn, prompt_tokens=0, history_tokens=self._tokens(head + messages))
+
+        def condense(round_messages: List[AnyMessage], max_tokens: int) -> Tuple[List[AnyMessage], int]:
+            condensed, truncated = [round_messages[0]], 0
+            for message in round_messages[1:]:
+                message, cut = self._truncate(message, max_tokens)
+                condensed.append(message)
+                truncated += cut
+            return condensed, truncated
+
+        kept = [condense(round_messages, self.max_tool_tokens) for round_messages in rounds]
+        sizes = [self._tokens(round_messages) for round_messages, _ in kept]
+        total = self._tokens(head) + sum(sizes)
+
+        # Over budget: condense earlier rounds, oldest first, then drop the oldest rounds whole
+        for index in range(len(kept) - 1):
+            if total <= self.max_tokens:
+                break
+            kept[index] = condense(rounds[index], self.condensed_tool_tokens)
+            size = self._tokens(kept[index][0])
+            total += size - sizes[index]
+            sizes[index] = size
+        while total > self.max_tokens and len(kept) > 1:
+            total -= sizes.pop(0)
+            kept.pop(0)
+            usage.rounds_dropped += 1
+
+        usage.prompt_tokens = total
+        usage.tool_outputs_condensed = sum(truncated for _, truncated in kept)
+        return head + [message for round_messages, _ in kept for message in round_messages], usage
+
+    def record_response(self, usage: TurnUsage, response: AIMessage) -> TurnUsage:
+        """Adds the provider's token counts from the response, where the model reports them."""
+        metadata = getattr(response, "usage_metadata", None) or {}
+        usage.input_tokens = metadata.get("input_tokens")
+        usage.output_tokens = metadata.get("output_tokens")
+        return usage
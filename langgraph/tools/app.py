@@ -1,34 +1,112 @@
-from typing import TypedDict, Annotated, Any
+import os
+import sys
+import operator
+import threading
+from typing import TypedDict, Annotated, Any, Dict, List, Optional
 
-import yfinance as yf
-from langchain_community.retrievers import WikipediaRetriever
 from langchain_community.tools import DuckDuckGoSearchRun
 from langchain_openai import ChatOpenAI
-from langchain.schema import HumanMessage, SystemMessage
-from langchain_core.messages import AnyMessage
+from langchain_core.messages import AnyMessage, SystemMessage
 
 from langgraph.graph import StateGraph, START
 from langgraph.graph.message import add_messages
-from langgraph.prebuilt import tools_condition, ToolNode
+from langgraph.prebuilt import tools_condition
+
+# The stage timings are shared with the other tool modules
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "tools"))
+
+from stage_timings import StageTimings
+from parallel_tools import ParallelToolNode
+from agent_memory import AgentMemory
+from stock_quotes import quotes
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "community", "wikipedia_retriever"))
+
+from searcher import WikipediaSearcher
+from page_store import WikipediaPageStore
+
+# Pages the Wikipedia tool fetched are kept here; queries searched before and exact page titles are answered
+# from it without asking Wikipedia. Set it empty to always search online
+WIKIPEDIA_STORE = os.getenv("WIKIPEDIA_STORE", "wikipedia_pages.sqlite")
+
+# Seconds each tool may take before the model gets an error in its place
+TOOL_TIMEOUTS = {
+    "duckduckgo_search": 8.0,
+    "wikipedia_search": 8.0,
+    "get_stock_price": 5.0,
+    "get_stock_prices": 10.0,
+}
+
+SYSTEM_MESSAGE = SystemMessage(
+    content=(
+        "You are an intelligent assistant capable of performing web searches, retrieving stock market data, and searching Wikipedia. "
+        "When a user query is received, determine the most appropriate tool to use based on the nature of the query. "
+        "If the query involves retrieving information from the web, use the DuckDuckGo search tool. "
+        "If the query involves retrieving stock market data, use the stock price retrieval tool; for several tickers, fetch them all in one call to the batch stock price tool. "
+        "If the query involves retrieving information from Wikipedia, use the Wikipedia search tool. "
+        "If a tool fails to provide the necessary information, respond with an appropriate message indicating the limitation. "
+        "Always provide accurate and helpful responses to user queries by utilizing the available tools when necessary."
+    )
+)
 
 class QueryState(TypedDict):
     """Represents the current state of the query workflow."""
     query: str
     messages: Annotated[list[AnyMessage], add_messages]
+    usage: Annotated[list[dict], operator.add]
 
 class IntelligentAgent:
-    def __init__(self):
-        """Initializes the agent with tools and workflow setup."""
+    """
+    Answers queries with web search, Wikipedia and stock price tools.
+
+    An instance holds no per-query state: the tool-bound model and the compiled workflow
+    are built once and can serve any number of queries concurrently, from threads through
+    `invoke` or from asyncio tasks through `ainvoke`. Use `IntelligentAgent.shared()` to
+    get one process-wide instance instead of constructing an agent per request.
+    """
+    _shared: Dict[str, "IntelligentAgent"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, llm: Any = None, memory: Optional[AgentMemory] = None):
+        """
+        Initializes the agent with tools and workflow setup.
+
+        Args:
+            llm (Any): The chat model; defaults to gpt-4o-mini.
+            memory (AgentMemory): Bounds the prompt of each reasoning turn; defaults to a 6000 token budget.
+        """
         self.duckduckgo_search_tool = DuckDuckGoSearchRun()
-        self.wikipedia_retriever = WikipediaRetriever(load_all_available_meta=False, top_k_results=1)
+        self.wikipedia_searcher = WikipediaSearcher(top_k=1, store=WikipediaPageStore(WIKIPEDIA_STORE, match_titles=False) if WIKIPEDIA_STORE else None)
         self.tools = [
             self.duckduckgo_search,
             self.wikipedia_search,
-            self.get_stock_price
+            self.get_stock_price,
+            self.get_stock_prices
         ]
-        self.llm = ChatOpenAI(model="gpt-4o-mini")
+        self.llm = llm or ChatOpenAI(model="gpt-4o-mini")
         self.llm_with_tools = self.llm.bind_tools(self.tools)
+        self.memory = memory or AgentMemory()
+        self.timings = StageTimings()
+        # Tool calls of one AI message run concurrently, their latency recorded under the tool names
+        self.tool_node = ParallelToolNode(self.tools, timeouts=TOOL_TIMEOUTS, timings=self.timings)
         self.workflow = self.build_workflow()
+        self.async_workflow = None
+
+    @classmethod
+    def shared(cls, model: str = "gpt-4o-mini") -> "IntelligentAgent":
+        """
+        Returns the process-wide agent for a model, building it on first use.
+
+        Args:
+            model (str): The OpenAI chat model name.
+
+        Returns:
+            IntelligentAgent: The same instance for every call with this model.
+        """
+        with cls._shared_lock:
+            if model not in cls._shared:
+                cls._shared[model] = cls(llm=ChatOpenAI(model=model))
+            return cls._shared[model]
         
     def duckduckgo_search(self, query: str) -> Any:
         """
@@ -42,19 +120,20 @@ class IntelligentAgent:
         """
         return self.duckduckgo_search_tool.invoke(query)
         
-    def wikipedia_search(self, query: str) -> Any:
+    def wikipedia_search(self, query: str) -> List[Dict[str, str]]:
         """
-        Perform a search using WikipediaRetriever.
+        Search Wikipedia, answering from the local page store when it has the page.
 
         Args:
             query (str): The search query.
 
         Returns:
-            Any: The search results.
+            List[Dict[str, str]]: The title and content of the best matching page.
         """
-        return self.wikipedia_retriever.invoke(query)
+        response = self.wikipedia_searcher.get_summaries(query)
+        return [result.model_dump() for result in response.results]
         
-    def get_stock_price(self, ticker: str) -> float:
+    def get_stock_price(self, ticker: str) -> Optional[float]:
         """
         Retrieve the previous closing stock price for a given ticker symbol.
 
@@ -62,16 +141,28 @@ class IntelligentAgent:
             ticker (str): The ticker symbol of the stock.
 
         Returns:
-            float: The previous closing price of the stock.
+            Optional[float]: The previous closing price of the stock, None for an unknown ticker.
         """
-        stock = yf.Ticker(ticker)
-        return stock.info['previousClose']
+        # Served from the shared quote cache, which fetches just the previous close
+        return quotes.get_previous_closes([ticker])[quotes.normalize(ticker)]
 
-    def build_workflow(self):
+    def get_stock_prices(self, tickers: List[str]) -> Dict[str, Optional[float]]:
+        """
+        Retrieve the previous closing stock prices for several ticker symbols in one request.
+
+        Args:
+            tickers (List[str]): The ticker symbols of the stocks.
+
+        Returns:
+            Dict[str, Optional[float]]: The previous closing price by ticker, None for unknown tickers.
+        """
+        return quotes.get_previous_closes(tickers)
+
+    def build_workflow(self, use_async: bool = False):
         """Constructs the LangGraph workflow with necessary nodes and edges."""
         workflow = StateGraph(QueryState)
-        workflow.add_node("reasoning", self.reasoning)
-        workflow.add_node("tools", ToolNode(self.tools))
+        workflow.add_node("reasoning", self.areasoning if use_async else self.reasoning)
+        workflow.add_node("tools", self.tool_node.ainvoke if use_async else self.tool_node.invoke)
         
         workflow.add_edge(START, "reasoning")
         workflow.add_edge("tools", "reasoning")
@@ -81,37 +172,50 @@ class IntelligentAgent:
     
     def reasoning(self, state):
         """Processes the user query and determines if external tools are needed."""
-        query = state["query"]
-        messages = state["messages"]
-        
-        system_message = SystemMessage(
-            content=(
-                "You are an intelligent assistant capable of performing web searches, retrieving stock market data, and searching Wikipedia. "
-                "When a user query is received, determine the most appropriate tool to use based on the nature of the query. "
-                "If the query involves retrieving information from the web, use the DuckDuckGo search tool. "
-                "If the query involves retrieving stock market data, use the stock price retrieval tool. "
-                "If the query involves retrieving information from Wikipedia, use the Wikipedia search tool. "
-                "If a tool fails to provide the necessary information, respond with an appropriate message indicating the limitation. "
-                "Always provide accurate and helpful responses to user queries by utilizing the available tools when necessary."
-            )
-        )
-        user_message = HumanMessage(content=query)
-        
-        messages.append(user_message)
-        
-        result = [self.llm_with_tools.invoke([system_message] + messages)]
-        
-        state['messages'] = result
-        
-        return state
+        # The query is sent once, after the system message, and old tool results are condensed to the budget
+        prompt, usage = self.memory.build(SYSTEM_MESSAGE, state["query"], state["messages"], turn=len(state["usage"]))
+        with self.timings.time("reasoning"):
+            result = self.llm_with_tools.invoke(prompt)
+        return {"messages": [result], "usage": [self.memory.record_response(usage, result).model_dump()]}
+
+    async def areasoning(self, state):
+        """Async version of `reasoning`."""
+        prompt, usage = self.memory.build(SYSTEM_MESSAGE, state["query"], state["messages"], turn=len(state["usage"]))
+        with self.timings.time("reasoning"):
+            result = await self.llm_with_tools.ainvoke(prompt)
+        return {"messages": [result], "usage": [self.memory.record_response(usage, result).model_dump()]}
+
+    def invoke(self, query: str) -> Dict:
+        """
+        Runs the workflow for a query; safe to call from many threads at once.
+
+        Args:
+            query (str): The user query.
+
+        Returns:
+            Dict: The final state, with the conversation in `messages` and the tokens of each reasoning turn in `usage`.
+        """
+        with self.timings.time("request"):
+            return self.workflow.invoke({"query": query, "messages": [], "usage": []})
+
+    async def ainvoke(self, query: str) -> Dict:
+        """Async version of `invoke`, for serving queries from asyncio tasks."""
+        # The async workflow is compiled on first use, the nodes of the sync one would block the event loop
+        if self.async_workflow is None:
+            self.async_workflow = self.build_workflow(use_async=True)
+        with self.timings.time("request"):
+            return await self.async_workflow.ainvoke({"query": query, "messages": [], "usage": []})
     
     def run(self, query: str):
         """Runs the workflow for a given user query and prints responses."""
-        response = self.workflow.invoke({"query": query, "messages": []})
+        response = self.invoke(query)
         
         for message in response['messages']:
             message.pretty_print()
 
+        for usage in response['usage']:
+            print(f"Turn {usage['turn']}: {usage['prompt_tokens']} prompt tokens of {usage['history_tokens']} in the history")
+
 if __name__ == "__main__":
     agent = IntelligentAgent()
     agent.run("Tell me some historical facts about Paris including latest news and current weather conditions.")
\ No newline at end of file
@@ -0,0 +1,89 @@
+import argparse
+import logging
+import random
+import time
+from typing import Any, List
+
+from langchain_core.language_models.fake_chat_models import FakeMessagesListChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+
+from agent_memory import AgentMemory, approximate_tokens
+from app import SYSTEM_MESSAGE, IntelligentAgent
+
+WORDS = "paris seine louvre revolution commune eiffel tower museum weather rain news market city history".split()
+
+class ToolLoopLLM(FakeMessagesListChatModel):
+    """Asks for three tool calls per turn for `rounds` turns, then answers; counts every prompt and sleeps in proportion to it."""
+    prompts: List[int] = []
+    latency_per_1k_tokens: float = 0.02
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "ToolLoopLLM":
+        return self
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        tokens = sum(approximate_tokens(str(message.content)) + approximate_tokens(str(getattr(message, "tool_calls", ""))) for message in messages)
+        self.prompts.append(tokens)
+        time.sleep(self.latency_per_1k_tokens * tokens / 1000)
+        return super()._generate(messages, stop, run_manager, **kwargs)
+
+def tool_loop_responses(rounds: int) -> List[AIMessage]:
+    responses = []
+    for turn in range(rounds):
+        responses.append(AIMessage(content="", tool_calls=[
+            {"name": "duckduckgo_search", "args": {"query": f"paris news {turn}"}, "id": f"ddg_{turn}"},
+            {"name": "wikipedia_search", "args": {"query": f"paris history {turn}"}, "id": f"wiki_{turn}"},
+            {"name": "get_stock_price", "args": {"ticker": "^FCHI"}, "id": f"stock_{turn}"},
+        ]))
+    return responses + [AIMessage(content="Paris was founded by the Parisii...")]
+
+class StubToolsAgent(IntelligentAgent):
+    """IntelligentAgent with offline tools that return long, search-engine sized results."""
+    rng = random.Random(0)
+
+    def duckduckgo_search(self, query: str) -> Any:
+        """Perform a search using DuckDuckGoSearchRun."""
+        return " ".join(self.rng.choice(WORDS) for _ in range(1500))
+
+    def wikipedia_search(self, query: str) -> Any:
+        """Perform a search using WikipediaRetriever."""
+        return " ".join(self.rng.choice(WORDS) for _ in range(3000))
+
+    def get_stock_price(self, ticker: str) -> float:
+        """Retrieve the previous closing stock price for a given ticker symbol."""
+        return 7512.3
+
+class LegacyAgent(StubToolsAgent):
+    """The reasoning node before bounded memory: the query is appended and the whole history re-sent every turn."""
+    def reasoning(self, state):
+        messages = state["messages"]
+        messages.append(HumanMessage(content=state["query"]))
+        result = [self.llm_with_tools.invoke([SYSTEM_MESSAGE] + messages)]
+        return {"messages": result, "usage": []}
+
+def main():
+    """Compares prompt tokens per reasoning turn with and without bounded agent memory, on a fake tool loop."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--rounds", type=int, nargs="+", default=[1, 3, 6, 10])
+    parser.add_argument("--max-tokens", type=int, default=6000)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    print(f"{'reasoning node':<16} {'tool rounds':>11} {'prompt tokens':>14} {'last turn':>10} {'wall':>8}")
+    for name, agent_class in [("legacy", LegacyAgent), ("bounded memory", StubToolsAgent)]:
+        for rounds in args.rounds:
+            llm = ToolLoopLLM(responses=tool_loop_responses(rounds), prompts=[])
+            agent = agent_class(llm=llm, memory=AgentMemory(max_tokens=args.max_tokens))
+            start = time.perf_counter()
+            state = agent.invoke("Tell me some historical facts about Paris including latest news and current weather conditions.")
+            elapsed = time.perf_counter() - start
+            assert state["messages"][-1].content.startswith("Paris"), state["messages"][-1]
+            print(f"{name:<16} {rounds:>11} {sum(llm.prompts):>14,} {llm.prompts[-1]:>10,} {elapsed:>6.2f} s")
+            if agent_class is StubToolsAgent and rounds == args.rounds[-1]:
+                usage = state["usage"]
+    print("\nPer-turn accounting in the final state (bounded memory, most rounds):")
+    for turn in usage:
+        print(f"  turn {turn['turn']}: {turn['prompt_tokens']:>6,} prompt tokens of {turn['history_tokens']:>7,} in the history, "
+              f"{turn['tool_outputs_condensed']} tool outputs condensed, {turn['rounds_dropped']} rounds dropped")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import argparse
+import asyncio
+import logging
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from langchain_core.messages import AIMessage
+from langgraph.graph import StateGraph, MessagesState, START, END
+from langgraph.prebuilt import ToolNode
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "tools"))
+
+from parallel_tools import ParallelToolNode
+
+# Median seconds per call, and the chance and length of a stall, per stubbed backend
+BACKENDS = {
+    "duckduckgo_search": (0.40, 0.10, 6.0),
+    "wikipedia_search": (0.25, 0.05, 4.0),
+    "get_stock_price": (0.10, 0.05, 3.0),
+}
+
+# The tool calls the sample query about Paris produces in one turn
+TURN = [
+    ("duckduckgo_search", "query", "latest news Paris"),
+    ("duckduckgo_search", "query", "current weather Paris"),
+    ("wikipedia_search", "query", "History of Paris"),
+    ("get_stock_price", "ticker", "^FCHI"),
+]
+
+DELAYS = {}
+
+def stub_delay(key: str) -> None:
+    time.sleep(DELAYS[key])
+
+def duckduckgo_search(query: str) -> str:
+    """Perform a search using DuckDuckGo."""
+    stub_delay(query)
+    return f"Search results for {query}"
+
+def wikipedia_search(query: str) -> str:
+    """Perform a search using Wikipedia."""
+    stub_delay(query)
+    return f"Wikipedia article about {query}"
+
+def get_stock_price(ticker: str) -> float:
+    """Retrieve the previous closing stock price for a given ticker symbol."""
+    stub_delay(ticker)
+    return 7500.0
+
+TOOLS = [duckduckgo_search, wikipedia_search, get_stock_price]
+
+def make_turns(count: int, seed: int = 0):
+    """Samples the delay of every call up front, so each tool node sees the same workload."""
+    rng = random.Random(seed)
+    turns = []
+    for turn in range(count):
+        calls = []
+        for index, (name, arg, value) in enumerate(TURN):
+            key = f"{value} #{turn}"
+            median, stall_chance, stall = BACKENDS[name]
+            DELAYS[key] = stall if rng.random() < stall_chance else rng.lognormvariate(np.log(median), 0.4)
+            calls.append({"name": name, "args": {arg: key}, "id": f"call_{turn}_{index}"})
+        turns.append(AIMessage(content="", tool_calls=calls))
+    return turns
+
+def build_graph(node):
+    workflow = StateGraph(MessagesState)
+    workflow.add_node("tools", node)
+    workflow.add_edge(START, "tools")
+    workflow.add_edge("tools", END)
+    return workflow.compile()
+
+def sequential(state):
+    """The calls one after the other, as a tool loop without concurrency runs them."""
+    tools = {tool.__name__: tool for tool in TOOLS}
+    for call in state["messages"][-1].tool_calls:
+        tools[call["name"]](**call["args"])
+    return {"messages": []}
+
+def summary(label: str, seconds, errors: int) -> str:
+    return (
+        f"{label:<28} p50 {np.percentile(seconds, 50):5.2f} s  p95 {np.percentile(seconds, 95):5.2f} s  "
+        f"max {max(seconds):5.2f} s  total {sum(seconds):6.1f} s  {errors:3d} calls answered with an error"
+    )
+
+def main():
+    """Measures tool-turn latency of a sequential loop, LangGraph's ToolNode and ParallelToolNode with stubbed, stalling backends."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--turns", type=int, default=40)
+    parser.add_argument("--timeout", type=float, default=1.0, help="Per-tool timeout of ParallelToolNode.")
+    parser.add_argument("--concurrent-turns", type=int, default=64, help="Turns sharing one node in the load test.")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+    turns = make_turns(args.turns)
+
+    def measure(label, run):
+        seconds, errors = [], 0
+        for message in turns:
+            start = time.perf_counter()
+            output = run({"messages": [message]})
+            seconds.append(time.perf_counter() - start)
+            errors += sum(getattr(m, "status", None) == "error" for m in output["messages"])
+        print(summary(label, seconds, errors))
+
+    measure("sequential", build_graph(sequential).invoke)
+    measure("ToolNode (prebuilt)", build_graph(ToolNode(TOOLS)).invoke)
+
+    timeouts = {name: args.timeout for name in BACKENDS}
+    node = ParallelToolNode(TOOLS, timeouts=timeouts, max_workers=64)
+    measure("ParallelToolNode (threads)", build_graph(node.invoke).invoke)
+    print("\nPer-tool latency, threads (timeouts recorded at the timeout):")
+    print(node.timings.report())
+
+    async_node = ParallelToolNode(TOOLS, timeouts=timeouts)
+    graph = build_graph(async_node.ainvoke)
+
+    async def run_async():
+        loop = asyncio.get_running_loop()
+        # Stalled sync tools keep their thread after the timeout, so give them room
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=64))
+        seconds, errors = [], 0
+        for message in turns:
+            start = time.perf_counter()
+            output = await graph.ainvoke({"messages": [message]})
+            seconds.append(time.perf_counter() - start)
+            errors += sum(getattr(m, "status", None) == "error" for m in output["messages"])
+        return seconds, errors
+    seconds, errors = asyncio.run(run_async())
+    print("\n" + summary("ParallelToolNode (async)", seconds, errors))
+    print("\nPer-tool latency, async:")
+    print(async_node.timings.report())
+    node.close()
+
+    # Many turns at once on the app's pool size: a call waiting for a worker is not a timeout
+    for index in range(args.concurrent_turns):
+        DELAYS[f"load #{index}"] = 0.4
+    shared = ParallelToolNode(TOOLS, timeouts=timeouts)
+    loaded = [
+        AIMessage(content="", tool_calls=[{"name": "duckduckgo_search", "args": {"query": f"load #{index}"}, "id": f"load_{index}"}])
+        for index in range(args.concurrent_turns)
+    ]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrent_turns) as pool:
+        outputs = list(pool.map(lambda message: shared.invoke({"messages": [message]}), loaded))
+    errors = sum(message.status == "error" for output in outputs for message in output["messages"])
+    print(f"\n{args.concurrent_turns} concurrent turns of one 0.4 s call on 16 workers: {time.perf_counter() - start:.2f} s, {errors} calls answered with an error")
+    print(shared.timings.report())
+    shared.close()
+
+if __name__ == "__main__":
+    main()
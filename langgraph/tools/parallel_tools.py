@@ -0,0 +1,148 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.tools import BaseTool, tool as create_tool
+from langgraph.prebuilt.tool_node import msg_content_output
+
+from stage_timings import StageTimings
+
+logger = logging.getLogger(__name__)
+
+class ParallelToolNode:
+    """
+    Graph node that runs every tool call of the last AI message concurrently.
+
+    Each call gets its own timeout. Calls that fail or time out are answered with an error
+    ToolMessage, so the model receives the results that did arrive instead of the turn
+    blocking on the slowest backend. The sync node runs the calls on a long-lived thread
+    pool shared by all turns. A call's timeout starts when a worker picks it up, so calls
+    queued behind other turns are not reported as timed out; how long they may wait for a
+    worker is bounded separately by `queue_timeout`. A timed-out call cannot be
+    interrupted there and finishes in the background, its result discarded. The async node runs them as tasks, and a timed-out task is
+    cancelled (sync tools still run to completion on the default executor).
+
+    Latency per tool is recorded in `timings`, with timeouts and exceptions counted as errors,
+    and the sync node's wait for a worker under the "tool queue" stage.
+    """
+    def __init__(
+        self,
+        tools: Sequence[Union[BaseTool, Callable]],
+        timeouts: Optional[Dict[str, float]] = None,
+        default_timeout: float = 10.0,
+        max_workers: int = 16,
+        queue_timeout: float = 30.0,
+        timings: Optional[StageTimings] = None,
+    ) -> None:
+        """
+        :param tools: The tools, as LangChain tools or plain functions with docstrings.
+        :param timeouts: Seconds each tool may take, keyed by tool name.
+        :param default_timeout: Seconds for tools not in `timeouts`.
+        :param max_workers: Threads for the sync node; size it for the calls still running after their timeout too.
+        :param queue_timeout: Seconds a call of the sync node may wait for a free worker before it is answered with an error.
+        :param timings: Where per-tool latency is recorded; a new StageTimings if omitted.
+        """
+        self.tools: Dict[str, BaseTool] = {}
+        for tool in tools:
+            tool = tool if isinstance(tool, BaseTool) else create_tool(tool)
+            self.tools[tool.name] = tool
+        self.timeouts = timeouts or {}
+        self.default_timeout = default_timeout
+        self.queue_timeout = queue_timeout
+        self.timings = timings or StageTimings()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tool")
+
+    def timeout(self, name: str) -> float:
+        return self.timeouts.get(name, self.default_timeout)
+
+    def _tool_calls(self, state: Dict) -> List[Dict]:
+        message = state["messages"][-1]
+        if not isinstance(message, AIMessage):
+            raise ValueError("ParallelToolNode expects the last message to be an AIMessage")
+        return message.tool_calls
+
+    def _error(self, call: Dict, content: str) -> ToolMessage:
+        return ToolMessage(content=content, name=call["name"], tool_call_id=call["id"], status="error")
+
+    def _timed_out(self, call: Dict) -> ToolMessage:
+        timeout = self.timeout(call["name"])
+        logger.warning(f"Tool {call['name']} timed out after {timeout}s")
+        self.timings.record(call["name"], timeout, error=True)
+        return self._error(call, f"Error: {call['name']} timed out after {timeout} seconds, answer without it.")
+
+    def _busy(self, call: Dict) -> ToolMessage:
+        logger.warning(f"Tool {call['name']} waited {self.queue_timeout}s for a free worker")
+        self.timings.record("tool queue", self.queue_timeout, error=True)
+        return self._error(call, f"Error: {call['name']} could not run, the tools are busy, answer without it.")
+
+    def _finish(self, call: Dict, message: ToolMessage, seconds: float) -> ToolMessage:
+        self.timings.record(call["name"], seconds, error=message.status == "error")
+        return message
+
+    def _run(self, call: Dict, started: Dict[str, float], event: threading.Event) -> Tuple[ToolMessage, float]:
+        started[call["id"]] = time.monotonic()
+        event.set()
+        tool = self.tools.get(call["name"])
+        if tool is None:
+            return self._error(call, f"Error: {call['name']} is not a valid tool, try one of {', '.join(self.tools)}."), 0.0
+        start = time.perf_counter()
+        try:
+            output = tool.invoke(call["args"])
+        except Exception as e:
+            return self._error(call, f"Error: {e!r}\n Please fix your mistakes."), time.perf_counter() - start
+        return ToolMessage(content=msg_content_output(output), name=call["name"], tool_call_id=call["id"]), time.perf_counter() - start
+
+    async def _arun(self, call: Dict) -> ToolMessage:
+        tool = self.tools.get(call["name"])
+        if tool is None:
+            return self._error(call, f"Error: {call['name']} is not a valid tool, try one of {', '.join(self.tools)}.")
+        start = time.perf_counter()
+        try:
+            output = await asyncio.wait_for(tool.ainvoke(call["args"]), self.timeout(call["name"]))
+        except asyncio.TimeoutError:
+            return self._timed_out(call)
+        except Exception as e:
+            return self._finish(call, self._error(call, f"Error: {e!r}\n Please fix your mistakes."), time.perf_counter() - start)
+        message = ToolMessage(content=msg_content_output(output), name=call["name"], tool_call_id=call["id"])
+        return self._finish(call, message, time.perf_counter() - start)
+
+    def invoke(self, state: Dict) -> Dict[str, Any]:
+        """Runs the tool calls on the thread pool and returns the ToolMessages in call order."""
+        calls = self._tool_calls(state)
+        submitted = time.monotonic()
+        started: Dict[str, float] = {}
+        events = [threading.Event() for _ in calls]
+        futures = [self._executor.submit(self._run, call, started, event) for call, event in zip(calls, events)]
+        messages = []
+        for call, event, future in zip(calls, events, futures):
+            if not event.wait(timeout=max(0.0, submitted + self.queue_timeout - time.monotonic())):
+                if future.cancel():
+                    messages.append(self._busy(call))
+                    continue
+                # A worker picked it up just now
+                event.wait()
+            queued = started[call["id"]] - submitted
+            self.timings.record("tool queue", queued)
+            if queued > 0.1:
+                logger.info(f"Tool {call['name']} waited {queued:.2f}s for a free worker")
+            # Wait for each call until its own deadline, measured from when it started running
+            wait([future], timeout=max(0.0, started[call["id"]] + self.timeout(call["name"]) - time.monotonic()))
+            if future.done():
+                messages.append(self._finish(call, *future.result()))
+            else:
+                # The result of a call that finishes later is dropped, with its latency
+                future.cancel()
+                messages.append(self._timed_out(call))
+        return {"messages": messages}
+
+    async def ainvoke(self, state: Dict) -> Dict[str, Any]:
+        """Runs the tool calls as concurrent tasks and returns the ToolMessages in call order."""
+        messages = await asyncio.gather(*(self._arun(call) for call in self._tool_calls(state)))
+        return {"messages": list(messages)}
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
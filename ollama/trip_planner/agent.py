@@ -0,0 +1,125 @@
+import asyncio
+import logging
+import os
+import sys
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Mapping, Sequence
+
+import ollama
+
+# Trip tools are shared with the LangChain trip planner
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "tools"))
+
+import trip_tools
+
+logger = logging.getLogger(__name__)
+
+# Tool schemas advertised to the model
+TOOLS = [
+    {
+        "type": "function",
+        "function": {
+            "name": "get_weather_forecast",
+            "description": "Fetch the current weather for a given location.",
+            "parameters": {"type": "object", "properties": {"city": {"type": "string"}, "days_ahead": {"type": "integer"}}, "required": ["city"]}
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_exchange_rate",
+            "description": "Retrieve the exchange rate from USD to the given currency.",
+            "parameters": {"type": "object", "properties": {"target_currency": {"type": "string"}}, "required": ["target_currency"]}
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_latest_news",
+            "description": "Fetch the latest news articles for a given location using Tavily.",
+            "parameters": {"type": "object", "properties": {"city": {"type": "string"}}, "required": ["city"]}
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "translate_common_phrases",
+            "description": "Translate common phrases into the local language.",
+            "parameters": {"type": "object", "properties": {"language": {"type": "string"}}, "required": ["language"]}
+        }
+    }
+]
+
+# Tool names mapped to the local functions that implement them
+FUNCTIONS: Dict[str, Callable[..., Awaitable[str]]] = {
+    "get_weather_forecast": lambda city, days_ahead=5: trip_tools.fetch_weather_forecast(city, days_ahead),
+    "get_exchange_rate": trip_tools.fetch_exchange_rate,
+    "get_latest_news": trip_tools.fetch_latest_news,
+    "translate_common_phrases": trip_tools.translate_common_phrases,
+}
+
+async def call_tool(tool_call: ollama.Message.ToolCall, functions: Mapping[str, Callable[..., Awaitable[str]]]) -> str:
+    """Runs one tool call, returning errors as text so the model can see and work around them."""
+    name, arguments = tool_call.function.name, dict(tool_call.function.arguments)
+    function = functions.get(name)
+    if function is None:
+        return f"Error: unknown tool '{name}'."
+    try:
+        return await function(**arguments)
+    except Exception as e:
+        logger.warning("Tool %s(%s) failed: %s", name, arguments, e)
+        return f"Error: {e}"
+
+async def run_agent(
+    client: ollama.AsyncClient,
+    model: str,
+    messages: List[Dict],
+    tools: Sequence[Dict] = TOOLS,
+    functions: Mapping[str, Callable[..., Awaitable[str]]] = FUNCTIONS,
+    max_turns: int = 5,
+    stream: bool = True,
+    parallel_tools: bool = True,
+) -> AsyncIterator[str]:
+    """
+    Runs the tool-calling loop and yields the answer text as it is generated.
+
+    Each model turn is streamed. When a turn requests tools, all of its tool calls are
+    dispatched concurrently, their results are appended as tool messages and the model is
+    called again, until it answers without calling tools or `max_turns` is reached.
+
+    :param client: The Ollama client.
+    :param model: The model name, e.g. "mistral".
+    :param messages: The conversation so far; assistant and tool messages are appended to it.
+    :param tools: The tool schemas advertised to the model.
+    :param functions: Tool names mapped to async functions taking the tool arguments.
+    :param max_turns: Safety limit on the number of model calls.
+    :param stream: Stream each turn token by token; otherwise each turn is yielded whole.
+    :param parallel_tools: Dispatch the tool calls of one turn concurrently rather than one by one.
+    """
+    for turn in range(max_turns):
+        content, tool_calls = [], []
+        if stream:
+            async for chunk in await client.chat(model=model, messages=messages, tools=tools, stream=True):
+                if chunk.message.content:
+                    content.append(chunk.message.content)
+                    yield chunk.message.content
+                tool_calls.extend(chunk.message.tool_calls or [])
+        else:
+            response = await client.chat(model=model, messages=messages, tools=tools)
+            if response.message.content:
+                content.append(response.message.content)
+                yield response.message.content
+            tool_calls.extend(response.message.tool_calls or [])
+
+        messages.append({"role": "assistant", "content": "".join(content), "tool_calls": tool_calls})
+        if not tool_calls:
+            return
+
+        logger.info("Turn %d: calling %s", turn + 1, ", ".join(tool_call.function.name for tool_call in tool_calls))
+        if parallel_tools:
+            results = await asyncio.gather(*(call_tool(tool_call, functions) for tool_call in tool_calls))
+        else:
+            results = [await call_tool(tool_call, functions) for tool_call in tool_calls]
+        for tool_call, result in zip(tool_calls, results):
+            messages.append({"role": "tool", "content": result, "tool_name": tool_call.function.name})
+
+    logger.warning("Stopped after %d turns without a final answer", max_turns)
@@ -0,0 +1,135 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "tools"))
+
+from benchmark_trip_tools import DELAYS, MockApiHandler, MockServer
+
+# Stub model timings in seconds, set from the command line
+MODEL_TIMINGS = {"tool_turn": 0.0, "token": 0.0, "tokens": 0}
+
+class StubOllamaHandler(BaseHTTPRequestHandler):
+    """
+    Mimics Ollama's /api/chat: the first turn requests all four trip tools, and once tool
+    results are in the conversation it answers with a fixed number of tokens.
+    """
+    protocol_version = "HTTP/1.1"
+
+    def _write_chunk(self, payload: dict) -> None:
+        # Streamed responses are NDJSON sent with chunked transfer encoding
+        line = (json.dumps(payload) + "\n").encode("utf-8")
+        self.wfile.write(f"{len(line):x}\r\n".encode("ascii") + line + b"\r\n")
+        self.wfile.flush()
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        base = {"model": request["model"], "created_at": "2026-10-18T12:00:00Z"}
+        if any(message["role"] == "tool" for message in request["messages"]):
+            tokens = [f"token{i} " for i in range(MODEL_TIMINGS["tokens"])]
+            tool_calls = []
+        else:
+            time.sleep(MODEL_TIMINGS["tool_turn"])
+            tokens = []
+            tool_calls = [
+                {"function": {"name": "get_weather_forecast", "arguments": {"city": "Berlin"}}},
+                {"function": {"name": "get_exchange_rate", "arguments": {"target_currency": "EUR"}}},
+                {"function": {"name": "get_latest_news", "arguments": {"city": "Berlin"}}},
+                {"function": {"name": "translate_common_phrases", "arguments": {"language": "de"}}},
+            ]
+        done = {**base, "message": {"role": "assistant", "content": ""}, "done": True, "done_reason": "stop"}
+
+        if not request.get("stream", True):
+            time.sleep(MODEL_TIMINGS["token"] * len(tokens))
+            body = json.dumps({**done, "message": {"role": "assistant", "content": "".join(tokens), "tool_calls": tool_calls}}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        if tool_calls:
+            self._write_chunk({**base, "message": {"role": "assistant", "content": "", "tool_calls": tool_calls}, "done": False})
+        for token in tokens:
+            time.sleep(MODEL_TIMINGS["token"])
+            self._write_chunk({**base, "message": {"role": "assistant", "content": token}, "done": False})
+        self._write_chunk(done)
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, format, *args):
+        pass
+
+def start_server(handler) -> MockServer:
+    server = MockServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main():
+    """Measures time-to-first-token of the Ollama trip planner agent against a stub Ollama server."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--tool-turn-delay", type=float, default=0.3, help="Seconds the stub model takes to pick tools.")
+    parser.add_argument("--token-delay", type=float, default=0.02, help="Seconds per generated answer token.")
+    parser.add_argument("--tokens", type=int, default=200, help="Tokens in the final answer.")
+    parser.add_argument("--tool-delay", type=float, default=0.3, help="Latency of each mocked tool API.")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+    MODEL_TIMINGS.update({"tool_turn": args.tool_turn_delay, "token": args.token_delay, "tokens": args.tokens})
+    DELAYS.update({path: args.tool_delay for path in ("/weather", "/rates", "/search", "/translate")})
+
+    api_server, ollama_server = start_server(MockApiHandler), start_server(StubOllamaHandler)
+    api_url = f"http://127.0.0.1:{api_server.server_port}"
+    # Point the tools at the mock APIs and disable their caches, so every run pays for the tool calls
+    os.environ.update({
+        "OPENWEATHERMAP_API_KEY": "key",
+        "OPENWEATHERMAP_URL": f"{api_url}/weather",
+        "EXCHANGE_RATE_URL": f"{api_url}/rates",
+        "TRANSLATE_URL": f"{api_url}/translate",
+        "TAVILY_SEARCH_URL": f"{api_url}/search",
+        "TOOL_CACHE_DIR": tempfile.mkdtemp(prefix="tool_cache_"),
+        "WEATHER_TTL": "0",
+        "RATE_TABLE_TTL": "0",
+        "TRANSLATION_TTL": "0",
+    })
+    import ollama
+    from agent import run_agent
+
+    async def measure(stream: bool, parallel_tools: bool):
+        client = ollama.AsyncClient(host=f"http://127.0.0.1:{ollama_server.server_port}")
+        first_token = None
+        start = time.perf_counter()
+        messages = [{"role": "user", "content": "Plan a trip to Berlin."}]
+        async for _ in run_agent(client, "mistral", messages, stream=stream, parallel_tools=parallel_tools):
+            if first_token is None:
+                first_token = time.perf_counter() - start
+        return first_token, time.perf_counter() - start
+
+    print(f"{'mode':<34} {'time to first token':>20} {'total':>8}")
+    try:
+        for name, stream, parallel_tools in [
+            ("blocking, sequential tools", False, False),
+            ("blocking, parallel tools", False, True),
+            ("streaming, parallel tools", True, True),
+        ]:
+            timings = [asyncio.run(measure(stream, parallel_tools)) for _ in range(args.runs)]
+            ttft = sum(first for first, _ in timings) / len(timings)
+            total = sum(elapsed for _, elapsed in timings) / len(timings)
+            print(f"{name:<34} {ttft:>18.3f} s {total:>6.2f} s")
+    finally:
+        api_server.shutdown()
+        ollama_server.shutdown()
+
+if __name__ == "__main__":
+    main()
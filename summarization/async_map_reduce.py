@@ -0,0 +1,125 @@
+import asyncio
+import logging
+import random
+from typing import Callable, Dict, List, Optional
+
+from langchain_core.documents import Document
+from langchain_core.language_models import BaseChatModel
+from langchain_core.prompts import BasePromptTemplate
+
+from summary_cache import SummaryCache
+
+logger = logging.getLogger(__name__)
+
+class AsyncMapReduceSummarizer:
+    """
+    Map/reduce summarization with bounded concurrency, per-chunk retries and a tree reduce.
+
+    The map step summarizes every chunk concurrently, limited by a semaphore. If the
+    combined summaries exceed `token_max`, they are packed into groups that fit and each
+    group is collapsed in parallel, round after round, until a single combine call fits.
+    """
+    def __init__(
+        self,
+        llm: BaseChatModel,
+        map_prompt: BasePromptTemplate,
+        combine_prompt: BasePromptTemplate,
+        collapse_prompt: Optional[BasePromptTemplate] = None,
+        max_concurrency: int = 8,
+        max_retries: int = 3,
+        retry_delay: float = 1.0,
+        token_max: int = 3000,
+        max_collapse_rounds: int = 10,
+        document_variable_name: str = "text",
+        length_function: Optional[Callable[[str], int]] = None,
+        cache: Optional[SummaryCache] = None,
+    ) -> None:
+        """
+        :param llm: The chat model used for every step.
+        :param map_prompt: Prompt applied to each chunk.
+        :param combine_prompt: Prompt applied once to the final set of summaries.
+        :param collapse_prompt: Prompt used for intermediate reduce rounds; defaults to `combine_prompt`.
+        :param max_concurrency: The maximum number of LLM calls in flight.
+        :param max_retries: Retries per call before the error is raised.
+        :param retry_delay: Base delay in seconds for exponential backoff with jitter.
+        :param token_max: Token budget for the text passed to a single reduce call.
+        :param max_collapse_rounds: Safety limit on the number of tree reduce rounds.
+        :param document_variable_name: The prompt variable that receives the text.
+        :param length_function: Counts tokens in a string; defaults to `llm.get_num_tokens`.
+        :param cache: Optional result cache; calls whose rendered prompt was seen before are not repeated.
+        """
+        self.llm = llm
+        self.map_prompt = map_prompt
+        self.combine_prompt = combine_prompt
+        self.collapse_prompt = collapse_prompt or combine_prompt
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.token_max = token_max
+        self.max_collapse_rounds = max_collapse_rounds
+        self.document_variable_name = document_variable_name
+        self.length_function = length_function or llm.get_num_tokens
+        self.cache = cache
+
+    async def _call(self, prompt: BasePromptTemplate, text: str, semaphore: asyncio.Semaphore) -> str:
+        """Runs one LLM call under the semaphore, retrying with jittered exponential backoff."""
+        inputs = {self.document_variable_name: text}
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with semaphore:
+                    if self.cache:
+                        return await self.cache.ainvoke(self.llm, prompt, inputs)
+                    message = await (prompt | self.llm).ainvoke(inputs)
+                return message.content
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self.retry_delay * (2 ** attempt) * random.uniform(0.5, 1.5)
+                logger.warning("LLM call failed (%s), retrying in %.2fs", e, delay)
+                await asyncio.sleep(delay)
+
+    def _group(self, summaries: List[str]) -> List[List[str]]:
+        """Greedily packs summaries into groups whose combined length fits `token_max`."""
+        groups, current, current_tokens = [], [], 0
+        for summary in summaries:
+            tokens = self.length_function(summary)
+            if current and current_tokens + tokens > self.token_max:
+                groups.append(current)
+                current, current_tokens = [], 0
+            current.append(summary)
+            current_tokens += tokens
+        groups.append(current)
+        # Every summary is too large to share a group: collapse in pairs so the round still shrinks the list
+        if len(groups) == len(summaries):
+            groups = [summaries[i:i + 2] for i in range(0, len(summaries), 2)]
+        return groups
+
+    async def asummarize(self, docs: List[Document]) -> Dict:
+        """
+        Summarizes the documents.
+
+        :param docs: The chunks to summarize.
+        :return: A dict with `output_text`, the map-step `intermediate_steps` and the number of `collapse_rounds`.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        intermediate_steps = await asyncio.gather(
+            *(self._call(self.map_prompt, doc.page_content, semaphore) for doc in docs)
+        )
+
+        summaries, rounds = list(intermediate_steps), 0
+        while len(summaries) > 1 and self.length_function("\n\n".join(summaries)) > self.token_max:
+            if rounds == self.max_collapse_rounds:
+                raise ValueError(f"Summaries still exceed token_max={self.token_max} after {rounds} collapse rounds.")
+            groups = self._group(summaries)
+            summaries = await asyncio.gather(
+                *(self._call(self.collapse_prompt, "\n\n".join(group), semaphore) for group in groups)
+            )
+            rounds += 1
+            logger.info("Collapse round %d: %d groups", rounds, len(groups))
+
+        output_text = await self._call(self.combine_prompt, "\n\n".join(summaries), semaphore)
+        return {"output_text": output_text, "intermediate_steps": list(intermediate_steps), "collapse_rounds": rounds}
+
+    def summarize(self, docs: List[Document]) -> Dict:
+        """Synchronous wrapper around `asummarize`."""
+        return asyncio.run(self.asummarize(docs))
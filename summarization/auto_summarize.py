@@ -0,0 +1,232 @@
+import asyncio
+import logging
+import math
+from typing import Any, Callable, Dict, List, Optional
+
+from pydantic import BaseModel
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.documents import Document
+from langchain_core.language_models import BaseChatModel
+from langchain_core.prompts import PromptTemplate
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from async_map_reduce import AsyncMapReduceSummarizer
+from resumable_refine import ResumableRefineSummarizer
+from summary_cache import SummaryCache
+
+logger = logging.getLogger(__name__)
+
+# Context window sizes in tokens for the chat models used in this repo
+CONTEXT_WINDOWS = {
+    "gpt-4o-mini": 128_000,
+    "gpt-4o": 128_000,
+    "gpt-4-turbo": 128_000,
+    "gpt-3.5-turbo": 16_385,
+}
+
+STUFF_PROMPT = PromptTemplate.from_template("""
+    Write a concise summary of the following text delimited by triple backquotes.
+    Return your response in bullet points which covers the key points of the text.
+    ```{text}```
+    BULLET POINT SUMMARY:
+""")
+
+MAP_PROMPT = PromptTemplate.from_template("""
+    Write a summary of this chunk of text that includes the main points and any important details.
+    {text}
+""")
+
+COMBINE_PROMPT = PromptTemplate.from_template("""
+    Write a summary of the entire document that includes the main points from all of the individual summaries.
+    {text}
+""")
+
+QUESTION_PROMPT = PromptTemplate.from_template("""
+    Please provide a summary of the following text.
+    TEXT: {text}
+    SUMMARY:
+""")
+
+REFINE_PROMPT = PromptTemplate.from_template("""
+    Here is the summary so far: {existing_answer}
+    Refine it with the following text delimited by triple backquotes.
+    Return your response in bullet points which covers the key points of the text.
+    ```{text}```
+    BULLET POINT SUMMARY:
+""")
+
+class SummaryPlan(BaseModel):
+    strategy: str
+    total_tokens: int
+    chunk_tokens: int
+    num_chunks: int
+    predicted_calls: int
+    predicted_rounds: int
+    reason: str
+
+class CallCounter(BaseCallbackHandler):
+    """Counts LLM calls made through the runnables it is attached to."""
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: List, **kwargs: Any) -> None:
+        self.calls += 1
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], **kwargs: Any) -> None:
+        self.calls += 1
+
+class AutoSummarizer:
+    """
+    Picks stuff, map_reduce or refine from up-front token counts and runs it.
+
+    Chunks are sized to fill the model's context window, and the strategy with the
+    fewest predicted LLM calls wins, subject to an optional limit on sequential rounds.
+    """
+    def __init__(
+        self,
+        llm: BaseChatModel,
+        context_window: Optional[int] = None,
+        max_output_tokens: int = 1024,
+        summary_tokens: int = 400,
+        max_rounds: Optional[int] = None,
+        max_concurrency: int = 8,
+        checkpoint_path: str = "refine_checkpoint.json",
+        length_function: Optional[Callable[[str], int]] = None,
+        cache: Optional[SummaryCache] = None,
+    ) -> None:
+        """
+        :param llm: The chat model used for every step.
+        :param context_window: The model's context window; looked up in CONTEXT_WINDOWS by default.
+        :param max_output_tokens: Tokens reserved for each response.
+        :param summary_tokens: Expected length of an intermediate summary.
+        :param max_rounds: Latency target, the maximum number of sequential LLM rounds; None for no limit.
+        :param max_concurrency: Parallel calls allowed in the map_reduce strategy.
+        :param checkpoint_path: Checkpoint file used by the refine strategy.
+        :param length_function: Counts tokens in a string; defaults to `llm.get_num_tokens`.
+        :param cache: Optional result cache shared by all strategies.
+        """
+        model_name = getattr(llm, "model_name", None)
+        if context_window is None and model_name not in CONTEXT_WINDOWS:
+            raise ValueError(f"Unknown context window for model '{model_name}'; pass context_window.")
+        self.llm = llm
+        self.context_window = context_window or CONTEXT_WINDOWS[model_name]
+        self.max_output_tokens = max_output_tokens
+        self.summary_tokens = summary_tokens
+        self.max_rounds = max_rounds
+        self.max_concurrency = max_concurrency
+        self.checkpoint_path = checkpoint_path
+        self.length_function = length_function or llm.get_num_tokens
+        self.cache = cache
+
+    def _input_budget(self, prompt: PromptTemplate, *reserved: int) -> int:
+        """Tokens left for document text once the prompt, the response and any reserved text are accounted for."""
+        overhead = self.length_function(prompt.format(**{name: "" for name in prompt.input_variables}))
+        return self.context_window - self.max_output_tokens - overhead - sum(reserved)
+
+    @staticmethod
+    def _overlap(chunk_tokens: int) -> int:
+        return min(200, chunk_tokens // 20)
+
+    def _num_chunks(self, total_tokens: int, chunk_tokens: int) -> int:
+        """Predicts how many chunks the splitter produces, given that consecutive chunks overlap."""
+        overlap = self._overlap(chunk_tokens)
+        return max(1, math.ceil((total_tokens - overlap) / (chunk_tokens - overlap)))
+
+    def plan(self, docs: List[Document]) -> SummaryPlan:
+        """Counts tokens for the documents and predicts calls and sequential rounds for each strategy."""
+        total_tokens = sum(self.length_function(doc.page_content) for doc in docs)
+
+        stuff_budget = self._input_budget(STUFF_PROMPT)
+        if total_tokens <= stuff_budget:
+            return SummaryPlan(
+                strategy="stuff", total_tokens=total_tokens, chunk_tokens=total_tokens, num_chunks=1,
+                predicted_calls=1, predicted_rounds=1, reason="the documents fit in a single prompt",
+            )
+
+        # map_reduce: one call per chunk, then collapse rounds until the summaries fit one combine call
+        map_chunk = self._input_budget(MAP_PROMPT)
+        reduce_budget = self._input_budget(COMBINE_PROMPT)
+        map_chunks = self._num_chunks(total_tokens, map_chunk)
+        map_calls, collapse_rounds, summaries = map_chunks, 0, map_chunks
+        while summaries > 1 and summaries * self.summary_tokens > reduce_budget:
+            summaries = math.ceil(summaries * self.summary_tokens / reduce_budget)
+            map_calls += summaries
+            collapse_rounds += 1
+        map_reduce = SummaryPlan(
+            strategy="map_reduce", total_tokens=total_tokens, chunk_tokens=map_chunk, num_chunks=map_chunks,
+            predicted_calls=map_calls + 1,
+            predicted_rounds=math.ceil(map_chunks / self.max_concurrency) + collapse_rounds + 1,
+            reason="",
+        )
+
+        # refine: one sequential call per chunk, each chunk sharing the window with the running summary
+        refine_chunk = self._input_budget(REFINE_PROMPT, self.summary_tokens)
+        refine_chunks = self._num_chunks(total_tokens, refine_chunk)
+        refine = SummaryPlan(
+            strategy="refine", total_tokens=total_tokens, chunk_tokens=refine_chunk, num_chunks=refine_chunks,
+            predicted_calls=refine_chunks, predicted_rounds=refine_chunks, reason="",
+        )
+
+        candidates = [plan for plan in (map_reduce, refine) if self.max_rounds is None or plan.predicted_rounds <= self.max_rounds]
+        if not candidates:
+            best = min((map_reduce, refine), key=lambda plan: plan.predicted_rounds)
+            best.reason = f"no strategy meets max_rounds={self.max_rounds}; it has the fewest sequential rounds"
+            return best
+        best = min(candidates, key=lambda plan: (plan.predicted_calls, plan.predicted_rounds))
+        best.reason = "it needs the fewest LLM calls" + (f" within {self.max_rounds} rounds" if self.max_rounds else "")
+        return best
+
+    def _split(self, docs: List[Document], chunk_tokens: int) -> List[Document]:
+        """Joins the documents and splits them into chunks that fill `chunk_tokens`."""
+        splitter = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_tokens,
+            chunk_overlap=self._overlap(chunk_tokens),
+            length_function=self.length_function,
+        )
+        return splitter.create_documents(["\n\n".join(doc.page_content for doc in docs)])
+
+    async def asummarize(self, docs: List[Document]) -> Dict:
+        """
+        Plans and runs the summarization, logging predicted and actual call counts.
+
+        :return: A dict with `output_text`, the `plan` and the `actual_calls`.
+        """
+        plan = self.plan(docs)
+        logger.info(
+            "Summarizing %d tokens with '%s' because %s: %d chunks of up to %d tokens, predicted %d calls in %d rounds",
+            plan.total_tokens, plan.strategy, plan.reason, plan.num_chunks, plan.chunk_tokens,
+            plan.predicted_calls, plan.predicted_rounds,
+        )
+
+        counter = CallCounter()
+        llm = self.llm.with_config(callbacks=[counter])
+        if plan.strategy == "stuff":
+            text = "\n\n".join(doc.page_content for doc in docs)
+            if self.cache:
+                output_text = await self.cache.ainvoke(llm, STUFF_PROMPT, {"text": text})
+            else:
+                output_text = (await (STUFF_PROMPT | llm).ainvoke({"text": text})).content
+        elif plan.strategy == "map_reduce":
+            summarizer = AsyncMapReduceSummarizer(
+                llm, MAP_PROMPT, COMBINE_PROMPT,
+                max_concurrency=self.max_concurrency,
+                token_max=self._input_budget(COMBINE_PROMPT),
+                length_function=self.length_function,
+                cache=self.cache,
+            )
+            output_text = (await summarizer.asummarize(self._split(docs, plan.chunk_tokens)))["output_text"]
+        else:
+            summarizer = ResumableRefineSummarizer(
+                llm, QUESTION_PROMPT, REFINE_PROMPT,
+                checkpoint_path=self.checkpoint_path,
+                length_function=self.length_function,
+                cache=self.cache,
+            )
+            output_text = (await summarizer.asummarize(self._split(docs, plan.chunk_tokens)))["output_text"]
+
+        logger.info("Strategy '%s' made %d LLM calls (predicted %d)", plan.strategy, counter.calls, plan.predicted_calls)
+        return {"output_text": output_text, "plan": plan, "actual_calls": counter.calls}
+
+    def summarize(self, docs: List[Document]) -> Dict:
+        """Synchronous wrapper around `asummarize`."""
+        return asyncio.run(self.asummarize(docs))
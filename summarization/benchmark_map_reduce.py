@@ -0,0 +1,41 @@
+import argparse
+import logging
+import time
+
+from langchain_core.documents import Document
+from langchain_core.prompts import PromptTemplate
+
+from async_map_reduce import AsyncMapReduceSummarizer
+from fake_llm import FakeChatModel
+
+def main():
+    """Measures wall-clock time of AsyncMapReduceSummarizer against concurrency level using a fake chat model."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--chunks", type=int, default=300, help="Number of chunks, e.g. one per PDF page.")
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds per fake LLM call.")
+    parser.add_argument("--failure-rate", type=float, default=0.02)
+    parser.add_argument("--token-max", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    args = parser.parse_args()
+
+    # Keep retry warnings out of the results table
+    logging.basicConfig(level=logging.ERROR)
+
+    docs = [Document(page_content=f"Page {i}. " + "MLOps practitioners automate training and deployment. " * 40) for i in range(args.chunks)]
+    map_prompt = PromptTemplate.from_template("Write a summary of this chunk of text.\n{text}")
+    combine_prompt = PromptTemplate.from_template("Write a summary of the entire document.\n{text}")
+
+    print(f"{'concurrency':>11} {'wall s':>8} {'calls':>6} {'failures':>8} {'rounds':>6}")
+    for concurrency in args.concurrency:
+        llm = FakeChatModel(latency=args.latency, failure_rate=args.failure_rate, seed=0)
+        summarizer = AsyncMapReduceSummarizer(
+            llm, map_prompt, combine_prompt,
+            max_concurrency=concurrency, retry_delay=0.05, token_max=args.token_max,
+        )
+        start = time.perf_counter()
+        result = summarizer.summarize(docs)
+        elapsed = time.perf_counter() - start
+        print(f"{concurrency:>11} {elapsed:>8.2f} {llm.calls:>6} {llm.failures:>8} {result['collapse_rounds']:>6}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from pypdf import PdfWriter
+from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
+from langchain_community.document_loaders import PyPDFLoader
+
+from pdf_stream import load_chunks
+
+def write_synthetic_pdf(path: str, num_pages: int, lines_per_page: int = 45) -> None:
+    """Writes a text-only PDF with `num_pages` pages of filler prose."""
+    writer = PdfWriter()
+    font = writer._add_object(DictionaryObject({
+        NameObject("/Type"): NameObject("/Font"),
+        NameObject("/Subtype"): NameObject("/Type1"),
+        NameObject("/BaseFont"): NameObject("/Helvetica"),
+    }))
+    for page_number in range(num_pages):
+        page = writer.add_blank_page(width=612, height=792)
+        page[NameObject("/Resources")] = DictionaryObject({
+            NameObject("/Font"): DictionaryObject({NameObject("/F1"): font}),
+        })
+        lines = [
+            f"Page {page_number} line {line}: continuous delivery pipelines retrain and redeploy models automatically."
+            for line in range(lines_per_page)
+        ]
+        content = "BT /F1 10 Tf 14 TL 40 760 Td " + " ".join(f"({line}) '" for line in lines) + " ET"
+        stream = DecodedStreamObject()
+        stream.set_data(content.encode("latin-1"))
+        page[NameObject("/Contents")] = writer._add_object(stream)
+    with open(path, "wb") as f:
+        writer.write(f)
+
+def measure(fn):
+    """Returns (result, seconds, peak traced memory in MB) for fn()."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 1e6
+
+def main():
+    """Compares load_and_split()[:n] with streaming the first pages of a large synthetic PDF."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--pages", type=int, default=2000, help="Pages in the synthetic PDF.")
+    parser.add_argument("--first", type=int, nargs="+", default=[3, 30, 300], help="Numbers of leading pages to summarize.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, "synthetic.pdf")
+        write_synthetic_pdf(file_path, args.pages)
+        print(f"{args.pages} pages, {os.path.getsize(file_path) / 1e6:.1f} MB\n")
+
+        full, full_time, full_peak = measure(lambda: PyPDFLoader(file_path).load_and_split())
+        print(f"{'load_and_split (all pages)':>30} {full_time:>8.2f} s {full_peak:>8.1f} MB  {len(full)} chunks")
+
+        for first in args.first:
+            chunks, elapsed, peak = measure(lambda: load_chunks(file_path, end_page=first))
+            expected = [chunk.page_content for chunk in full if chunk.metadata["page"] < first]
+            assert [chunk.page_content for chunk in chunks] == expected, "streamed chunks differ from load_and_split"
+            print(f"{f'streamed first {first} pages':>30} {elapsed:>8.2f} s {peak:>8.1f} MB  {len(chunks)} chunks")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from langchain_core.documents import Document
+from langchain_core.prompts import PromptTemplate
+
+from fake_llm import FakeChatModel, FakeLLMError
+from resumable_refine import ResumableRefineSummarizer
+
+def run_until_complete(llm, docs, checkpoint_path, resume: bool, speculative: bool = True):
+    """Restarts the refine run after every crash; without `resume` each restart begins from scratch."""
+    question_prompt = PromptTemplate.from_template("Please provide a summary of the following text.\n{text}")
+    refine_prompt = PromptTemplate.from_template("Summary so far: {existing_answer}\nRefine it with:\n{text}")
+    restarts, restart_costs = 0, []
+    start = time.perf_counter()
+    while True:
+        if not resume and os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        runner = ResumableRefineSummarizer(
+            llm, question_prompt, refine_prompt, checkpoint_path, max_retries=0, speculative=speculative,
+        )
+        restart_start = time.perf_counter()
+        runner.load_checkpoint(docs)
+        restart_costs.append(time.perf_counter() - restart_start)
+        try:
+            runner.summarize(docs)
+            return time.perf_counter() - start, restarts, sum(restart_costs) / len(restart_costs)
+        except FakeLLMError:
+            restarts += 1
+
+def main():
+    """Measures restart cost and throughput of the checkpointed refine runner with a randomly failing fake LLM."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds per fake LLM call.")
+    parser.add_argument("--failure-rate", type=float, default=0.01, help="Probability that a call crashes the run.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    docs = [Document(page_content=f"Page {i}. " + "Models are monitored for drift and retrained. " * 60) for i in range(args.pages)]
+
+    print(f"{'mode':>24} {'wall s':>8} {'calls':>6} {'restarts':>8} {'pages/s':>8} {'restart ms':>10}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for label, resume, speculative in [
+            ("restart from scratch", False, True),
+            ("resume, no speculation", True, False),
+            ("resume + speculation", True, True),
+        ]:
+            checkpoint_path = os.path.join(tmp_dir, f"{label}.json")
+            llm = FakeChatModel(latency=args.latency, failure_rate=args.failure_rate, seed=1)
+            elapsed, restarts, restart_cost = run_until_complete(llm, docs, checkpoint_path, resume, speculative)
+            print(f"{label:>24} {elapsed:>8.2f} {llm.calls:>6} {restarts:>8} {args.pages / elapsed:>8.1f} {restart_cost * 1000:>10.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import argparse
+import logging
+import os
+import random
+import tempfile
+import time
+
+from langchain_core.documents import Document
+from langchain_core.prompts import PromptTemplate
+
+from async_map_reduce import AsyncMapReduceSummarizer
+from fake_llm import FakeChatModel
+from summary_cache import SummaryCache
+
+def main():
+    """Re-summarizes a lightly edited document with the summary cache and reports hit rate and saved tokens."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--edits", type=int, default=5, help="Pages changed between the two runs.")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds per fake LLM call.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    map_prompt = PromptTemplate.from_template("Write a summary of this chunk of text.\n{text}")
+    combine_prompt = PromptTemplate.from_template("Write a summary of the entire document.\n{text}")
+    pages = [f"Page {i}. " + "Feature stores keep training and serving data consistent. " * 30 for i in range(args.pages)]
+    edited = list(pages)
+    for i in random.Random(0).sample(range(args.pages), args.edits):
+        edited[i] += " Edited."
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_path = os.path.join(tmp_dir, "summary_cache.sqlite")
+        print(f"{'run':>16} {'wall s':>8} {'LLM calls':>9}  cache")
+        for label, texts in [("first run", pages), ("unchanged", pages), (f"{args.edits} pages edited", edited)]:
+            cache = SummaryCache(cache_path)
+            llm = FakeChatModel(latency=args.latency)
+            summarizer = AsyncMapReduceSummarizer(llm, map_prompt, combine_prompt, max_concurrency=16, token_max=2000, cache=cache)
+            start = time.perf_counter()
+            summarizer.summarize([Document(page_content=text) for text in texts])
+            elapsed = time.perf_counter() - start
+            print(f"{label:>16} {elapsed:>8.2f} {llm.calls:>9}  {cache.stats.report()}")
+            cache.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import argparse
+import hashlib
+import logging
+import random
+import shutil
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from web_loader import BulkWebLoader, strip_boilerplate
+
+ARTICLE_WORDS = "pipeline model data training deployment monitoring feature drift registry metadata".split()
+
+def make_page(page_id: int, mirror: int = 0) -> str:
+    """Builds an article page; mirrors share the article but differ in navigation and footer."""
+    rng = random.Random(page_id)
+    words = [rng.choice(ARTICLE_WORDS) + str(rng.randrange(100)) for _ in range(400)]
+    return (
+        f"<html><head><title>Article {page_id}</title><script>track({mirror})</script></head><body>"
+        f"<nav>Home | Mirror site {mirror} | About</nav><main><h1>Article {page_id}</h1><p>{' '.join(words)}</p></main>"
+        f"<footer>Copyright mirror {mirror}</footer></body></html>"
+    )
+
+class FixtureServer(ThreadingHTTPServer):
+    # Allow many concurrent connects without the listen backlog stalling them
+    request_queue_size = 256
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Serves /page/<id>/<mirror> with an ETag and an injected delay, keeping connections alive."""
+    protocol_version = "HTTP/1.1"
+    delay = 0.05
+
+    def do_GET(self):
+        _, _, page_id, mirror = self.path.split("/")
+        body = make_page(int(page_id), int(mirror)).encode("utf-8")
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        time.sleep(self.delay)
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def main():
+    """Loads pages from a local HTTP fixture sequentially and with BulkWebLoader (cold and warm cache)."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--mirror-every", type=int, default=5, help="Every Nth page is also served from a mirror.")
+    parser.add_argument("--delay", type=float, default=0.05, help="Server-side delay per request in seconds.")
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    FixtureHandler.delay = args.delay
+    server = FixtureServer(("127.0.0.1", 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    urls = [f"{base_url}/page/{i}/0" for i in range(args.pages)]
+    urls += [f"{base_url}/page/{i}/1" for i in range(0, args.pages, args.mirror_every)]
+    cache_dir = tempfile.mkdtemp()
+
+    try:
+        start = time.perf_counter()
+        sequential = [strip_boilerplate(requests.get(url, timeout=10).text) for url in urls]
+        print(f"{'sequential requests.get':>26} {time.perf_counter() - start:>7.2f} s  {len(sequential)} pages")
+
+        loader = BulkWebLoader(cache_dir=cache_dir, max_concurrency=args.concurrency)
+        for label in ["bulk loader, cold cache", "bulk loader, warm cache"]:
+            docs, stats = loader.load(urls)
+            print(
+                f"{label:>26} {stats.seconds:>7.2f} s  {len(docs)} pages "
+                f"(fetched {stats.fetched}, 304 {stats.not_modified}, duplicates {stats.duplicates}, errors {stats.errors})"
+            )
+    finally:
+        server.shutdown()
+        shutil.rmtree(cache_dir)
+
+if __name__ == "__main__":
+    main()
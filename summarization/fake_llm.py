@@ -0,0 +1,61 @@
+import asyncio
+import random
+import time
+from typing import Any, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+class FakeLLMError(RuntimeError):
+    """Raised by FakeChatModel to simulate a failed provider call."""
+
+class FakeChatModel(BaseChatModel):
+    """
+    A local stand-in for ChatOpenAI used by the summarization benchmarks.
+
+    Each call sleeps for `latency` seconds, fails with probability `failure_rate`,
+    and answers with the first `summary_words` words of the prompt.
+    """
+    model_name: str = "fake-chat-model"
+    temperature: float = 0.0
+    latency: float = 0.1
+    failure_rate: float = 0.0
+    summary_words: int = 30
+    seed: Optional[int] = None
+    calls: int = 0
+    failures: int = 0
+
+    def model_post_init(self, __context: Any) -> None:
+        self._rng = random.Random(self.seed)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat-model"
+
+    def get_num_tokens(self, text: str) -> int:
+        # Roughly four characters per token, like OpenAI's tokenizers on English text
+        return max(1, len(text) // 4)
+
+    def _respond(self, messages: List[BaseMessage]) -> ChatResult:
+        self.calls += 1
+        if self._rng.random() < self.failure_rate:
+            self.failures += 1
+            raise FakeLLMError(f"Simulated provider failure on call {self.calls}.")
+        prompt = "\n".join(str(message.content) for message in messages)
+        content = "Summary: " + " ".join(prompt.split()[:self.summary_words])
+        input_tokens = self.get_num_tokens(prompt)
+        output_tokens = self.get_num_tokens(content)
+        message = AIMessage(
+            content=content,
+            usage_metadata={"input_tokens": input_tokens, "output_tokens": output_tokens, "total_tokens": input_tokens + output_tokens},
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        time.sleep(self.latency)
+        return self._respond(messages)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        return self._respond(messages)
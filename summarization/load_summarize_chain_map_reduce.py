@@ -1,25 +1,26 @@
 from langchain_core.prompts import PromptTemplate
-from langchain_community.document_loaders import PyPDFLoader
-from langchain.chains.summarize import load_summarize_chain
 from langchain_openai import ChatOpenAI
 
+from async_map_reduce import AsyncMapReduceSummarizer
+from pdf_stream import load_chunks
+from summary_cache import SummaryCache
+
 def main():
     """
     Main function to load a PDF document, split it into pages, and summarize the content using
-    the 'map_reduce' chain type from langchain.
+    a concurrent map/reduce summarizer.
     """
     # Initialize the language model
     llm = ChatOpenAI(model="gpt-4o-mini")
 
+    # Reuse responses for chunks and prompts that were already summarized in earlier runs
+    cache = SummaryCache("summary_cache.sqlite")
+
     # Path to the PDF file
     file_path = "../data/practitioners_guide_to_mlops_whitepaper.pdf"
 
-    # Load and split the PDF document into pages
-    loader = PyPDFLoader(file_path)
-    split_pages = loader.load_and_split()
-
-    # Select the first three pages for summarization
-    pages = split_pages[:3]
+    # Stream the PDF page by page, parsing only what is needed for the first three chunks
+    pages = load_chunks(file_path, max_chunks=3)
     print(pages)
 
     # Define the prompt template for the map step
@@ -36,18 +37,20 @@ def main():
     """
     combine_prompt = PromptTemplate(template=combine_prompt_template, input_variables=["text"])
 
-    # Load the summarize chain with the 'map_reduce' chain type
-    map_reduce_chain = load_summarize_chain(
+    # Summarize chunks concurrently, collapsing summaries in parallel rounds if they exceed the budget
+    summarizer = AsyncMapReduceSummarizer(
         llm,
-        chain_type="map_reduce",
         map_prompt=map_prompt,
         combine_prompt=combine_prompt,
-        return_intermediate_steps=True,
+        max_concurrency=8,
+        token_max=3000,
+        cache=cache,
     )
 
-    # Invoke the chain to summarize the pages
-    map_reduce_outputs = map_reduce_chain.invoke({"input_documents": pages})
+    # Invoke the summarizer on the pages
+    map_reduce_outputs = summarizer.summarize(pages)
     print(map_reduce_outputs)
+    print(cache.stats.report())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,25 +1,26 @@
-from langchain_community.document_loaders import PyPDFLoader
 from langchain_core.prompts import PromptTemplate
-from langchain.chains.summarize import load_summarize_chain
 from langchain_openai import ChatOpenAI
 
+from pdf_stream import load_chunks
+from summary_cache import SummaryCache
+from resumable_refine import ResumableRefineSummarizer
+
 def main():
     """
     Main function to load a PDF document, split it into pages, and summarize the content using
-    the 'refine' chain type from langchain.
+    a checkpointed refine runner that resumes where a previous run stopped.
     """
     # Initialize the language model
     llm = ChatOpenAI(model="gpt-4o-mini")
 
+    # Reuse responses for chunks and prompts that were already summarized in earlier runs
+    cache = SummaryCache("summary_cache.sqlite")
+
     # Path to the PDF file
     file_path = "../data/practitioners_guide_to_mlops_whitepaper.pdf"
 
-    # Load and split the PDF document into pages
-    loader = PyPDFLoader(file_path)
-    split_pages = loader.load_and_split()
-
-    # Select the first three pages for summarization
-    pages = split_pages[:3]
+    # Stream the PDF page by page, parsing only what is needed for the first three chunks
+    pages = load_chunks(file_path, max_chunks=3)
     print(pages)
 
     # Define the prompt template for the initial summary
@@ -32,25 +33,27 @@ def main():
 
     # Define the prompt template for refining the summary
     refine_prompt_template = """
-        Write a concise summary of the following text delimited by triple backquotes.
+        Here is the summary so far: {existing_answer}
+        Refine it with the following text delimited by triple backquotes.
         Return your response in bullet points which covers the key points of the text.
         ```{text}```
         BULLET POINT SUMMARY:
     """
-    refine_prompt = PromptTemplate(template=refine_prompt_template, input_variables=["text"])
+    refine_prompt = PromptTemplate(template=refine_prompt_template, input_variables=["existing_answer", "text"])
 
-    # Load the summarize chain with the 'refine' chain type
-    refine_chain = load_summarize_chain(
+    # Checkpoint after each page so a failed run resumes where it stopped
+    refine_runner = ResumableRefineSummarizer(
         llm,
-        chain_type="refine",
         question_prompt=question_prompt,
         refine_prompt=refine_prompt,
-        return_intermediate_steps=True,
+        checkpoint_path="refine_checkpoint.json",
+        cache=cache,
     )
 
-    # Invoke the chain to summarize the pages
-    refine_outputs = refine_chain.invoke({"input_documents": pages})
+    # Invoke the runner to summarize the pages
+    refine_outputs = refine_runner.summarize(pages)
     print(refine_outputs)
+    print(cache.stats.report())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
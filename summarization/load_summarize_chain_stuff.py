@@ -1,8 +1,9 @@
-from langchain_community.document_loaders import PyPDFLoader
 from langchain_core.prompts import PromptTemplate
 from langchain.chains.summarize import load_summarize_chain
 from langchain_openai import ChatOpenAI
 
+from pdf_stream import load_chunks
+
 def main():
     """
     Main function to load a PDF document, split it into pages, and summarize the content using
@@ -14,12 +15,8 @@ def main():
     # Path to the PDF file
     file_path = "../data/practitioners_guide_to_mlops_whitepaper.pdf"
     
-    # Load and split the PDF document into pages
-    loader = PyPDFLoader(file_path)
-    pages = loader.load_and_split()
-    
-    # Select the first three pages for summarization
-    three_pages = pages[:3]
+    # Stream the PDF page by page, parsing only what is needed for the first three chunks
+    three_pages = load_chunks(file_path, max_chunks=3)
     print(three_pages)
     
     # Define the prompt template for summarization
@@ -35,7 +32,7 @@ def main():
     stuff_chain = load_summarize_chain(llm, chain_type="stuff", prompt=prompt)
     
     # Invoke the chain to summarize the pages
-    result = stuff_chain.invoke(pages)
+    result = stuff_chain.invoke({"input_documents": three_pages})
     print(result)
      
 if __name__ == "__main__":
@@ -1,10 +1,11 @@
 import os
 from langchain import hub
-from langchain.chains import MapReduceChain
 from langchain_openai import ChatOpenAI
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from tavily import TavilyClient
 
+from async_map_reduce import AsyncMapReduceSummarizer
+
 def main():
     """Main function to fetch web search results, process them, and summarize using an LLM."""
     llm = ChatOpenAI(model="gpt-4o-mini")
@@ -35,13 +36,16 @@ def main():
     # Convert documents to a single string for processing
     combined_text = "\n".join(docs)
 
-    # Create and execute MapReduceChain for summarization
-    map_reduce_chain = MapReduceChain.from_params(
-        llm=llm,
-        prompt=map_prompt,
-        text_splitter=text_splitter
+    # Summarize the chunks concurrently, reusing the map prompt for the reduce step
+    chunks = text_splitter.create_documents([combined_text])
+    summarizer = AsyncMapReduceSummarizer(
+        llm,
+        map_prompt=map_prompt,
+        combine_prompt=map_prompt,
+        max_concurrency=8,
+        document_variable_name=map_prompt.input_variables[0],
     )
-    result = map_reduce_chain.invoke(combined_text)
+    result = summarizer.summarize(chunks)
 
     print(result["output_text"])
 
@@ -0,0 +1,82 @@
+from functools import lru_cache
+from typing import Callable, Iterable, Iterator, List, Optional
+
+import tiktoken
+from pypdf import PdfReader
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter, TextSplitter
+
+@lru_cache(maxsize=None)
+def _encoding(model: str):
+    return tiktoken.encoding_for_model(model)
+
+def count_tokens(text: str, model: str = "gpt-4o-mini") -> int:
+    """Counts tokens with the tokenizer of the given OpenAI model."""
+    return len(_encoding(model).encode_ordinary(text))
+
+def iter_pages(file_path: str, start_page: int = 0, end_page: Optional[int] = None) -> Iterator[Document]:
+    """
+    Lazily yields one Document per PDF page in [start_page, end_page).
+
+    Only the pages that are consumed are parsed, so reading the first N pages of a
+    large PDF costs O(N). Metadata matches PyPDFLoader ("source" and 0-based "page").
+
+    :param file_path: Path to the PDF file.
+    :param start_page: The first page to yield (0-based).
+    :param end_page: The page to stop before; defaults to the end of the document.
+    """
+    # Read from the open file rather than a path, which would load the whole file into memory
+    with open(file_path, "rb") as f:
+        reader = PdfReader(f)
+        end_page = len(reader.pages) if end_page is None else min(end_page, len(reader.pages))
+        for page_number in range(start_page, end_page):
+            text = reader.pages[page_number].extract_text()
+            yield Document(page_content=text, metadata={"source": file_path, "page": page_number})
+
+def iter_chunks(
+    pages: Iterable[Document],
+    text_splitter: Optional[TextSplitter] = None,
+    max_chunks: Optional[int] = None,
+    token_budget: Optional[int] = None,
+    length_function: Callable[[str], int] = count_tokens,
+) -> Iterator[Document]:
+    """
+    Splits pages into chunks as they arrive, stopping once a chunk or token limit is reached.
+
+    Because pages are pulled from the iterable on demand, stopping early also stops parsing.
+
+    :param pages: Page documents, typically from `iter_pages`.
+    :param text_splitter: The splitter applied to each page; defaults to the one `load_and_split` uses.
+    :param max_chunks: The maximum number of chunks to yield.
+    :param token_budget: The maximum total tokens across yielded chunks; the chunk that would exceed it is dropped.
+    :param length_function: Counts tokens for `token_budget`.
+    """
+    text_splitter = text_splitter or RecursiveCharacterTextSplitter()
+    yielded, tokens = 0, 0
+    for page in pages:
+        for chunk in text_splitter.split_documents([page]):
+            if max_chunks is not None and yielded >= max_chunks:
+                return
+            if token_budget is not None:
+                tokens += length_function(chunk.page_content)
+                if tokens > token_budget:
+                    return
+            yielded += 1
+            yield chunk
+
+def load_chunks(
+    file_path: str,
+    start_page: int = 0,
+    end_page: Optional[int] = None,
+    max_chunks: Optional[int] = None,
+    token_budget: Optional[int] = None,
+    text_splitter: Optional[TextSplitter] = None,
+) -> List[Document]:
+    """
+    Streams a PDF page by page and returns the chunks within the given page range and limits.
+
+    A drop-in replacement for `PyPDFLoader(file_path).load_and_split()[:n]` that does not
+    parse the rest of the document.
+    """
+    pages = iter_pages(file_path, start_page, end_page)
+    return list(iter_chunks(pages, text_splitter, max_chunks, token_budget))
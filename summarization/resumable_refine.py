@@ -0,0 +1,171 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+from langchain_core.documents import Document
+from langchain_core.language_models import BaseChatModel
+from langchain_core.prompts import BasePromptTemplate
+
+from summary_cache import SummaryCache
+
+logger = logging.getLogger(__name__)
+
+class RefineCheckpoint(BaseModel):
+    fingerprint: str
+    next_index: int = 0
+    summary: str = ""
+    intermediate_steps: List[str] = Field(default_factory=list)
+    prompt_tokens: int = 0
+
+class ResumableRefineSummarizer:
+    """
+    Refine summarization that checkpoints after every step and resumes after a failure.
+
+    The running summary and the index of the next chunk are written atomically to
+    `checkpoint_path` after each LLM call. A later run over the same documents, prompts
+    and model settings picks up from the last checkpoint instead of starting over. The
+    checkpoint is deleted when the run completes, so a finished summary is never replayed;
+    pass a `cache` to reuse results across runs. While a call is in flight, the next
+    chunk's prompt is rendered and its tokens counted in a thread.
+    """
+    def __init__(
+        self,
+        llm: BaseChatModel,
+        question_prompt: BasePromptTemplate,
+        refine_prompt: BasePromptTemplate,
+        checkpoint_path: str,
+        max_retries: int = 2,
+        retry_delay: float = 1.0,
+        speculative: bool = True,
+        document_variable_name: str = "text",
+        initial_response_name: str = "existing_answer",
+        length_function: Optional[Callable[[str], int]] = None,
+        cache: Optional[SummaryCache] = None,
+    ) -> None:
+        """
+        :param llm: The chat model used for every step.
+        :param question_prompt: Prompt for the first chunk.
+        :param refine_prompt: Prompt for later chunks; receives the running summary as `initial_response_name`.
+        :param checkpoint_path: JSON file the progress is written to.
+        :param max_retries: Retries per step before the error is raised (progress so far is kept).
+        :param retry_delay: Base delay in seconds for exponential backoff with jitter.
+        :param speculative: Prepare the next chunk's prompt while the current call is in flight.
+        :param document_variable_name: The prompt variable that receives the chunk text.
+        :param initial_response_name: The refine prompt variable that receives the running summary.
+        :param length_function: Counts tokens in a string; defaults to `llm.get_num_tokens`.
+        :param cache: Optional result cache; steps whose rendered prompt was seen before are not repeated.
+        """
+        self.llm = llm
+        self.question_prompt = question_prompt
+        self.refine_prompt = refine_prompt
+        self.checkpoint_path = checkpoint_path
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.speculative = speculative
+        self.document_variable_name = document_variable_name
+        self.initial_response_name = initial_response_name
+        self.length_function = length_function or llm.get_num_tokens
+        self.cache = cache
+
+    def _llm_identity(self) -> str:
+        """The model class and settings, including arguments bound with `llm.bind(...)`."""
+        llm, bound = self.llm, []
+        while hasattr(llm, "bound"):
+            bound.append(getattr(llm, "kwargs", {}))
+            llm = llm.bound
+        return json.dumps([type(llm).__name__, llm._identifying_params, bound], sort_keys=True, default=str)
+
+    def _fingerprint(self, docs: List[Document]) -> str:
+        """Identifies a run by its model, prompts and document contents, so a stale checkpoint is never reused."""
+        digest = hashlib.sha256()
+        for part in [self._llm_identity(), repr(self.question_prompt), repr(self.refine_prompt), *(doc.page_content for doc in docs)]:
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def load_checkpoint(self, docs: List[Document]) -> RefineCheckpoint:
+        """Returns the saved checkpoint for these documents, or a fresh one."""
+        fingerprint = self._fingerprint(docs)
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, encoding="utf-8") as f:
+                checkpoint = RefineCheckpoint.model_validate_json(f.read())
+            if checkpoint.fingerprint == fingerprint:
+                return checkpoint
+            logger.info("Ignoring checkpoint for a different model, prompt or document set")
+        return RefineCheckpoint(fingerprint=fingerprint)
+
+    def save_checkpoint(self, checkpoint: RefineCheckpoint) -> None:
+        """Writes the checkpoint atomically so a crash mid-write cannot corrupt it."""
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(checkpoint.model_dump_json())
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _prepare(self, docs: List[Document], index: int) -> Tuple[BasePromptTemplate, int]:
+        """Renders the chunk into its prompt and counts the tokens of everything but the running summary."""
+        prompt = self.question_prompt if index == 0 else self.refine_prompt
+        prompt = prompt.partial(**{self.document_variable_name: docs[index].page_content})
+        remaining = {name: "" for name in prompt.input_variables}
+        return prompt, self.length_function(prompt.format(**remaining))
+
+    async def _call(self, prompt: BasePromptTemplate, inputs: Dict) -> str:
+        for attempt in range(self.max_retries + 1):
+            try:
+                if self.cache:
+                    return await self.cache.ainvoke(self.llm, prompt, inputs)
+                message = await (prompt | self.llm).ainvoke(inputs)
+                return message.content
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self.retry_delay * (2 ** attempt) * random.uniform(0.5, 1.5)
+                logger.warning("LLM call failed (%s), retrying in %.2fs", e, delay)
+                await asyncio.sleep(delay)
+
+    async def asummarize(self, docs: List[Document]) -> Dict:
+        """
+        Summarizes the documents, resuming from the checkpoint if one matches, and deletes the checkpoint when done.
+
+        :param docs: The chunks to summarize, in order.
+        :return: A dict with `output_text`, `intermediate_steps`, `resumed_from` and `prompt_tokens`.
+        """
+        checkpoint = self.load_checkpoint(docs)
+        resumed_from = checkpoint.next_index
+        if resumed_from:
+            logger.info("Resuming refine from chunk %d of %d", resumed_from, len(docs))
+
+        prepared = None
+        for index in range(checkpoint.next_index, len(docs)):
+            if prepared is not None:
+                prompt, base_tokens = await prepared
+            else:
+                prompt, base_tokens = self._prepare(docs, index)
+            inputs = {self.initial_response_name: checkpoint.summary} if index else {}
+            prepared = None
+            if self.speculative and index + 1 < len(docs):
+                prepared = asyncio.ensure_future(asyncio.to_thread(self._prepare, docs, index + 1))
+
+            checkpoint.summary = await self._call(prompt, inputs)
+            checkpoint.intermediate_steps.append(checkpoint.summary)
+            checkpoint.prompt_tokens += base_tokens + (self.length_function(inputs[self.initial_response_name]) if inputs else 0)
+            checkpoint.next_index = index + 1
+            self.save_checkpoint(checkpoint)
+
+        # A finished run starts over next time rather than returning this summary without calling the model
+        if os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+        return {
+            "output_text": checkpoint.summary,
+            "intermediate_steps": checkpoint.intermediate_steps,
+            "resumed_from": resumed_from,
+            "prompt_tokens": checkpoint.prompt_tokens,
+        }
+
+    def summarize(self, docs: List[Document]) -> Dict:
+        """Synchronous wrapper around `asummarize`."""
+        return asyncio.run(self.asummarize(docs))
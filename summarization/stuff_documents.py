@@ -1,15 +1,17 @@
 from langchain.chains.combine_documents import create_stuff_documents_chain
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_community.document_loaders import WebBaseLoader
 from langchain_openai import ChatOpenAI
 
+from web_loader import BulkWebLoader
+
 def main():
-    # Prompt the user for the URL to load documents from
-    url = input("Enter the URL to load documents from: ")
+    # Prompt the user for the URLs to load documents from
+    urls = input("Enter the URLs to load documents from (separated by spaces): ").split()
 
-    # Load documents from the specified URL
-    loader = WebBaseLoader(url)
-    docs = loader.load()
+    # Load the pages concurrently, revalidating cached copies and dropping near-duplicates
+    loader = BulkWebLoader(cache_dir=".web_cache", max_concurrency=16)
+    docs, stats = loader.load(urls)
+    print(f"Fetched {stats.fetched}, not modified {stats.not_modified}, errors {stats.errors}, duplicates {stats.duplicates} in {stats.seconds:.2f}s")
 
     # Instantiate the chat model
     llm = ChatOpenAI(model="gpt-4o-mini")
@@ -22,11 +24,12 @@ def main():
     # Create the chain to combine documents and generate the summary
     chain = create_stuff_documents_chain(llm, prompt)
 
-    # Invoke the chain with the loaded documents
-    result = chain.invoke({"context": docs})
+    # Summarize each distinct page
+    results = chain.batch([{"context": [doc]} for doc in docs], config={"max_concurrency": 8})
 
-    # Print the result
-    print(result)
+    # Print the results
+    for doc, result in zip(docs, results):
+        print(f"\n{doc.metadata['source']}\n{result}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
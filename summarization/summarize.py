@@ -0,0 +1,39 @@
+import argparse
+import logging
+
+from langchain_openai import ChatOpenAI
+
+from auto_summarize import AutoSummarizer
+from pdf_stream import iter_pages
+from summary_cache import SummaryCache
+
+def main():
+    """
+    Main function to load a PDF document and summarize it with whichever of stuff, map_reduce
+    or refine needs the fewest LLM calls for its size.
+    """
+    parser = argparse.ArgumentParser(description="Summarize a PDF with an automatically chosen strategy.")
+    parser.add_argument("file_path", nargs="?", default="../data/practitioners_guide_to_mlops_whitepaper.pdf")
+    parser.add_argument("--pages", type=int, default=None, help="Only summarize the first N pages.")
+    parser.add_argument("--max-rounds", type=int, default=None, help="Latency target: maximum sequential LLM rounds.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    # Initialize the language model
+    llm = ChatOpenAI(model="gpt-4o-mini")
+
+    # Stream the requested pages of the PDF document
+    pages = list(iter_pages(args.file_path, end_page=args.pages))
+
+    # Count tokens, pick a strategy and summarize
+    cache = SummaryCache("summary_cache.sqlite")
+    summarizer = AutoSummarizer(llm, max_rounds=args.max_rounds, cache=cache)
+    result = summarizer.summarize(pages)
+
+    print(f"Strategy: {result['plan'].strategy} ({result['actual_calls']} calls, predicted {result['plan'].predicted_calls})")
+    print(cache.stats.report())
+    print(result["output_text"])
+
+if __name__ == "__main__":
+    main()
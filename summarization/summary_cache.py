@@ -0,0 +1,111 @@
+import hashlib
+import json
+import sqlite3
+import threading
+from typing import Dict, Optional, Tuple
+
+from pydantic import BaseModel
+from langchain_core.language_models import BaseChatModel
+from langchain_core.prompts import BasePromptTemplate
+
+class SummaryCacheStats(BaseModel):
+    hits: int = 0
+    misses: int = 0
+    saved_input_tokens: int = 0
+    saved_output_tokens: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def report(self) -> str:
+        return (
+            f"Summary cache hits: {self.hits}, misses: {self.misses} ({self.hit_rate:.0%} hit rate), "
+            f"saved {self.saved_input_tokens} input + {self.saved_output_tokens} output tokens"
+        )
+
+class SummaryCache:
+    """
+    Persistent cache of chat model outputs for the summarization chains.
+
+    Entries are keyed by a hash of (model, prompt template, rendered prompt text,
+    temperature), so an unchanged chunk summarized with the same prompt and settings is
+    never paid for twice. Results are stored in SQLite together with their token usage.
+    """
+    def __init__(self, path: str = "summary_cache.sqlite") -> None:
+        """
+        :param path: The SQLite database file.
+        """
+        self.stats = SummaryCacheStats()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS summaries ("
+            "key TEXT PRIMARY KEY, content TEXT NOT NULL, input_tokens INTEGER NOT NULL, output_tokens INTEGER NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _base_model(llm) -> BaseChatModel:
+        # Unwrap runnables such as llm.with_config(...) to reach the model settings
+        while hasattr(llm, "bound"):
+            llm = llm.bound
+        return llm
+
+    def key(self, llm, prompt: BasePromptTemplate, inputs: Dict) -> str:
+        """Returns the cache key for calling `llm` with `prompt` rendered from `inputs`."""
+        model = self._base_model(llm)
+        model_name = getattr(model, "model_name", None) or getattr(model, "model", None) or type(model).__name__
+        template = getattr(prompt, "template", None) or repr(prompt.messages if hasattr(prompt, "messages") else prompt)
+        rendered = prompt.format(**inputs)
+        payload = json.dumps([model_name, template, rendered, getattr(model, "temperature", None)])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def lookup(self, key: str) -> Optional[Tuple[str, int, int]]:
+        """Returns (content, input_tokens, output_tokens) for a cached key, or None."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT content, input_tokens, output_tokens FROM summaries WHERE key = ?", (key,)
+            ).fetchone()
+
+    def update(self, key: str, content: str, input_tokens: int, output_tokens: int) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO summaries (key, content, input_tokens, output_tokens) VALUES (?, ?, ?, ?)",
+                (key, content, input_tokens, output_tokens),
+            )
+            self._conn.commit()
+
+    async def ainvoke(self, llm, prompt: BasePromptTemplate, inputs: Dict) -> str:
+        """
+        Returns the cached response for this call, or calls the model and caches its response.
+
+        :param llm: The chat model (or a runnable wrapping one).
+        :param prompt: The prompt template.
+        :param inputs: The values the prompt is rendered with.
+        :return: The response text.
+        """
+        key = self.key(llm, prompt, inputs)
+        cached = self.lookup(key)
+        if cached:
+            content, input_tokens, output_tokens = cached
+            self.stats.hits += 1
+            self.stats.saved_input_tokens += input_tokens
+            self.stats.saved_output_tokens += output_tokens
+            return content
+
+        self.stats.misses += 1
+        message = await (prompt | llm).ainvoke(inputs)
+        usage = getattr(message, "usage_metadata", None)
+        if usage:
+            input_tokens, output_tokens = usage["input_tokens"], usage["output_tokens"]
+        else:
+            model = self._base_model(llm)
+            input_tokens = model.get_num_tokens(prompt.format(**inputs))
+            output_tokens = model.get_num_tokens(message.content)
+        self.update(key, message.content, input_tokens, output_tokens)
+        return message.content
+
+    def close(self) -> None:
+        self._conn.close()
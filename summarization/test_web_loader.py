@@ -0,0 +1,59 @@
+import requests
+from requests.adapters import HTTPAdapter
+
+from web_loader import BulkWebLoader
+
+ARTICLE = "<html><head><title>{title}</title></head><body><nav>Home | About</nav><main>{text}</main></body></html>"
+TEXT = " ".join(f"Sentence {i} about the harbour redevelopment plan and its budget." for i in range(40))
+
+class FakeSession(requests.Session):
+    """Serves fixture pages with ETags, answers matching If-None-Match with 304 and records request headers."""
+    def __init__(self, pages: dict) -> None:
+        super().__init__()
+        self.pages = pages
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append((url, dict(headers or {})))
+        response = requests.Response()
+        response.url = url
+        response.encoding = "utf-8"
+        if url not in self.pages:
+            response.status_code = 404
+            return response
+        etag = f'"{hash(self.pages[url])}"'
+        response.headers["ETag"] = etag
+        if (headers or {}).get("If-None-Match") == etag:
+            response.status_code = 304
+        else:
+            response.status_code = 200
+            response._content = self.pages[url].encode("utf-8")
+        return response
+
+def test_load_revalidates_cached_pages_and_drops_mirrors(tmp_path):
+    session = FakeSession({
+        "https://news.example/harbour": ARTICLE.format(title="Harbour plan", text=TEXT),
+        "https://mirror.example/harbour": ARTICLE.format(title="Harbour plan (mirror)", text=TEXT),
+        "https://news.example/weather": ARTICLE.format(title="Weather", text="Rain all week, clearing on Sunday."),
+    })
+    urls = list(session.pages) + ["https://news.example/missing"]
+    loader = BulkWebLoader(cache_dir=str(tmp_path), max_concurrency=2, session=session)
+
+    documents, stats = loader.load(urls + urls[:1])
+    assert [document.metadata["source"] for document in documents] == ["https://news.example/harbour", "https://news.example/weather"]
+    assert documents[0].metadata["title"] == "Harbour plan"
+    assert "Home | About" not in documents[0].page_content
+    assert (stats.fetched, stats.not_modified, stats.duplicates, stats.errors) == (3, 0, 1, 1)
+
+    session.requests.clear()
+    documents, stats = loader.load(urls)
+    assert (stats.fetched, stats.not_modified, stats.duplicates, stats.errors) == (0, 3, 1, 1)
+    assert all("If-None-Match" in headers for url, headers in session.requests if url in session.pages)
+    assert len(documents) == 2
+
+def test_callers_session_keeps_its_adapters(tmp_path):
+    session = requests.Session()
+    adapter = HTTPAdapter(max_retries=3)
+    session.mount("https://", adapter)
+    loader = BulkWebLoader(cache_dir=str(tmp_path), session=session)
+    assert loader.session.get_adapter("https://example.com") is adapter
@@ -0,0 +1,225 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import requests
+from bs4 import BeautifulSoup
+from pydantic import BaseModel
+from requests.adapters import HTTPAdapter
+from langchain_core.documents import Document
+
+logger = logging.getLogger(__name__)
+
+# Elements that hold navigation, scripts and other page chrome rather than content
+BOILERPLATE_TAGS = ["script", "style", "noscript", "nav", "header", "footer", "aside", "form", "iframe", "svg"]
+
+def strip_boilerplate(html: str) -> Tuple[str, str]:
+    """
+    Extracts the title and main text of an HTML page.
+
+    :param html: The raw HTML.
+    :return: (title, text) with page chrome removed and whitespace collapsed.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    title = soup.title.get_text(strip=True) if soup.title else ""
+    for tag in soup(BOILERPLATE_TAGS):
+        tag.decompose()
+    root = soup.find("main") or soup.find("article") or soup.body or soup
+    text = re.sub(r"\s+", " ", root.get_text(" ")).strip()
+    return title, text
+
+class ResponseCache:
+    """
+    On-disk cache of HTTP responses with the validators needed for conditional GETs.
+
+    Each URL is stored as `<sha256>.json` (validators and metadata) and `<sha256>.html` (body).
+    """
+    def __init__(self, cache_dir: str) -> None:
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, url: str, suffix: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode("utf-8")).hexdigest() + suffix)
+
+    def get(self, url: str) -> Optional[Tuple[Dict, str]]:
+        """Returns (metadata, body) for a cached URL, or None."""
+        try:
+            with open(self._path(url, ".json"), encoding="utf-8") as f:
+                metadata = json.load(f)
+            with open(self._path(url, ".html"), encoding="utf-8") as f:
+                return metadata, f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, url: str, response: requests.Response) -> None:
+        """Stores the body first and the metadata last, so a partial write is never read back as valid."""
+        with open(self._path(url, ".html"), "w", encoding="utf-8") as f:
+            f.write(response.text)
+        metadata = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+        }
+        with open(self._path(url, ".json"), "w", encoding="utf-8") as f:
+            json.dump(metadata, f)
+
+class MinHashDeduplicator:
+    """
+    Detects near-duplicate texts with MinHash signatures over word shingles and LSH banding.
+
+    Texts whose estimated Jaccard similarity to an already seen text reaches `threshold`
+    are reported as duplicates of it.
+    """
+    MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+    MAX_HASH = np.uint64((1 << 32) - 1)
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 128, bands: int = 32, shingle_size: int = 5, seed: int = 1) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands.")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, 1 << 32, size=num_perm, dtype=np.uint64)
+        self.buckets: Dict[Tuple[int, bytes], List[str]] = {}
+        self.signatures: Dict[str, np.ndarray] = {}
+
+    def signature(self, text: str) -> np.ndarray:
+        """Returns the MinHash signature of the text's word shingles."""
+        words = text.lower().split()
+        shingles = {" ".join(words[i:i + self.shingle_size]) for i in range(max(1, len(words) - self.shingle_size + 1))}
+        hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+        # Multiplication may wrap around in uint64, which is harmless for hashing
+        with np.errstate(over="ignore"):
+            permuted = (np.outer(hashes, self.a) + self.b) % self.MERSENNE_PRIME & self.MAX_HASH
+        return permuted.min(axis=0)
+
+    def add(self, key: str, text: str) -> Optional[str]:
+        """
+        Checks the text against everything seen so far and remembers it if it is new.
+
+        :param key: An identifier for the text, such as its URL.
+        :param text: The text to check.
+        :return: The key of the earlier near-duplicate, or None if the text is new.
+        """
+        signature = self.signature(text)
+        band_keys = [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes()) for band in range(self.bands)]
+        candidates = {candidate for band_key in band_keys for candidate in self.buckets.get(band_key, [])}
+        for candidate in candidates:
+            if np.mean(self.signatures[candidate] == signature) >= self.threshold:
+                return candidate
+        self.signatures[key] = signature
+        for band_key in band_keys:
+            self.buckets.setdefault(band_key, []).append(key)
+        return None
+
+class LoadStats(BaseModel):
+    fetched: int = 0
+    not_modified: int = 0
+    errors: int = 0
+    duplicates: int = 0
+    seconds: float = 0.0
+
+class BulkWebLoader:
+    """
+    Loads many URLs concurrently over a pooled session with conditional GETs and near-duplicate removal.
+
+    Responses are cached on disk with their ETag/Last-Modified validators, so unchanged
+    pages come back as cheap 304s. Page chrome is stripped before documents are returned,
+    and mirrored pages are dropped so they are only summarized once.
+    """
+    def __init__(
+        self,
+        cache_dir: str = ".web_cache",
+        max_concurrency: int = 16,
+        timeout: float = 10.0,
+        dedup_threshold: float = 0.8,
+        session: Optional[requests.Session] = None,
+    ) -> None:
+        """
+        :param cache_dir: Directory for the response cache.
+        :param max_concurrency: The maximum number of requests in flight (and pooled connections per host).
+        :param timeout: Per-request timeout in seconds.
+        :param dedup_threshold: Estimated Jaccard similarity at which pages count as duplicates.
+        :param session: An optional preconfigured session, used as is; give its adapters a pool of
+            at least `max_concurrency` connections, or requests wait for one.
+        """
+        self.cache = ResponseCache(cache_dir)
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.dedup_threshold = dedup_threshold
+        if session is None:
+            # Size the pool for the worker threads; a caller's session keeps its own retry, proxy and TLS adapters
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=max_concurrency, pool_maxsize=max_concurrency)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        self.session = session
+
+    def fetch(self, url: str) -> Tuple[str, Optional[str]]:
+        """
+        Fetches one URL, revalidating a cached copy if there is one.
+
+        :return: (status, html) where status is "fetched", "not_modified" or "error".
+        """
+        cached = self.cache.get(url)
+        headers = {}
+        if cached:
+            metadata, _ = cached
+            if metadata.get("etag"):
+                headers["If-None-Match"] = metadata["etag"]
+            if metadata.get("last_modified"):
+                headers["If-Modified-Since"] = metadata["last_modified"]
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+            if response.status_code == 304 and cached:
+                return "not_modified", cached[1]
+            response.raise_for_status()
+        except requests.RequestException as e:
+            logger.warning("Failed to fetch %s: %s", url, e)
+            return "error", None
+        self.cache.put(url, response)
+        return "fetched", response.text
+
+    def load(self, urls: Iterable[str]) -> Tuple[List[Document], LoadStats]:
+        """
+        Loads the URLs and returns one Document per distinct page.
+
+        :param urls: The URLs to load; exact repeats are fetched once.
+        :return: (documents, stats), documents in input order with "source" and "title" metadata.
+        """
+        urls = list(dict.fromkeys(urls))
+        stats = LoadStats()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            responses = list(pool.map(self.fetch, urls))
+
+        deduplicator = MinHashDeduplicator(threshold=self.dedup_threshold)
+        documents = []
+        for url, (status, html) in zip(urls, responses):
+            if status == "error":
+                stats.errors += 1
+                continue
+            if status == "fetched":
+                stats.fetched += 1
+            else:
+                stats.not_modified += 1
+            title, text = strip_boilerplate(html)
+            duplicate_of = deduplicator.add(url, text)
+            if duplicate_of:
+                logger.info("Skipping %s, a near-duplicate of %s", url, duplicate_of)
+                stats.duplicates += 1
+                continue
+            documents.append(Document(page_content=text, metadata={"source": url, "title": title}))
+        stats.seconds = time.perf_counter() - start
+        return documents, stats
@@ -0,0 +1,98 @@
+import argparse
+import asyncio
+import logging
+import os
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+
+import requests
+
+from benchmark_trip_tools import MockApiHandler, MockServer
+
+def make_certificate(directory: str) -> tuple:
+    """Creates a self-signed certificate for 127.0.0.1 with openssl, returning (cert_path, key_path)."""
+    cert_path, key_path = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    subprocess.run(
+        [
+            "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+            "-subj", "/CN=localhost", "-addext", "subjectAltName=IP:127.0.0.1,DNS:localhost",
+            "-keyout", key_path, "-out", cert_path,
+        ],
+        check=True, capture_output=True,
+    )
+    return cert_path, key_path
+
+def start_tls_server(cert_path: str, key_path: str) -> MockServer:
+    server = MockServer(("127.0.0.1", 0), MockApiHandler)
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert_path, key_path)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def timed(label: str, calls: int, func) -> None:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<44} {elapsed:>6.2f} s {elapsed / calls * 1000:>8.2f} ms/call")
+
+def main():
+    """Benchmarks sequential tool calls over fresh connections vs the shared keep-alive transport, against a local TLS server."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--calls", type=int, default=200, help="Sequential calls per scenario.")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    cert_path, key_path = make_certificate(tempfile.mkdtemp(prefix="tls_"))
+    server = start_tls_server(cert_path, key_path)
+    base_url = f"https://127.0.0.1:{server.server_port}"
+
+    # Point the trip tools at the TLS server, trust its certificate and disable their caches
+    os.environ.update({
+        "SSL_CERT_FILE": cert_path,
+        "OPENWEATHERMAP_API_KEY": "key",
+        "OPENWEATHERMAP_URL": f"{base_url}/weather",
+        "EXCHANGE_RATE_URL": f"{base_url}/rates",
+        "TRANSLATE_URL": f"{base_url}/translate",
+        "TAVILY_SEARCH_URL": f"{base_url}/search",
+        "TOOL_CACHE_DIR": tempfile.mkdtemp(prefix="tool_cache_"),
+        "WEATHER_TTL": "0",
+        "RATE_TABLE_TTL": "0",
+        "TRANSLATION_TTL": "0",
+    })
+    import trip_tools
+    from http_transport import HTTP2_AVAILABLE, HttpTransport, transport
+
+    print(f"{args.calls} sequential calls to {base_url} (HTTP/2 support installed: {HTTP2_AVAILABLE})\n")
+    try:
+        def fresh_connections():
+            for _ in range(args.calls):
+                requests.get(f"{base_url}/rates", verify=cert_path).json()
+        timed("requests.get, new connection per call", args.calls, fresh_connections)
+
+        pooled = HttpTransport(verify=cert_path)
+        def keep_alive():
+            for _ in range(args.calls):
+                pooled.get(f"{base_url}/rates").json()
+        timed("HttpTransport.get, keep-alive pool", args.calls, keep_alive)
+        print(f"  negotiated {pooled.get(f'{base_url}/rates').http_version}")
+
+        async def tool_calls():
+            for i in range(args.calls // 4):
+                await trip_tools.fetch_weather_forecast("Berlin")
+                await trip_tools.fetch_exchange_rate("EUR")
+                await trip_tools.fetch_latest_news("Berlin")
+                await trip_tools.translate_phrase(f"Hello {i}", "de")
+        timed("trip tools through the shared transport", args.calls // 4 * 4, lambda: asyncio.run(tool_calls()))
+
+        print("\nShared transport latency per host:")
+        print(transport.report())
+        pooled.close()
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
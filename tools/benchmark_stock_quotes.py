@@ -0,0 +1,109 @@
+import argparse
+import json
+import logging
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import parse_qs, urlparse
+
+from benchmark_trip_tools import MockServer
+
+# Server-side seconds per request, and per symbol of a batched quote request
+DELAYS = {"request": 0.08, "symbol": 0.001}
+
+def quote(symbol: str) -> dict:
+    rng = random.Random(symbol)
+    return {
+        "symbol": symbol,
+        "regularMarketPreviousClose": round(rng.uniform(5, 900), 2),
+        "currency": "USD",
+        "exchangeTimezoneName": "America/New_York",
+    }
+
+def quote_summary(symbol: str) -> dict:
+    """About the size of the five modules `Ticker.info` requests for a large cap stock."""
+    rng = random.Random(symbol)
+    profile = {"longBusinessSummary": " ".join(rng.choice(["cloud", "devices", "services", "revenue", "global"]) for _ in range(400))}
+    statistics = {f"metric{i}": {"raw": rng.random(), "fmt": "0.00"} for i in range(300)}
+    return {"quoteSummary": {"result": [{"assetProfile": profile, "defaultKeyStatistics": statistics, "summaryDetail": {"previousClose": quote(symbol)["regularMarketPreviousClose"]}}], "error": None}}
+
+class MockYahooHandler(BaseHTTPRequestHandler):
+    """Answers like Yahoo's quoteSummary and v7 quote endpoints."""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def _send_json(self, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path.startswith("/v10/finance/quoteSummary/"):
+            time.sleep(DELAYS["request"])
+            self._send_json(quote_summary(url.path.rsplit("/", 1)[-1]))
+        elif url.path == "/v7/finance/quote":
+            symbols = parse_qs(url.query)["symbols"][0].split(",")
+            time.sleep(DELAYS["request"] + DELAYS["symbol"] * len(symbols))
+            self._send_json({"quoteResponse": {"result": [quote(symbol) for symbol in symbols], "error": None}})
+        else:
+            self.send_error(404)
+
+    def log_message(self, format, *args):
+        pass
+
+def main():
+    """Compares per-ticker Ticker.info style lookups with batched, cached previous-close quotes against a local Yahoo fixture server."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--tickers", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--request-delay", type=float, default=0.08)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+    DELAYS["request"] = args.request_delay
+
+    server = MockServer(("127.0.0.1", 0), MockYahooHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    # Point the quote tool at the fixture server before importing it
+    os.environ["YAHOO_QUOTE_URL"] = f"{base_url}/v7/finance/quote"
+    from http_transport import transport
+    from stock_quotes import QuoteCache
+
+    def per_ticker(symbols):
+        """The current path: Ticker(symbol).info makes a quoteSummary and a quote request per ticker."""
+        prices = {}
+        for symbol in symbols:
+            summary = transport.get(f"{base_url}/v10/finance/quoteSummary/{symbol}", params={"modules": "financialData,quoteType,defaultKeyStatistics,assetProfile,summaryDetail"})
+            transport.get(os.environ["YAHOO_QUOTE_URL"], params={"symbols": symbol}).json()
+            prices[symbol] = summary.json()["quoteSummary"]["result"][0]["summaryDetail"]["previousClose"]
+        return prices
+
+    print(f"{'tickers':>7} {'per ticker':>11} {'batched':>9} {'cached':>9} {'requests':>9} {'same prices':>12}")
+    for count in args.tickers:
+        symbols = [f"T{index:03d}" for index in range(count)]
+        cache = QuoteCache()
+
+        start = time.perf_counter()
+        expected = per_ticker(symbols)
+        per_ticker_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        prices = cache.get_previous_closes(symbols)
+        batched_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        cache.get_previous_closes(symbols)
+        cached_seconds = time.perf_counter() - start
+
+        print(
+            f"{count:>7} {per_ticker_seconds * 1000:>8.0f} ms {batched_seconds * 1000:>6.0f} ms {cached_seconds * 1000:>6.2f} ms "
+            f"{cache.stats.requests:>9} {str(prices == expected):>12}"
+        )
+
+if __name__ == "__main__":
+    main()
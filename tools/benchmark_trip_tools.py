@@ -0,0 +1,137 @@
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+# Per-endpoint delays in seconds, set from the command line
+DELAYS = {}
+# Requests received per endpoint
+REQUEST_COUNTS = Counter()
+
+class MockServer(ThreadingHTTPServer):
+    request_queue_size = 128
+    daemon_threads = True
+
+class MockApiHandler(BaseHTTPRequestHandler):
+    """Answers like OpenWeatherMap, exchangerate-api, MyMemory and Tavily, after a configurable delay."""
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without this, Nagle's algorithm stalls each keep-alive response
+    disable_nagle_algorithm = True
+
+    def _send_json(self, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        REQUEST_COUNTS[url.path] += 1
+        time.sleep(DELAYS.get(url.path, 0.0))
+        if url.path == "/weather":
+            item = {"dt_txt": "2026-10-18 12:00:00", "weather": [{"description": "clear sky"}], "main": {"temp": 18.5, "humidity": 60}, "wind": {"speed": 3.2}}
+            self._send_json({"list": [item] * 5})
+        elif url.path == "/rates":
+            self._send_json({"rates": {"EUR": 0.92, "JPY": 149.3, "GBP": 0.79}})
+        elif url.path == "/translate":
+            self._send_json({"responseData": {"translatedText": parse_qs(url.query)["q"][0].upper()}, "responseStatus": 200})
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        REQUEST_COUNTS["/search"] += 1
+        time.sleep(DELAYS.get("/search", 0.0))
+        self._send_json({"results": [{"title": "Local news", "url": "http://example.com", "content": "Nothing happened."}]})
+
+    def log_message(self, format, *args):
+        pass
+
+def run_serial(base_url: str, city: str, currency: str, language: str, phrases) -> None:
+    """The previous behaviour: one blocking request after another, one per phrase."""
+    requests.get(f"{base_url}/weather", params={"q": city, "appid": "key", "units": "metric", "cnt": 5}).json()
+    requests.get(f"{base_url}/rates").json()
+    requests.post(f"{base_url}/search", json={"query": f"latest news in {city}"}).json()
+    for phrase in phrases:
+        requests.get(f"{base_url}/translate", params={"q": phrase, "langpair": f"en|{language}"}).json()
+
+def main():
+    """Compares serial tool calls with concurrent and cached trip_tools.gather_trip_data against local mock servers."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--weather-delay", type=float, default=0.3)
+    parser.add_argument("--rates-delay", type=float, default=0.2)
+    parser.add_argument("--news-delay", type=float, default=0.5)
+    parser.add_argument("--translate-delay", type=float, default=0.15)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+    DELAYS.update({"/weather": args.weather_delay, "/rates": args.rates_delay, "/search": args.news_delay, "/translate": args.translate_delay})
+
+    server = MockServer(("127.0.0.1", 0), MockApiHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    # Point the tools at the mock server before importing them
+    os.environ.update({
+        "OPENWEATHERMAP_API_KEY": "key",
+        "OPENWEATHERMAP_URL": f"{base_url}/weather",
+        "EXCHANGE_RATE_URL": f"{base_url}/rates",
+        "TRANSLATE_URL": f"{base_url}/translate",
+        "TAVILY_SEARCH_URL": f"{base_url}/search",
+        "TOOL_CACHE_DIR": tempfile.mkdtemp(prefix="tool_cache_"),
+    })
+    import trip_tools
+    from tool_cache import cache_report
+
+    cached_tools = [trip_tools.fetch_weather_forecast, trip_tools.fetch_rate_table, trip_tools.translate_phrase]
+
+    serial_sum = args.weather_delay + args.rates_delay + args.news_delay + args.translate_delay * len(trip_tools.COMMON_PHRASES)
+    slowest = max(args.weather_delay, args.rates_delay, args.news_delay, args.translate_delay)
+    print(f"Sum of round trips: {serial_sum:.2f} s, slowest single call: {slowest:.2f} s\n")
+
+    async def concurrent_runs(cold: bool):
+        timings = []
+        for _ in range(args.runs):
+            if cold:
+                for cached_tool in cached_tools:
+                    cached_tool.cache.cache_clear(disk=True)
+            start = time.perf_counter()
+            results = await trip_tools.gather_trip_data("Berlin", "EUR", "de")
+            timings.append(time.perf_counter() - start)
+            assert not any(result.startswith("Error") for result in results.values()), results
+        return timings
+
+    try:
+        for run in range(args.runs):
+            start = time.perf_counter()
+            run_serial(base_url, "Berlin", "EUR", "de", trip_tools.COMMON_PHRASES)
+            print(f"serial run {run + 1}:     {time.perf_counter() - start:.2f} s")
+        for run, elapsed in enumerate(asyncio.run(concurrent_runs(cold=True))):
+            print(f"concurrent run {run + 1}: {elapsed:.2f} s (cold cache)")
+        for run, elapsed in enumerate(asyncio.run(concurrent_runs(cold=False))):
+            print(f"concurrent run {run + 1}: {elapsed:.2f} s (warm cache, news only)")
+
+        # Concurrent lookups of many currencies share a single download of the rate table
+        trip_tools.fetch_rate_table.cache.cache_clear(disk=True)
+        REQUEST_COUNTS.clear()
+        currencies = ["EUR", "JPY", "GBP"] * 10
+
+        async def lookups():
+            return await asyncio.gather(*(trip_tools.fetch_exchange_rate(currency) for currency in currencies))
+        asyncio.run(lookups())
+        print(f"\n{len(currencies)} concurrent exchange rate lookups made {REQUEST_COUNTS['/rates']} rate table request(s)\n")
+        print(cache_report())
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from typing import AsyncGenerator, Deque, Dict, Optional, Tuple
+
+import httpx
+import numpy as np
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 needs the optional h2 package; without it connections fall back to HTTP/1.1
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Responses worth retrying: rate limiting and transient gateway errors
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+# Methods that may be sent again after the server might have acted on them
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+# Failures before the request was sent, which are safe to retry for any method
+CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+
+class HostMetrics(BaseModel):
+    calls: int = 0
+    errors: int = 0
+    retries: int = 0
+    latencies: Deque[float] = Field(default_factory=lambda: deque(maxlen=10_000))
+
+    def percentile(self, q: float) -> float:
+        return float(np.percentile(self.latencies, q)) if self.latencies else 0.0
+
+    def report(self, host: str) -> str:
+        return (
+            f"{host}: {self.calls} calls, {self.retries} retries, {self.errors} errors, "
+            f"p50 {self.percentile(50) * 1000:.1f} ms, p95 {self.percentile(95) * 1000:.1f} ms"
+        )
+
+class HttpTransport:
+    """
+    Shared HTTP transport for the tool modules.
+
+    Keeps one keep-alive connection pool per host, each sized from `pool_sizes`, so
+    repeated tool calls reuse connections instead of paying DNS, TCP and TLS setup every
+    time. HTTP/2 is negotiated where the server and the h2 package allow it. Idempotent
+    requests are retried on transport errors and retryable status codes with jittered
+    exponential backoff. Others, such as billed POST searches, are retried only when the
+    connection failed before the request was sent, or on 429. The latency of every call is
+    recorded per host, with transport errors and final 5xx responses counted as errors.
+    """
+    def __init__(
+        self,
+        pool_sizes: Optional[Dict[str, int]] = None,
+        default_pool_size: int = 10,
+        timeout: float = 10.0,
+        max_retries: int = 3,
+        retry_delay: float = 0.5,
+        http2: bool = HTTP2_AVAILABLE,
+        verify: object = True,
+    ) -> None:
+        """
+        :param pool_sizes: Maximum connections per host, keyed by host name.
+        :param default_pool_size: Maximum connections for hosts not in `pool_sizes`.
+        :param timeout: Per-request timeout in seconds.
+        :param max_retries: Retries per call before the error is raised.
+        :param retry_delay: Base delay in seconds for exponential backoff with jitter.
+        :param http2: Negotiate HTTP/2 where the server supports it.
+        :param verify: TLS verification: True, False or the path of a CA bundle.
+        """
+        self.pool_sizes = pool_sizes or {}
+        self.default_pool_size = default_pool_size
+        self.timeout = httpx.Timeout(timeout, connect=min(timeout, 5.0))
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.http2 = http2
+        self.verify = verify
+        self.metrics: Dict[str, HostMetrics] = {}
+        self._lock = threading.Lock()
+        self._clients: Dict[str, httpx.Client] = {}
+        self._async_clients: Dict[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]] = {}
+        self._async_closers: Dict[asyncio.AbstractEventLoop, AsyncGenerator] = {}
+
+    def _client_options(self, host: str) -> Dict:
+        pool_size = self.pool_sizes.get(host, self.default_pool_size)
+        return {
+            "timeout": self.timeout,
+            "http2": self.http2,
+            "verify": self.verify,
+            "limits": httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+        }
+
+    def _client(self, host: str) -> httpx.Client:
+        with self._lock:
+            if host not in self._clients:
+                self._clients[host] = httpx.Client(**self._client_options(host))
+            return self._clients[host]
+
+    async def _async_client(self, host: str) -> httpx.AsyncClient:
+        # httpx async clients are bound to the event loop they were first used on, so each loop
+        # gets its own pools (e.g. a second asyncio.run, or loops in several threads)
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            for stale in [stale for stale in self._async_clients if stale.is_closed()]:
+                # Closed without shutdown_asyncgens; the connections died with the loop
+                del self._async_clients[stale]
+                self._async_closers.pop(stale, None)
+            new_loop = loop not in self._async_clients
+            clients = self._async_clients.setdefault(loop, {})
+            if host not in clients:
+                clients[host] = httpx.AsyncClient(**self._client_options(host))
+            client = clients[host]
+        if new_loop:
+            closer = self._async_closers[loop] = self._close_on_shutdown(loop)
+            await closer.asend(None)
+        return client
+
+    async def _close_on_shutdown(self, loop: asyncio.AbstractEventLoop) -> AsyncGenerator[None, None]:
+        """
+        Closes the loop's pools on the loop itself when it shuts down: `asyncio.run` finalizes
+        pending async generators like this one before closing the loop.
+        """
+        try:
+            yield
+        finally:
+            with self._lock:
+                clients = self._async_clients.pop(loop, {})
+                self._async_closers.pop(loop, None)
+            for client in clients.values():
+                await client.aclose()
+
+    def _record(self, host: str, elapsed: float, retries: int, response: Optional[httpx.Response], error: Optional[Exception]) -> None:
+        failed = error is not None or response.status_code >= 500
+        with self._lock:
+            metrics = self.metrics.setdefault(host, HostMetrics())
+            metrics.calls += 1
+            metrics.retries += retries
+            metrics.errors += failed
+            metrics.latencies.append(elapsed)
+
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response], error: Optional[Exception], method: str, url: str) -> Tuple[bool, float]:
+        """Decides whether to retry the attempt, returning (retry, delay) and logging the reason."""
+        if attempt == self.max_retries:
+            return False, 0.0
+        if error is not None:
+            retryable = method.upper() in IDEMPOTENT_METHODS or isinstance(error, CONNECT_ERRORS)
+        else:
+            # A gateway error after a POST may mean the backend already ran it; 429 means it was refused
+            retryable = response.status_code in RETRY_STATUS_CODES and (method.upper() in IDEMPOTENT_METHODS or response.status_code == 429)
+        if not retryable:
+            return False, 0.0
+        delay = self.retry_delay * (2 ** attempt) * random.uniform(0.5, 1.5)
+        reason = error or f"HTTP {response.status_code}"
+        logger.warning("%s %s failed (%s), retrying in %.2fs", method, url, reason, delay)
+        return True, delay
+
+    def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Sends a request through the pooled client for the URL's host, retrying transient failures.
+
+        :param method: The HTTP method.
+        :param url: The URL.
+        :param kwargs: Passed to `httpx.Client.request`, e.g. params, json or headers.
+        :return: The final response; status codes are not raised.
+        """
+        host = httpx.URL(url).host
+        start = time.perf_counter()
+        for attempt in range(self.max_retries + 1):
+            response, error = None, None
+            try:
+                response = self._client(host).request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                error = e
+            retry, delay = self._retry_delay(attempt, response, error, method, url)
+            if not retry:
+                break
+            time.sleep(delay)
+        self._record(host, time.perf_counter() - start, attempt, response, error)
+        if error:
+            raise error
+        return response
+
+    async def arequest(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Async version of `request`."""
+        host = httpx.URL(url).host
+        start = time.perf_counter()
+        for attempt in range(self.max_retries + 1):
+            response, error = None, None
+            try:
+                response = await (await self._async_client(host)).request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                error = e
+            retry, delay = self._retry_delay(attempt, response, error, method, url)
+            if not retry:
+                break
+            await asyncio.sleep(delay)
+        self._record(host, time.perf_counter() - start, attempt, response, error)
+        if error:
+            raise error
+        return response
+
+    def get(self, url: str, **kwargs) -> httpx.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> httpx.Response:
+        return self.request("POST", url, **kwargs)
+
+    async def aget(self, url: str, **kwargs) -> httpx.Response:
+        return await self.arequest("GET", url, **kwargs)
+
+    async def apost(self, url: str, **kwargs) -> httpx.Response:
+        return await self.arequest("POST", url, **kwargs)
+
+    def report(self) -> str:
+        """Returns one line of call, retry and latency statistics per host."""
+        with self._lock:
+            return "\n".join(metrics.report(host) for host, metrics in self.metrics.items())
+
+    def close(self) -> None:
+        """Closes the synchronous pools; async pools are closed when their event loop shuts down, or by `aclose`."""
+        with self._lock:
+            for client in self._clients.values():
+                client.close()
+            self._clients.clear()
+
+    async def aclose(self) -> None:
+        """Closes the async pools of the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = self._async_clients.pop(loop, {})
+            closer = self._async_closers.pop(loop, None)
+        for client in clients.values():
+            await client.aclose()
+        if closer is not None:
+            await closer.aclose()
+
+# The transport shared by all tool modules; SSL_CERT_FILE points it at a custom CA bundle
+transport = HttpTransport(
+    pool_sizes={"api.tavily.com": 4, "api.mymemory.translated.net": 10},
+    verify=os.getenv("SSL_CERT_FILE") or True,
+)
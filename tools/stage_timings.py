@@ -0,0 +1,62 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+class StageMetrics(BaseModel):
+    calls: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+    latencies: Deque[float] = Field(default_factory=lambda: deque(maxlen=10_000))
+
+    def percentile(self, q: float) -> float:
+        return float(np.percentile(self.latencies, q)) if self.latencies else 0.0
+
+    def report(self, stage: str) -> str:
+        mean = self.seconds / self.calls if self.calls else 0.0
+        return (
+            f"{stage}: {self.calls} calls, {self.errors} errors, mean {mean * 1000:.1f} ms, "
+            f"p50 {self.percentile(50) * 1000:.1f} ms, p95 {self.percentile(95) * 1000:.1f} ms"
+        )
+
+class StageTimings:
+    """
+    Thread-safe latency statistics per named stage of a workflow, e.g. each graph node.
+
+    One instance is shared by every request a long-lived agent serves, so the numbers
+    cover all of them; `time` works the same from threads and asyncio tasks.
+    """
+    def __init__(self) -> None:
+        self.stages: Dict[str, StageMetrics] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float, error: bool = False) -> None:
+        with self._lock:
+            metrics = self.stages.setdefault(stage, StageMetrics())
+            metrics.calls += 1
+            metrics.errors += error
+            metrics.seconds += seconds
+            metrics.latencies.append(seconds)
+
+    @contextmanager
+    def time(self, stage: str):
+        """Records how long the body of the `with` block takes under `stage`, counting exceptions as errors."""
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.record(stage, time.perf_counter() - start, error=True)
+            raise
+        self.record(stage, time.perf_counter() - start)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stages = {}
+
+    def report(self) -> str:
+        with self._lock:
+            return "\n".join(metrics.report(stage) for stage, metrics in self.stages.items())
@@ -0,0 +1,146 @@
+import logging
+import os
+import threading
+from datetime import datetime, time as clock_time, timedelta
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo
+
+from pydantic import BaseModel
+from yfinance.data import YfData
+
+from http_transport import transport
+
+logger = logging.getLogger(__name__)
+
+# Yahoo's quote endpoint takes many symbols per request; set YAHOO_QUOTE_URL to use a local fixture or proxy instead
+YAHOO_QUOTE_URL = os.getenv("YAHOO_QUOTE_URL")
+QUOTE_FIELDS = "symbol,regularMarketPreviousClose,currency,exchangeTimezoneName"
+BATCH_SIZE = int(os.getenv("QUOTE_BATCH_SIZE", 50))
+
+# Regular session open and close in exchange time for the time zones Yahoo reports
+MARKET_SESSIONS = {
+    "America/New_York": (clock_time(9, 30), clock_time(16, 0)),
+    "America/Toronto": (clock_time(9, 30), clock_time(16, 0)),
+    "Europe/London": (clock_time(8, 0), clock_time(16, 30)),
+    "Europe/Paris": (clock_time(9, 0), clock_time(17, 30)),
+    "Europe/Berlin": (clock_time(9, 0), clock_time(17, 30)),
+    "Europe/Amsterdam": (clock_time(9, 0), clock_time(17, 30)),
+    "Asia/Tokyo": (clock_time(9, 0), clock_time(15, 30)),
+    "Asia/Hong_Kong": (clock_time(9, 30), clock_time(16, 0)),
+    "Australia/Sydney": (clock_time(10, 0), clock_time(16, 0)),
+}
+DEFAULT_TIMEZONE = "America/New_York"
+
+def fetch_quote_json(symbols: Sequence[str]) -> dict:
+    """Fetches Yahoo's quote response for up to `BATCH_SIZE` symbols in one request."""
+    params = {"symbols": ",".join(symbols), "fields": QUOTE_FIELDS, "formatted": "false"}
+    if YAHOO_QUOTE_URL:
+        response = transport.get(YAHOO_QUOTE_URL, params=params)
+        response.raise_for_status()
+        return response.json()
+    # yfinance keeps the session cookie and crumb Yahoo requires for this endpoint
+    return YfData().get_raw_json("https://query1.finance.yahoo.com/v7/finance/quote", params=params)
+
+def next_session_boundary(now: datetime, timezone: str = DEFAULT_TIMEZONE) -> datetime:
+    """
+    Returns the next regular session open or close after `now` on the exchange in `timezone`.
+
+    Weekends are skipped; exchange holidays are not, so on a holiday values are merely refreshed once more.
+    """
+    zone = ZoneInfo(timezone)
+    local = now.astimezone(zone)
+    sessions = MARKET_SESSIONS.get(timezone, MARKET_SESSIONS[DEFAULT_TIMEZONE])
+    day = local.date()
+    while True:
+        if day.weekday() < 5:
+            for boundary in sessions:
+                moment = datetime.combine(day, boundary, tzinfo=zone)
+                if moment > local:
+                    return moment
+        day += timedelta(days=1)
+
+class QuoteCacheStats(BaseModel):
+    hits: int = 0
+    misses: int = 0
+    requests: int = 0
+    unknown: int = 0
+
+    def report(self) -> str:
+        total = self.hits + self.misses
+        ratio = self.hits / total if total else 0.0
+        return f"Quotes: {self.hits} hits, {self.misses} misses ({ratio:.0%} hit ratio), {self.requests} batched requests, {self.unknown} unknown symbols"
+
+class QuoteCache:
+    """
+    Previous-close prices for many tickers, fetched in batches and cached until the next market open or close.
+
+    Misses are fetched together, `batch_size` symbols per request, instead of one heavy
+    `yf.Ticker(ticker).info` call per ticker. A value fetched during a session is kept until
+    that session closes. One fetched after the close is kept only until the next open, since
+    the quote may still show the close before it until then. Sessions follow the exchange's
+    time zone. Unknown symbols are not cached.
+    """
+    def __init__(
+        self,
+        fetch_json: Callable[[Sequence[str]], dict] = fetch_quote_json,
+        batch_size: int = BATCH_SIZE,
+        now: Callable[[], datetime] = lambda: datetime.now(ZoneInfo("UTC")),
+    ) -> None:
+        """
+        :param fetch_json: Returns Yahoo's quote response for a batch of symbols; replace it to serve a fixture.
+        :param batch_size: Symbols per request.
+        :param now: The current time as an aware datetime, replaceable for tests.
+        """
+        self.fetch_json = fetch_json
+        self.batch_size = batch_size
+        self.now = now
+        self.stats = QuoteCacheStats()
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[float, datetime]] = {}
+
+    @staticmethod
+    def normalize(ticker: str) -> str:
+        return ticker.strip().upper()
+
+    def _fetch(self, symbols: List[str]) -> Dict[str, Tuple[float, datetime]]:
+        fetched = {}
+        now = self.now()
+        for start in range(0, len(symbols), self.batch_size):
+            batch = symbols[start:start + self.batch_size]
+            payload = self.fetch_json(batch)
+            self.stats.requests += 1
+            for quote in (payload.get("quoteResponse") or {}).get("result") or []:
+                previous_close = quote.get("regularMarketPreviousClose")
+                if previous_close is None:
+                    continue
+                expires = next_session_boundary(now, quote.get("exchangeTimezoneName") or DEFAULT_TIMEZONE)
+                fetched[quote["symbol"].upper()] = (float(previous_close), expires)
+        return fetched
+
+    def get_previous_closes(self, tickers: Sequence[str]) -> Dict[str, Optional[float]]:
+        """
+        Returns the previous close of each ticker, None for symbols Yahoo does not know.
+
+        :param tickers: Ticker symbols; case and surrounding spaces are ignored, duplicates fetched once.
+        """
+        symbols = list(dict.fromkeys(self.normalize(ticker) for ticker in tickers))
+        now = self.now()
+        with self._lock:
+            cached = {symbol: self._entries[symbol][0] for symbol in symbols if symbol in self._entries and self._entries[symbol][1] > now}
+            missing = [symbol for symbol in symbols if symbol not in cached]
+            self.stats.hits += len(cached)
+            self.stats.misses += len(missing)
+        if missing:
+            fetched = self._fetch(missing)
+            with self._lock:
+                self._entries.update(fetched)
+                self.stats.unknown += len(set(missing) - set(fetched))
+            cached.update({symbol: value for symbol, (value, _) in fetched.items()})
+            logger.info(f"Fetched {len(fetched)} of {len(missing)} quotes")
+        return {symbol: cached.get(symbol) for symbol in symbols}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries = {}
+
+quotes = QuoteCache()
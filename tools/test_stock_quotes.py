@@ -0,0 +1,74 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from stock_quotes import QuoteCache
+
+NEW_YORK = ZoneInfo("America/New_York")
+
+class FakeYahoo:
+    """Serves quote responses from a fixture of previous closes and records each batch requested."""
+    def __init__(self, closes: dict) -> None:
+        self.closes = closes
+        self.batches = []
+
+    def __call__(self, symbols):
+        self.batches.append(list(symbols))
+        return {"quoteResponse": {"result": [
+            {"symbol": symbol, "regularMarketPreviousClose": self.closes[symbol], "exchangeTimezoneName": "America/New_York"}
+            for symbol in symbols if symbol in self.closes
+        ]}}
+
+class Clock:
+    def __init__(self, now: datetime) -> None:
+        self.now = now
+
+    def __call__(self) -> datetime:
+        return self.now
+
+def test_misses_are_fetched_in_batches():
+    yahoo = FakeYahoo({"AAPL": 1.0, "MSFT": 2.0, "NVDA": 3.0, "AMZN": 4.0})
+    cache = QuoteCache(fetch_json=yahoo, batch_size=2, now=Clock(datetime(2026, 10, 14, 12, 0, tzinfo=NEW_YORK)))
+
+    closes = cache.get_previous_closes(["aapl", " MSFT ", "AAPL", "NVDA", "AMZN", "NOPE"])
+
+    assert closes == {"AAPL": 1.0, "MSFT": 2.0, "NVDA": 3.0, "AMZN": 4.0, "NOPE": None}
+    assert yahoo.batches == [["AAPL", "MSFT"], ["NVDA", "AMZN"], ["NOPE"]]
+    assert cache.stats.unknown == 1
+
+def test_unknown_symbols_are_not_cached():
+    yahoo = FakeYahoo({"AAPL": 1.0})
+    cache = QuoteCache(fetch_json=yahoo, now=Clock(datetime(2026, 10, 14, 12, 0, tzinfo=NEW_YORK)))
+
+    cache.get_previous_closes(["AAPL", "NOPE"])
+    cache.get_previous_closes(["AAPL", "NOPE"])
+
+    assert yahoo.batches == [["AAPL", "NOPE"], ["NOPE"]]
+
+def test_value_fetched_in_session_expires_at_the_close():
+    yahoo = FakeYahoo({"AAPL": 1.0})
+    clock = Clock(datetime(2026, 10, 14, 10, 0, tzinfo=NEW_YORK))
+    cache = QuoteCache(fetch_json=yahoo, now=clock)
+
+    cache.get_previous_closes(["AAPL"])
+    clock.now = datetime(2026, 10, 14, 15, 59, tzinfo=NEW_YORK)
+    cache.get_previous_closes(["AAPL"])
+    assert len(yahoo.batches) == 1
+
+    clock.now = datetime(2026, 10, 14, 16, 1, tzinfo=NEW_YORK)
+    cache.get_previous_closes(["AAPL"])
+    assert len(yahoo.batches) == 2
+
+def test_value_fetched_after_friday_close_expires_at_monday_open():
+    yahoo = FakeYahoo({"AAPL": 1.0})
+    clock = Clock(datetime(2026, 10, 16, 17, 0, tzinfo=NEW_YORK))
+    cache = QuoteCache(fetch_json=yahoo, now=clock)
+
+    cache.get_previous_closes(["AAPL"])
+    clock.now = datetime(2026, 10, 19, 9, 29, tzinfo=NEW_YORK)
+    cache.get_previous_closes(["AAPL"])
+    assert len(yahoo.batches) == 1
+
+    clock.now = datetime(2026, 10, 19, 9, 31, tzinfo=NEW_YORK)
+    cache.get_previous_closes(["AAPL"])
+    assert len(yahoo.batches) == 2
+    assert cache.stats.hits == 1 and cache.stats.misses == 2
@@ -0,0 +1,203 @@
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+class ToolCacheStats(BaseModel):
+    hits: int = 0
+    stale_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    refreshes: int = 0
+    errors: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of calls answered without waiting on the underlying tool."""
+        served = self.hits + self.stale_hits + self.disk_hits
+        total = served + self.misses + self.coalesced
+        return served / total if total else 0.0
+
+    def report(self, name: str) -> str:
+        return (
+            f"{name}: {self.hit_ratio:.0%} hit ratio ({self.hits} fresh, {self.stale_hits} stale, {self.disk_hits} disk), "
+            f"{self.misses} misses, {self.coalesced} coalesced, {self.refreshes} background refreshes, {self.errors} errors"
+        )
+
+# Stats of every cached tool by name, for monitoring
+TOOL_CACHES: Dict[str, ToolCacheStats] = {}
+
+def cache_report() -> str:
+    """Returns one line of hit ratio statistics per cached tool."""
+    return "\n".join(stats.report(name) for name, stats in TOOL_CACHES.items())
+
+class ToolCache:
+    """
+    Two-tier TTL cache for the results of an async tool function.
+
+    Results live in an in-process LRU and, if `disk_dir` is set, as JSON files that survive
+    restarts. A result younger than `ttl` is served as is. Up to `stale_ttl` seconds past its
+    TTL it is still served, while a single background call refreshes it. Concurrent calls
+    for the same key share one in-flight request. Failed calls are never cached.
+    """
+    def __init__(
+        self,
+        func: Callable,
+        ttl: float,
+        stale_ttl: float = 0.0,
+        maxsize: int = 256,
+        disk_dir: Optional[str] = None,
+    ) -> None:
+        """
+        :param func: The async function whose results are cached; arguments and results must be JSON serializable.
+        :param ttl: Seconds a result is fresh.
+        :param stale_ttl: Seconds past the TTL a result may still be served while it is refreshed.
+        :param maxsize: The maximum number of results kept in memory.
+        :param disk_dir: Optional directory for the on-disk tier.
+        """
+        self.func = func
+        self.signature = inspect.signature(func)
+        self.name = func.__qualname__
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.maxsize = maxsize
+        # Each tool gets its own subdirectory, so clearing one leaves the others intact
+        self.disk_dir = os.path.join(disk_dir, self.name) if disk_dir else None
+        self.stats = TOOL_CACHES.setdefault(self.name, ToolCacheStats())
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    def key(self, args: Tuple, kwargs: Dict) -> str:
+        # Bind to the signature, so positional, keyword and defaulted arguments give the same key
+        bound = self.signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        payload = json.dumps([self.name, list(bound.arguments.items())], default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def _get(self, key: str) -> Optional[Tuple[Any, float, bool]]:
+        """Returns (value, stored_at, from_disk) from the memory tier, falling back to the disk tier."""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return (*self._entries[key], False)
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(key), encoding="utf-8") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        self._remember(key, entry["value"], entry["stored_at"])
+        return entry["value"], entry["stored_at"], True
+
+    def _remember(self, key: str, value: Any, stored_at: float) -> None:
+        self._entries[key] = (value, stored_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _put(self, key: str, value: Any) -> None:
+        stored_at = time.time()
+        self._remember(key, value, stored_at)
+        if self.disk_dir:
+            # Write to a temporary file and rename, so readers never see a partial entry
+            path = self._disk_path(key)
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump({"value": value, "stored_at": stored_at}, f)
+            os.replace(path + ".tmp", path)
+
+    def _in_flight(self, key: str) -> bool:
+        task = self._inflight.get(key)
+        # Tasks are bound to their event loop, so one left over from a previous asyncio.run is ignored
+        return task is not None and task.get_loop() is asyncio.get_running_loop()
+
+    def _log_refresh_error(self, task: asyncio.Task) -> None:
+        # A failed background refresh keeps the stale value
+        if not task.cancelled() and task.exception():
+            logger.warning("Refreshing %s failed: %s", self.name, task.exception())
+
+    def _fetch(self, key: str, args: Tuple, kwargs: Dict) -> asyncio.Task:
+        """Starts the underlying call, or returns the one already in flight for this key."""
+        if self._in_flight(key):
+            return self._inflight[key]
+
+        async def run() -> Any:
+            try:
+                value = await self.func(*args, **kwargs)
+                self._put(key, value)
+                return value
+            except Exception:
+                self.stats.errors += 1
+                raise
+            finally:
+                if self._inflight.get(key) is asyncio.current_task():
+                    del self._inflight[key]
+
+        task = asyncio.ensure_future(run())
+        self._inflight[key] = task
+        return task
+
+    async def __call__(self, *args, **kwargs) -> Any:
+        key = self.key(args, kwargs)
+        cached = self._get(key)
+        if cached:
+            value, stored_at, from_disk = cached
+            age = time.time() - stored_at
+            if age < self.ttl:
+                if from_disk:
+                    self.stats.disk_hits += 1
+                else:
+                    self.stats.hits += 1
+                return value
+            if age < self.ttl + self.stale_ttl:
+                self.stats.stale_hits += 1
+                if not self._in_flight(key):
+                    self.stats.refreshes += 1
+                    self._fetch(key, args, kwargs).add_done_callback(self._log_refresh_error)
+                return value
+
+        if self._in_flight(key):
+            self.stats.coalesced += 1
+        else:
+            self.stats.misses += 1
+        return await asyncio.shield(self._fetch(key, args, kwargs))
+
+    def cache_clear(self, disk: bool = False) -> None:
+        """Drops the in-memory tier, and the on-disk tier too if `disk` is set."""
+        self._entries.clear()
+        if disk and self.disk_dir:
+            for file_name in os.listdir(self.disk_dir):
+                os.remove(os.path.join(self.disk_dir, file_name))
+
+def ttl_cache(ttl: float, stale_ttl: float = 0.0, maxsize: int = 256, disk_dir: Optional[str] = None) -> Callable:
+    """
+    Decorator that caches an async tool function with a `ToolCache`.
+
+    The wrapped function exposes the cache as `.cache`, and its statistics as `.cache.stats`.
+    See `ToolCache` for the parameters.
+    """
+    def decorator(func: Callable) -> Callable:
+        cache = ToolCache(func, ttl, stale_ttl=stale_ttl, maxsize=maxsize, disk_dir=disk_dir)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            return await cache(*args, **kwargs)
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
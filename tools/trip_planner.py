@@ -1,17 +1,13 @@
-import os
-import requests
-from dotenv import load_dotenv
-from tavily import TavilyClient
+import asyncio
+
 from langchain_community.tools import TavilySearchResults
 from langchain_openai import ChatOpenAI
 from langchain.agents import AgentExecutor, create_tool_calling_agent
 from langchain_core.tools import tool
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 
-# Load environment variables
-load_dotenv()
-TAVILY_API_KEY = os.getenv("TAVILY_API_KEY")
-OPENWEATHERMAP_API_KEY = os.getenv("OPENWEATHERMAP_API_KEY")
+import trip_tools
+from tool_cache import cache_report
 
 # Initialize Tavily search tool
 tavily_search = TavilySearchResults(
@@ -20,50 +16,34 @@ tavily_search = TavilySearchResults(
     include_raw_content=True
 )
 
+# Async tools share one pooled HTTP client, so the agent can run them concurrently
 @tool
-def get_weather_forecast(city: str, number_days: int = 5) -> str:
+async def get_weather_forecast(city: str, number_days: int = 5) -> str:
     """Fetch the 5-day weather forecast for a given city."""
-    base_url = "http://api.openweathermap.org/data/2.5/forecast"
-    params = {"q": city, "appid": OPENWEATHERMAP_API_KEY, "units": "metric", "cnt": number_days}
-    response = requests.get(base_url, params=params)
-    if response.status_code == 200:
-        data = response.json()
-        forecast_summary = [
-            f"Date: {item['dt_txt']}, Weather: {item['weather'][0]['description']}, Temp: {item['main']['temp']}°C"
-            for item in data['list']
-        ]
-        return "\n".join(forecast_summary)
-    return "Failed to fetch weather data."
+    return await trip_tools.fetch_weather_forecast(city, number_days)
 
 @tool
-def get_exchange_rate(target_currency: str) -> str:
+async def get_exchange_rate(target_currency: str) -> str:
     """Retrieve the exchange rate from USD to the given currency."""
-    response = requests.get("https://api.exchangerate-api.com/v4/latest/USD")
-    data = response.json()
-    return f"Exchange rate from USD to {target_currency}: {data['rates'].get(target_currency, 0.0)}"
+    return await trip_tools.fetch_exchange_rate(target_currency)
 
 @tool
-def get_latest_news(city: str) -> str:
+async def get_latest_news(city: str) -> str:
     """Fetch the latest news for a city using Tavily."""
-    tavily_client = TavilyClient(api_key=TAVILY_API_KEY)
-    response = tavily_client.search(f"latest news in {city}")
-    if "results" not in response:
-        return "Failed to fetch news."
-    return "\n".join([f"{item['title']}: {item['url']} - {item['content']}" for item in response["results"]])
+    return await trip_tools.fetch_latest_news(city)
 
 @tool
-def translate_common_phrases(language: str) -> str:
+async def translate_common_phrases(language: str) -> str:
     """Translate common travel phrases into the given language."""
-    common_phrases = ["Hello", "Thank you", "Where is the restroom?", "How much does this cost?", "Goodbye"]
-    translations = []
-    for phrase in common_phrases:
-        response = requests.get(f"https://api.mymemory.translated.net/get?q={phrase}&langpair=en|{language}")
-        translations.append(f"{phrase} -> {response.json()['responseData']['translatedText']}")
-    return "\n".join(translations)
+    return await trip_tools.translate_common_phrases(language)
 
 # Define tools
 tools = [tavily_search, get_weather_forecast, get_exchange_rate, get_latest_news, translate_common_phrases]
 
+# Report tool failures back to the agent instead of aborting the run
+for trip_tool in tools[1:]:
+    trip_tool.handle_tool_error = True
+
 # Initialize LLM
 llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
 
@@ -115,6 +95,9 @@ prompt = ChatPromptTemplate.from_messages([
 agent = create_tool_calling_agent(llm, tools, prompt)
 agent_executor = AgentExecutor(agent=agent, tools=tools, verbose=True)
 
-# Execute agent
-response = agent_executor.invoke({"input": prompt})
-print(response['output'])
\ No newline at end of file
+# Execute agent; in async mode tool calls from the same step run concurrently
+response = asyncio.run(agent_executor.ainvoke({"input": prompt}))
+print(response['output'])
+
+# Tool cache hit ratios, for monitoring
+print(cache_report())
\ No newline at end of file
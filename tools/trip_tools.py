@@ -0,0 +1,126 @@
+import asyncio
+import os
+from typing import Any, Dict
+
+import httpx
+
+from dotenv import load_dotenv
+from langchain_core.tools import ToolException
+
+from http_transport import transport
+from tool_cache import ttl_cache
+
+# Load environment variables
+load_dotenv()
+TAVILY_API_KEY = os.getenv("TAVILY_API_KEY")
+OPENWEATHERMAP_API_KEY = os.getenv("OPENWEATHERMAP_API_KEY")
+
+# API endpoints, overridable so the tools can run against local mock servers
+WEATHER_URL = os.getenv("OPENWEATHERMAP_URL", "http://api.openweathermap.org/data/2.5/forecast")
+EXCHANGE_RATE_URL = os.getenv("EXCHANGE_RATE_URL", "https://api.exchangerate-api.com/v4/latest/USD")
+TRANSLATE_URL = os.getenv("TRANSLATE_URL", "https://api.mymemory.translated.net/get")
+TAVILY_SEARCH_URL = os.getenv("TAVILY_SEARCH_URL", "https://api.tavily.com/search")
+
+# Common phrases to translate
+COMMON_PHRASES = ["Hello", "Thank you", "Where is the restroom?", "How much does this cost?", "Goodbye"]
+
+# Cache lifetimes in seconds: OpenWeatherMap refreshes its data about every ten minutes, the rate table
+# hourly, and a phrase's translation does not change
+CACHE_DIR = os.getenv("TOOL_CACHE_DIR", ".tool_cache")
+WEATHER_TTL = float(os.getenv("WEATHER_TTL", 10 * 60))
+RATE_TABLE_TTL = float(os.getenv("RATE_TABLE_TTL", 60 * 60))
+TRANSLATION_TTL = float(os.getenv("TRANSLATION_TTL", 30 * 24 * 60 * 60))
+
+async def request_json(method: str, url: str, action: str, **kwargs) -> Any:
+    """
+    Sends a request through the shared transport and returns its JSON body.
+
+    Transport errors, error statuses and bodies that are not JSON raise ToolException, which
+    the agents report back to the model instead of aborting the run.
+
+    :param action: What the request does, for the error message, e.g. "fetching weather data".
+    """
+    try:
+        response = await transport.arequest(method, url, **kwargs)
+    except httpx.HTTPError as e:
+        raise ToolException(f"Error {action}: {e!r}") from e
+    if response.status_code != 200:
+        raise ToolException(f"Error {action}: {response.status_code}")
+    try:
+        return response.json()
+    except ValueError as e:
+        raise ToolException(f"Error {action}: the response is not JSON") from e
+
+@ttl_cache(ttl=WEATHER_TTL, stale_ttl=WEATHER_TTL)
+async def fetch_weather_forecast(city: str, number_days: int = 5) -> str:
+    """Fetch the weather forecast for a given city from OpenWeatherMap."""
+    if not OPENWEATHERMAP_API_KEY:
+        raise ToolException("OPENWEATHERMAP_API_KEY environment variable not set.")
+    params = {"q": city, "appid": OPENWEATHERMAP_API_KEY, "units": "metric", "cnt": number_days}
+    data = await request_json("GET", WEATHER_URL, "fetching weather data", params=params)
+    forecast_summary = []
+    try:
+        for forecast in data["list"]:
+            forecast_summary.append(
+                f"Date: {forecast['dt_txt']}, Weather: {forecast['weather'][0]['description']}, "
+                f"Temp: {forecast['main']['temp']}°C, Humidity: {forecast['main']['humidity']}%, "
+                f"Wind Speed: {forecast['wind']['speed']} m/s"
+            )
+    except (KeyError, IndexError, TypeError) as e:
+        raise ToolException(f"Error fetching weather data: unexpected response ({e!r})") from e
+    return "\n".join(forecast_summary)
+
+@ttl_cache(ttl=RATE_TABLE_TTL, stale_ttl=RATE_TABLE_TTL, disk_dir=CACHE_DIR)
+async def fetch_rate_table() -> Dict[str, float]:
+    """Download the table of exchange rates from USD to every currency."""
+    data = await request_json("GET", EXCHANGE_RATE_URL, "fetching exchange rates")
+    rates = data.get("rates") if isinstance(data, dict) else None
+    if not isinstance(rates, dict):
+        raise ToolException("Error fetching exchange rates: the response has no rates")
+    return rates
+
+async def fetch_exchange_rate(target_currency: str) -> str:
+    """Retrieve the exchange rate from USD to the given currency."""
+    rate = (await fetch_rate_table()).get(target_currency, 0.0)
+    return f"The exchange rate from USD to {target_currency} is {rate}."
+
+async def fetch_latest_news(city: str) -> str:
+    """Fetch the latest news for a city using the Tavily search API."""
+    headers = {"Authorization": f"Bearer {TAVILY_API_KEY}"}
+    data = await request_json("POST", TAVILY_SEARCH_URL, "fetching news from Tavily", json={"query": f"latest news in {city}"}, headers=headers)
+    if not isinstance(data, dict) or "results" not in data:
+        raise ToolException("Failed to fetch news from Tavily.")
+    news = "\n".join(f"Title: {result['title']}\nURL: {result['url']}\nContent: {result['content']}\n" for result in data["results"])
+    return f"Latest news in {city}:\n{news}"
+
+@ttl_cache(ttl=TRANSLATION_TTL, maxsize=1024, disk_dir=CACHE_DIR)
+async def translate_phrase(phrase: str, language: str) -> str:
+    """Translate a single English phrase into the given language."""
+    data = await request_json("GET", TRANSLATE_URL, f"translating '{phrase}'", params={"q": phrase, "langpair": f"en|{language}"})
+    # MyMemory reports quota and other errors with HTTP 200, a warning in place of the translation
+    if not isinstance(data, dict) or str(data.get("responseStatus")) != "200":
+        data = data if isinstance(data, dict) else {}
+        detail = data.get("responseDetails") or (data.get("responseData") or {}).get("translatedText")
+        raise ToolException(f"Error translating '{phrase}': {data.get('responseStatus')} {detail}")
+    return data["responseData"]["translatedText"]
+
+async def translate_common_phrases(language: str) -> str:
+    """Translate common travel phrases into the given language, all phrases concurrently."""
+    translations = await asyncio.gather(*(translate_phrase(phrase, language) for phrase in COMMON_PHRASES))
+    return "\n".join(f"{phrase} -> {translation}" for phrase, translation in zip(COMMON_PHRASES, translations))
+
+async def gather_trip_data(city: str, currency: str, language: str, number_days: int = 5) -> Dict[str, str]:
+    """
+    Runs all trip tools concurrently, so the total latency is that of the slowest call.
+
+    Failures are reported in place of the result rather than cancelling the other tools.
+    """
+    names = ["weather", "exchange_rate", "news", "phrases"]
+    results = await asyncio.gather(
+        fetch_weather_forecast(city, number_days),
+        fetch_exchange_rate(currency),
+        fetch_latest_news(city),
+        translate_common_phrases(language),
+        return_exceptions=True,
+    )
+    return {name: f"Error: {result}" if isinstance(result, Exception) else result for name, result in zip(names, results)}